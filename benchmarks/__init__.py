@@ -0,0 +1 @@
+"""Asynchronous Python client for the AdGuard Home API."""
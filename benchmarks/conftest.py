@@ -0,0 +1,81 @@
+"""Common fixtures for the AdGuard Home benchmarks."""
+
+import asyncio
+import json
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from adguardhome.fake import FakeAdGuardHome
+
+FIXTURES_DIR = Path(__file__).parent.parent / "tests" / "fixtures"
+
+# Number of items in the lists of the huge payloads.
+HUGE_SIZE = 10_000
+
+
+def _huge_payloads() -> dict[str, Any]:
+    """Return real-size API payloads with large lists."""
+    fake = FakeAdGuardHome(payload_size=HUGE_SIZE)
+    clients = [
+        {
+            "name": f"client-{i}",
+            "ids": [client["ip"]],
+            "use_global_settings": bool(i % 2),
+            "filtering_enabled": True,
+            "tags": ["device_pc"],
+        }
+        for i, client in enumerate(fake.auto_clients)
+    ]
+    return {
+        "clients": {
+            "clients": clients,
+            "auto_clients": fake.auto_clients,
+            "supported_tags": ["device_pc"],
+        },
+        "querylog": {"data": fake.querylog, "oldest": fake.querylog[-1]["time"]},
+        "rewrite_list": [
+            {"domain": f"host-{i}.lan", "answer": client["ip"], "enabled": True}
+            for i, client in enumerate(fake.auto_clients)
+        ],
+        "stats": fake.stats,
+    }
+
+
+@pytest.fixture(scope="session")
+def payloads() -> dict[str, bytes]:
+    """Return encoded small (test fixture) and huge API payloads."""
+    result = {
+        f"small-{path.stem}": path.read_bytes()
+        for path in sorted(FIXTURES_DIR.glob("*.json"))
+    }
+    for name, data in _huge_payloads().items():
+        result[f"huge-{name}"] = json.dumps(data).encode()
+    return result
+
+
+@pytest.fixture(scope="session")
+def huge() -> dict[str, Any]:
+    """Return the decoded huge API payloads."""
+    return _huge_payloads()
+
+
+@pytest.fixture
+def loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
+    """Yield an event loop for benchmarks of asynchronous code."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def fake(
+    loop: asyncio.AbstractEventLoop,
+) -> Generator[FakeAdGuardHome, None, None]:
+    """Yield a fake AdGuard Home running on the event loop."""
+    server = FakeAdGuardHome()
+    loop.run_until_complete(server.start())
+    yield server
+    loop.run_until_complete(server.stop())
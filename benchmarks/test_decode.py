@@ -0,0 +1,130 @@
+"""Benchmarks for decoding and parsing API responses."""
+
+import gc
+import json
+import tracemalloc
+from typing import Any
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from adguardhome import projection
+from adguardhome.client import (
+    ClientsSnapshot,
+    _iter_auto_clients,
+    _parse_auto_client,
+)
+from adguardhome.rewrite import RewriteRule
+from adguardhome.stats import AdGuardHomeStatsSnapshot
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "small-clients",
+        "small-querylog",
+        "small-stats",
+        "huge-clients",
+        "huge-querylog",
+        "huge-rewrite_list",
+        "huge-stats",
+    ],
+)
+def test_json_decode(
+    benchmark: BenchmarkFixture, payloads: dict[str, bytes], name: str
+) -> None:
+    """Benchmark decoding JSON payloads."""
+    benchmark.extra_info["bytes"] = len(payloads[name])
+    benchmark(json.loads, payloads[name])
+
+
+def test_clients_snapshot(benchmark: BenchmarkFixture, huge: dict[str, Any]) -> None:
+    """Benchmark parsing 10k managed and 10k discovered clients."""
+    snapshot = benchmark(ClientsSnapshot.from_dict, huge["clients"])
+    assert len(snapshot.clients) == len(snapshot.auto_clients) == 10_000
+
+
+def test_iter_auto_clients(benchmark: BenchmarkFixture, huge: dict[str, Any]) -> None:
+    """Benchmark lazily parsing 10k discovered clients."""
+    entries = huge["clients"]["auto_clients"]
+    clients = benchmark(lambda: list(_iter_auto_clients(entries)))
+    assert len(clients) == 10_000
+
+
+def test_auto_clients_memory() -> None:
+    """Test interned parsing of 50k discovered clients halves their memory."""
+    orgs = ["Comcast", "Deutsche Telekom", "Local Network", "Google LLC", "Amazon"]
+    payload = json.dumps(
+        {
+            "auto_clients": [
+                {
+                    "ip": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}",
+                    "name": "",
+                    "source": "arp",
+                    "whois_info": {"country": "US", "orgname": orgs[i % 5]},
+                }
+                for i in range(50000)
+            ]
+        }
+    )
+
+    def retained(parse: Any) -> int:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            clients = list(parse(json.loads(payload)["auto_clients"]))
+            gc.collect()
+            assert len(clients) == 50000
+            return tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    plain = retained(lambda entries: [_parse_auto_client(e) for e in entries])
+    interned = retained(_iter_auto_clients)
+
+    assert interned < plain / 2
+
+
+def test_rewrite_rules(benchmark: BenchmarkFixture, huge: dict[str, Any]) -> None:
+    """Benchmark parsing 10k DNS rewrite rules."""
+    entries = huge["rewrite_list"]
+    rules = benchmark(lambda: [RewriteRule(**entry) for entry in entries])
+    assert len(rules) == 10_000
+
+
+def test_stats_snapshot(benchmark: BenchmarkFixture, huge: dict[str, Any]) -> None:
+    """Benchmark parsing stats with top lists of 10k entries."""
+    snapshot = benchmark(AdGuardHomeStatsSnapshot.from_dict, huge["stats"])
+    assert len(snapshot.top_queried_domains) == 10_000
+
+
+# The fields the stats accessors need; e.g., `stats.blocked_percentage()`.
+STATS_FIELDS = {"num_dns_queries", "num_blocked_filtering"}
+
+
+@pytest.mark.parametrize("decoder", ["full", "json", "simdjson"])
+def test_stats_fields(
+    benchmark: BenchmarkFixture, payloads: dict[str, bytes], decoder: str
+) -> None:
+    """Benchmark decoding two fields of stats with top lists of 10k entries."""
+    body = payloads["huge-stats"]
+    if decoder == "simdjson":
+        pytest.importorskip("simdjson")
+        projection.backend()
+    decode = {
+        "full": lambda: json.loads(body),
+        "json": lambda: projection._project_json(body, STATS_FIELDS),
+        "simdjson": lambda: projection._project_simdjson(body, STATS_FIELDS),
+    }[decoder]
+
+    # Only Python allocations are traced, not the buffers of simdjson
+    tracemalloc.start()
+    try:
+        decode()
+        benchmark.extra_info["python_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["bytes"] = len(body)
+
+    result = benchmark(decode)
+    assert result["num_dns_queries"] == json.loads(body)["num_dns_queries"]
@@ -0,0 +1,102 @@
+"""Benchmarks for the overhead and throughput of API requests."""
+
+import asyncio
+from collections.abc import Generator
+
+import pytest
+from aioresponses import aioresponses
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from adguardhome import AdGuardHome, LatencyHistogram
+from adguardhome.fake import FakeAdGuardHome
+from adguardhome.transport import RecordingTransport, ReplayTransport
+
+# Number of requests per round of the throughput benchmarks.
+REQUESTS = 500
+
+
+@pytest.fixture
+def adguard(
+    loop: asyncio.AbstractEventLoop, fake: FakeAdGuardHome
+) -> Generator[AdGuardHome, None, None]:
+    """Yield an AdGuard Home client connected to the fake AdGuard Home."""
+    adguard = fake.client()
+    yield adguard
+    loop.run_until_complete(adguard.close())
+
+
+@pytest.mark.parametrize("hooks", [False, True], ids=["plain", "hooks"])
+def test_request_overhead(
+    benchmark: BenchmarkFixture, loop: asyncio.AbstractEventLoop, hooks: bool
+) -> None:
+    """Benchmark the overhead of a request, without any network traffic."""
+    adguard = AdGuardHome("example.com", hooks=[LatencyHistogram()] if hooks else None)
+    with aioresponses() as mocker:
+        mocker.get(
+            "http://example.com:3000/control/status",
+            payload={"protection_enabled": True},
+            repeat=True,
+        )
+        benchmark(lambda: loop.run_until_complete(adguard.request("status")))
+    loop.run_until_complete(adguard.close())
+
+
+def test_request_roundtrip(
+    benchmark: BenchmarkFixture,
+    loop: asyncio.AbstractEventLoop,
+    adguard: AdGuardHome,
+) -> None:
+    """Benchmark a single request to a local fake AdGuard Home."""
+    benchmark(lambda: loop.run_until_complete(adguard.request("status")))
+
+
+@pytest.mark.parametrize("concurrency", [1, 10, 50, 100])
+def test_throughput(
+    benchmark: BenchmarkFixture,
+    loop: asyncio.AbstractEventLoop,
+    adguard: AdGuardHome,
+    concurrency: int,
+) -> None:
+    """Benchmark requests per second to a local fake AdGuard Home."""
+
+    async def worker(count: int) -> None:
+        for _ in range(count):
+            await adguard.stats.dns_queries()
+
+    async def run() -> None:
+        await asyncio.gather(
+            *(worker(REQUESTS // concurrency) for _ in range(concurrency))
+        )
+
+    benchmark.pedantic(lambda: loop.run_until_complete(run()), rounds=5)
+    benchmark.extra_info["requests"] = REQUESTS
+    # There are no statistics when benchmarking is disabled
+    if benchmark.stats is not None:
+        benchmark.extra_info["requests_per_second"] = round(
+            REQUESTS / benchmark.stats.stats.mean
+        )
+
+
+def test_replay(
+    benchmark: BenchmarkFixture,
+    loop: asyncio.AbstractEventLoop,
+    fake: FakeAdGuardHome,
+) -> None:
+    """Benchmark the CPU cost of API calls, replaying recorded traffic."""
+
+    async def calls(adguard: AdGuardHome) -> None:
+        await adguard.version()
+        await adguard.stats.snapshot()
+        await adguard.clients.snapshot()
+        await adguard.querylog.entries(limit=10)
+
+    recorder = RecordingTransport()
+    recording = fake.client(transport=recorder)
+    loop.run_until_complete(calls(recording))
+    loop.run_until_complete(recording.close())
+
+    adguard = AdGuardHome(
+        "adguard.invalid", transport=ReplayTransport(recorder.cassette)
+    )
+    benchmark(lambda: loop.run_until_complete(calls(adguard)))
+    benchmark.extra_info["requests"] = len(recorder.cassette.interactions)
@@ -1,15 +1,99 @@
 """Asynchronous Python client for the AdGuard Home API."""
 
-from .adguardhome import AdGuardHome
-from .client import AutoClient, Client
-from .exceptions import AdGuardHomeConnectionError, AdGuardHomeError
-from .rewrite import RewriteRule
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .adguardhome import AdGuardHome
+    from .client import (
+        AutoClient,
+        Client,
+        ClientResolver,
+        ClientsSnapshot,
+        ClientSyncResult,
+    )
+    from .diagnostics import SlowCallLog
+    from .exceptions import AdGuardHomeConnectionError, AdGuardHomeError
+    from .features import AdGuardHomeFeatures
+    from .history import AdGuardHomeStatsHistory
+    from .instrumentation import LatencyHistogram, RequestHooks, RequestInfo
+    from .querylog import QueryLogFilter
+    from .rewrite import RewriteResolver, RewriteRule, RewriteSyncResult
+    from .sync import SyncAdGuardHome
+
+# Exports are imported on first access, so importing the package (e.g., for
+# the exceptions only) does not pull in aiohttp and all API modules.
+_EXPORTS = {
+    "AdGuardHome": "adguardhome",
+    "AdGuardHomeConnectionError": "exceptions",
+    "AdGuardHomeError": "exceptions",
+    "AdGuardHomeFeatures": "features",
+    "AdGuardHomeStatsHistory": "history",
+    "AutoClient": "client",
+    "Client": "client",
+    "ClientResolver": "client",
+    "ClientSyncResult": "client",
+    "ClientsSnapshot": "client",
+    "LatencyHistogram": "instrumentation",
+    "QueryLogFilter": "querylog",
+    "RequestHooks": "instrumentation",
+    "RequestInfo": "instrumentation",
+    "RewriteResolver": "rewrite",
+    "RewriteRule": "rewrite",
+    "RewriteSyncResult": "rewrite",
+    "SlowCallLog": "diagnostics",
+    "SyncAdGuardHome": "sync",
+}
 
 __all__ = [
     "AdGuardHome",
     "AdGuardHomeConnectionError",
     "AdGuardHomeError",
+    "AdGuardHomeFeatures",
+    "AdGuardHomeStatsHistory",
     "AutoClient",
     "Client",
+    "ClientResolver",
+    "ClientSyncResult",
+    "ClientsSnapshot",
+    "LatencyHistogram",
+    "QueryLogFilter",
+    "RequestHooks",
+    "RequestInfo",
+    "RewriteResolver",
     "RewriteRule",
+    "RewriteSyncResult",
+    "SlowCallLog",
+    "SyncAdGuardHome",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import an export of the package on first access.
+
+    Args:
+    ----
+        name: The name of the attribute to look up.
+
+    Returns:
+    -------
+        The exported object.
+
+    Raises:
+    ------
+        AttributeError: The package has no such attribute.
+
+    """
+    if (module := _EXPORTS.get(name)) is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Return the attributes of the package, including lazy exports."""
+    return sorted({*globals(), *__all__})
@@ -3,26 +3,46 @@
 from __future__ import annotations
 
 import asyncio
+import dataclasses
+import functools
 import json
 import socket
+import time
+from functools import cached_property
 from typing import TYPE_CHECKING, Any, Self
 
 import aiohttp
 from yarl import URL
 
-from .client import AdGuardHomeClients
+from .compression import CompressionCounters, decompress, encodings
 from .exceptions import AdGuardHomeConnectionError, AdGuardHomeError
-from .filtering import AdGuardHomeFiltering
-from .parental import AdGuardHomeParental
-from .querylog import AdGuardHomeQueryLog
-from .rewrite import AdGuardHomeRewrite
-from .safebrowsing import AdGuardHomeSafeBrowsing
-from .safesearch import AdGuardHomeSafeSearch
-from .stats import AdGuardHomeStats
-from .update import AdGuardHomeUpdate
+from .instrumentation import CONNECTION_PHASES, RequestInfo, trace_config
+from .projection import project
+from .streaming import JSONArrayParser
+from .transport import TransportRequest, TransportResponse
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import (
+        AsyncIterator,
+        Awaitable,
+        Callable,
+        Collection,
+        Mapping,
+        Sequence,
+    )
+
+    from .client import AdGuardHomeClients
+    from .features import AdGuardHomeFeatures
+    from .filtering import AdGuardHomeFiltering
+    from .instrumentation import RequestHooks
+    from .parental import AdGuardHomeParental
+    from .querylog import AdGuardHomeQueryLog
+    from .rewrite import AdGuardHomeRewrite
+    from .safebrowsing import AdGuardHomeSafeBrowsing
+    from .safesearch import AdGuardHomeSafeSearch
+    from .stats import AdGuardHomeStats
+    from .transport import Transport
+    from .update import AdGuardHomeUpdate
 
 
 # pylint: disable=too-many-instance-attributes
@@ -35,11 +55,15 @@ class AdGuardHome:
         host: str,
         *,
         base_path: str = "/control",
+        compression: bool | Collection[str] = False,
+        hooks: Sequence[RequestHooks] | None = None,
+        max_response_size: int | None = None,
         password: str | None = None,
         port: int = 3000,
         request_timeout: int = 10,
         session: aiohttp.ClientSession | None = None,
         tls: bool = False,
+        transport: Transport | None = None,
         username: str | None = None,
         verify_ssl: bool = True,
     ) -> None:
@@ -52,11 +76,20 @@ class AdGuardHome:
         ----
             host: Hostname or IP address of the AdGuard Home instance.
             base_path: Base path of the API, usually `/control`, which is the default.
+            compression: Request compressed responses for all endpoints, when
+                True, or for a collection of endpoints; e.g., `{"querylog"}`.
+            hooks: Optional hooks that are called for every request. Connection
+                phases are only reported for hooks given here, or added before
+                the first request.
+            max_response_size: Optional maximum size, in bytes, of a response
+                body; larger responses raise an error instead of being read.
             password: Password for HTTP auth, if enabled.
             port: Port on which the API runs, usually 3000.
             request_timeout: Max timeout to wait for a response from the API.
             session: Optional, shared, aiohttp client session.
             tls: True, when TLS/SSL should be used.
+            transport: Optional transport that sends the requests; e.g., to
+                record or replay them.
             username: Username for HTTP auth, if enabled.
             verify_ssl: Can be set to false, when TLS with self-signed cert is used.
 
@@ -65,35 +98,100 @@ class AdGuardHome:
         self._close_session = False
 
         self.base_path = base_path
+        self.compression = compression
+        self.compression_counters: dict[str, CompressionCounters] = {}
+        self.hooks: list[RequestHooks] = list(hooks or [])
+        self.max_response_size = max_response_size
         self.host = host
         self.password = password
         self.port = port
         self.request_timeout = request_timeout
         self.tls = tls
+        self.transport = transport
         self.username = username
         self.verify_ssl = verify_ssl
 
         if self.base_path[-1] != "/":
             self.base_path += "/"
 
-        self.clients = AdGuardHomeClients(self)
-        self.filtering = AdGuardHomeFiltering(self)
-        self.parental = AdGuardHomeParental(self)
-        self.querylog = AdGuardHomeQueryLog(self)
-        self.rewrite = AdGuardHomeRewrite(self)
-        self.safebrowsing = AdGuardHomeSafeBrowsing(self)
-        self.safesearch = AdGuardHomeSafeSearch(self)
-        self.stats = AdGuardHomeStats(self)
-        self.update = AdGuardHomeUpdate(self)
-
-    # pylint: disable-next=too-many-arguments, too-many-locals, too-many-positional-arguments
-    async def request(
+    # The feature APIs, and their modules, are only loaded on first use.
+    # pylint: disable=import-outside-toplevel
+
+    @cached_property
+    def clients(self) -> AdGuardHomeClients:
+        """Return the client management API."""
+        from .client import AdGuardHomeClients  # noqa: PLC0415
+
+        return AdGuardHomeClients(self)
+
+    @cached_property
+    def filtering(self) -> AdGuardHomeFiltering:
+        """Return the filtering API."""
+        from .filtering import AdGuardHomeFiltering  # noqa: PLC0415
+
+        return AdGuardHomeFiltering(self)
+
+    @cached_property
+    def parental(self) -> AdGuardHomeParental:
+        """Return the parental control API."""
+        from .parental import AdGuardHomeParental  # noqa: PLC0415
+
+        return AdGuardHomeParental(self)
+
+    @cached_property
+    def querylog(self) -> AdGuardHomeQueryLog:
+        """Return the query log API."""
+        from .querylog import AdGuardHomeQueryLog  # noqa: PLC0415
+
+        return AdGuardHomeQueryLog(self)
+
+    @cached_property
+    def rewrite(self) -> AdGuardHomeRewrite:
+        """Return the DNS rewrites API."""
+        from .rewrite import AdGuardHomeRewrite  # noqa: PLC0415
+
+        return AdGuardHomeRewrite(self)
+
+    @cached_property
+    def safebrowsing(self) -> AdGuardHomeSafeBrowsing:
+        """Return the safe browsing API."""
+        from .safebrowsing import AdGuardHomeSafeBrowsing  # noqa: PLC0415
+
+        return AdGuardHomeSafeBrowsing(self)
+
+    @cached_property
+    def safesearch(self) -> AdGuardHomeSafeSearch:
+        """Return the safe search API."""
+        from .safesearch import AdGuardHomeSafeSearch  # noqa: PLC0415
+
+        return AdGuardHomeSafeSearch(self)
+
+    @cached_property
+    def stats(self) -> AdGuardHomeStats:
+        """Return the stats API."""
+        from .stats import AdGuardHomeStats  # noqa: PLC0415
+
+        return AdGuardHomeStats(self)
+
+    @cached_property
+    def update(self) -> AdGuardHomeUpdate:
+        """Return the update API."""
+        from .update import AdGuardHomeUpdate  # noqa: PLC0415
+
+        return AdGuardHomeUpdate(self)
+
+    # pylint: enable=import-outside-toplevel
+
+    # pylint: disable-next=too-many-arguments, too-many-positional-arguments
+    async def request(  # noqa: PLR0913
         self,
         uri: str,
         method: str = "GET",
         data: Any | None = None,
         json_data: dict[str, Any] | None = None,
         params: Mapping[str, str] | None = None,
+        *,
+        fields: Collection[str] | None = None,
     ) -> Any:
         """Handle a request to the AdGuard Home instance.
 
@@ -106,6 +204,9 @@ class AdGuardHome:
             data: RAW HTTP request data to send with the request.
             json_data: Dictionary of data to send as JSON with the request.
             params: Mapping of request parameters to send with the request.
+            fields: Optional key paths (e.g., `num_dns_queries`) of the fields
+                to decode from a JSON object response; everything else is
+                skipped, which is cheaper for large responses.
 
         Returns:
         -------
@@ -122,11 +223,175 @@ class AdGuardHome:
                 response from the AdGuard Home instance (invalid data).
 
         """
+        url = self._url(uri)
+        if not self.hooks:
+            return await self._request(
+                url, method, data, json_data, params, None, fields
+            )
+
+        info = RequestInfo(method=method, uri=uri, url=str(url))
+        for hook in self.hooks:
+            hook.on_request_start(info)
+        try:
+            result = await self._request(
+                url, method, data, json_data, params, info, fields
+            )
+        except Exception as exception:
+            info.duration = time.perf_counter() - info.start
+            info.error = exception
+            for hook in self.hooks:
+                hook.on_request_error(info)
+            raise
+        info.duration = time.perf_counter() - info.start
+        for hook in self.hooks:
+            hook.on_request_end(info)
+        return result
+
+    # pylint: disable-next=too-many-arguments, too-many-positional-arguments
+    async def stream(  # noqa: PLR0913
+        self,
+        uri: str,
+        path: str | Sequence[str] = (),
+        method: str = "GET",
+        json_data: dict[str, Any] | None = None,
+        params: Mapping[str, str] | None = None,
+        *,
+        chunk_size: int = 65536,
+    ) -> AsyncIterator[Any]:
+        """Stream the elements of an array in a JSON response.
+
+        The response body is read in chunks and parsed incrementally, so
+        huge responses (e.g., the query log) use constant memory. The size
+        cap of the client applies to the full response body, the request
+        timeout to each read. Request hooks are not called for streamed
+        requests.
+
+        Args:
+        ----
+            uri: The request URI on the AdGuard Home API to call.
+            path: The key, or the keys of the nested objects, leading to
+                the array; e.g., `data`. By default, the response itself
+                is the array.
+            method: HTTP method to use for the request; e.g., GET, POST.
+            json_data: Dictionary of data to send as JSON with the request.
+            params: Mapping of request parameters to send with the request.
+            chunk_size: Number of bytes to read at a time.
+
+        Yields:
+        ------
+            The decoded elements of the array, one at a time.
+
+        Raises:
+        ------
+            AdGuardHomeConnectionError: An error occurred while communicating
+                with the AdGuard Home instance (connection issues).
+            AdGuardHomeError: An error occurred while processing the
+                response from the AdGuard Home instance (invalid data).
+
+        """
+        parser = JSONArrayParser((path,) if isinstance(path, str) else path)
+        response = await self._send(self._url(uri), method, None, json_data, params)
+        if response.status // 100 in [4, 5]:
+            self._raise_for_status(
+                TransportResponse(
+                    status=response.status,
+                    headers=response.headers,
+                    body=await self._read(response),
+                )
+            )
+        size = 0
+        try:
+            while not parser.done:
+                try:
+                    async with asyncio.timeout(self.request_timeout):
+                        chunk = await response.content.read(chunk_size)
+                except TimeoutError as exception:
+                    msg = "Timeout occurred while reading the response of AdGuard Home."
+                    raise AdGuardHomeConnectionError(msg) from exception
+                except aiohttp.ClientError as exception:
+                    msg = "Error occurred while communicating with AdGuard Home."
+                    raise AdGuardHomeConnectionError(msg) from exception
+                if not chunk:
+                    parser.close()
+                    return
+                size += len(chunk)
+                self._check_size(size)
+                for element in parser.feed(chunk):
+                    yield element
+        finally:
+            response.release()
+
+    def _url(self, uri: str) -> URL:
+        """Return the URL of an URI on the AdGuard Home API."""
         scheme = "https" if self.tls else "http"
-        url = URL.build(
+        return URL.build(
             scheme=scheme, host=self.host, port=self.port, path=self.base_path
         ).join(URL(uri))
 
+    def _compression_endpoint(self, url: URL) -> str | None:
+        """Return the endpoint of a URL, when compression is enabled for it."""
+        endpoint = url.path.removeprefix(self.base_path).strip("/")
+        if isinstance(self.compression, bool):
+            return endpoint if self.compression else None
+        return endpoint if endpoint in self.compression else None
+
+    def _decompress(
+        self, response: aiohttp.ClientResponse, body: bytes, endpoint: str
+    ) -> bytes:
+        """Decompress a response body, counting the bytes saved."""
+        start = time.perf_counter()
+        coding = response.headers.get(aiohttp.hdrs.CONTENT_ENCODING, "identity")
+        coding = coding.strip().lower()
+        result = body
+        if coding != "identity":
+            result = decompress(body, coding, self.max_response_size)
+        counters = self.compression_counters.setdefault(endpoint, CompressionCounters())
+        counters.responses += 1
+        counters.compressed_bytes += len(body)
+        counters.decompressed_bytes += len(result)
+        counters.decompress_time += time.perf_counter() - start
+        return result
+
+    def _check_size(self, size: int) -> None:
+        """Raise an error when a response exceeds the size cap."""
+        if self.max_response_size is not None and size > self.max_response_size:
+            msg = (
+                "Response from AdGuard Home exceeds the maximum size of "
+                f"{self.max_response_size} bytes"
+            )
+            raise AdGuardHomeError(msg)
+
+    async def _read(self, response: aiohttp.ClientResponse) -> bytes:
+        """Read the body of a response, enforcing the size cap."""
+        if self.max_response_size is None:
+            return await response.read()
+        try:
+            self._check_size(response.content_length or 0)
+            body = bytearray()
+            async for chunk in response.content.iter_chunked(65536):
+                body += chunk
+                self._check_size(len(body))
+        finally:
+            response.release()
+        return bytes(body)
+
+    # pylint: disable-next=too-many-arguments, too-many-positional-arguments
+    async def _send(  # noqa: PLR0913
+        self,
+        url: URL,
+        method: str,
+        data: Any | None,
+        json_data: dict[str, Any] | None,
+        params: Mapping[str, str] | None,
+        info: RequestInfo | None = None,
+        *,
+        compression_endpoint: str | None = None,
+    ) -> aiohttp.ClientResponse:
+        """Send a request and return the response, before reading its body.
+
+        Responses of a compression endpoint are not decompressed by aiohttp,
+        so the bytes received can be counted before decompressing them.
+        """
         auth = None
         if self.username and self.password:
             auth = aiohttp.BasicAuth(self.username, self.password)
@@ -134,9 +399,19 @@ class AdGuardHome:
         headers = {
             "Accept": "application/json, text/plain, */*",
         }
+        options: dict[str, Any] = {}
+        if compression_endpoint is not None:
+            headers["Accept-Encoding"] = ", ".join(
+                encodings(limited=self.max_response_size is not None)
+            )
+            options["auto_decompress"] = False
 
         if self._session is None:
-            self._session = aiohttp.ClientSession()
+            # Connection phases are only traced when there are hooks; hooks
+            # added after the first request do not get them for this session
+            self._session = aiohttp.ClientSession(
+                trace_configs=[trace_config()] if self.hooks else None
+            )
             self._close_session = True
 
         skip_auto_headers = None
@@ -155,6 +430,8 @@ class AdGuardHome:
                     headers=headers,
                     ssl=self.verify_ssl,
                     skip_auto_headers=skip_auto_headers,
+                    trace_request_ctx=info,  # type: ignore[arg-type]
+                    **options,
                 )
         except TimeoutError as exception:
             msg = "Timeout occurred while connecting to AdGuard Home instance."
@@ -163,24 +440,94 @@ class AdGuardHome:
             msg = "Error occurred while communicating with AdGuard Home."
             raise AdGuardHomeConnectionError(msg) from exception
 
-        content_type = response.headers.get("Content-Type", "")
-        if response.status // 100 in [4, 5]:
-            contents = await response.read()
-            response.close()
-
-            if content_type == "application/json":
-                raise AdGuardHomeError(
-                    response.status, json.loads(contents.decode("utf8"))
-                )
-            raise AdGuardHomeError(
-                response.status, {"message": contents.decode("utf8")}
+        if info is not None:
+            info.status = response.status
+            info.add_phase("ttfb", info.start)
+            info.phases["ttfb"] -= sum(
+                info.phases.get(phase, 0.0) for phase in CONNECTION_PHASES
             )
 
-        if "application/json" in content_type:
-            return await response.json()
-
-        text = await response.text()
-        return {"message": text}
+        return response
+
+    async def _http(
+        self, request: TransportRequest, info: RequestInfo | None = None
+    ) -> TransportResponse:
+        """Send a request over HTTP and read its, decompressed, response."""
+        endpoint = self._compression_endpoint(request.url)
+        response = await self._send(
+            request.url,
+            request.method,
+            request.data,
+            request.json_data,
+            request.params,
+            info,
+            compression_endpoint=endpoint,
+        )
+        start = time.perf_counter()
+        body = await self._read(response)
+        if info is not None:
+            start = info.add_phase("body", start)
+        if endpoint is not None:
+            if info is not None:
+                info.compressed_bytes = len(body)
+            body = self._decompress(response, body, endpoint)
+            if info is not None:
+                info.add_phase("decompress", start)
+        return TransportResponse(
+            status=response.status, headers=response.headers, body=body
+        )
+
+    @staticmethod
+    def _raise_for_status(response: TransportResponse) -> None:
+        """Raise an error for error responses of the API."""
+        if response.status // 100 not in [4, 5]:
+            return
+        contents = response.body.decode("utf8")
+        if response.headers.get("Content-Type", "") == "application/json":
+            raise AdGuardHomeError(response.status, json.loads(contents))
+        raise AdGuardHomeError(response.status, {"message": contents})
+
+    # pylint: disable-next=too-many-arguments, too-many-positional-arguments
+    async def _request(  # noqa: PLR0913
+        self,
+        url: URL,
+        method: str,
+        data: Any | None,
+        json_data: dict[str, Any] | None,
+        params: Mapping[str, str] | None,
+        info: RequestInfo | None,
+        fields: Collection[str] | None = None,
+    ) -> Any:
+        """Perform a request, recording its phases when instrumented."""
+        request = TransportRequest(
+            method=method, url=url, data=data, json_data=json_data, params=params
+        )
+        if self.transport is None:
+            response = await self._http(request, info)
+        else:
+            response = await self.transport.send(
+                request, functools.partial(self._http, info=info)
+            )
+        start = time.perf_counter()
+        if info is not None:
+            info.status = response.status
+            info.response_bytes = len(response.body)
+        self._raise_for_status(response)
+
+        body = response.body
+        if "application/json" in response.headers.get("Content-Type", ""):
+            if not body.strip():
+                result = None
+            elif fields is not None:
+                result = project(body, fields)
+            else:
+                result = json.loads(body)
+        else:
+            result = {"message": body.decode(response.charset)}
+
+        if info is not None:
+            info.add_phase("decode", start)
+        return result
 
     async def protection_enabled(self) -> bool:
         """Return if AdGuard Home protection is enabled or not.
@@ -190,7 +537,7 @@ class AdGuardHome:
             The status of the protection of the AdGuard Home instance.
 
         """
-        response = await self.request("status")
+        response = await self.request("status", fields={"protection_enabled"})
         return response["protection_enabled"]
 
     async def enable_protection(self) -> None:
@@ -238,6 +585,104 @@ class AdGuardHome:
             msg = "Failed disabling AdGuard Home protection"
             raise AdGuardHomeError(msg) from exception
 
+    async def features(self) -> AdGuardHomeFeatures:
+        """Return the state of all features that can be toggled.
+
+        The state of each feature is requested concurrently.
+
+        Returns
+        -------
+            The state of protection, filtering, parental control, safe
+            browsing, safe search and the query log.
+
+        """
+        (
+            protection,
+            filtering,
+            parental,
+            safebrowsing,
+            safesearch,
+            querylog,
+        ) = await asyncio.gather(
+            self.protection_enabled(),
+            self.filtering.enabled(),
+            self.parental.enabled(),
+            self.safebrowsing.enabled(),
+            self.safesearch.enabled(),
+            self.querylog.enabled(),
+        )
+        from .features import (  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+            AdGuardHomeFeatures,
+        )
+
+        return AdGuardHomeFeatures(
+            protection=protection,
+            filtering=filtering,
+            parental=parental,
+            safebrowsing=safebrowsing,
+            safesearch=safesearch,
+            querylog=querylog,
+        )
+
+    # pylint: disable-next=too-many-arguments
+    async def set_features(  # noqa: PLR0913
+        self,
+        *,
+        protection: bool | None = None,
+        filtering: bool | None = None,
+        parental: bool | None = None,
+        safebrowsing: bool | None = None,
+        safesearch: bool | None = None,
+        querylog: bool | None = None,
+    ) -> AdGuardHomeFeatures:
+        """Enable or disable multiple features at once.
+
+        The current state is requested first; only features that differ
+        from the requested state are changed, concurrently.
+
+        Args:
+        ----
+            protection: Enable or disable protection.
+            filtering: Enable or disable filtering.
+            parental: Enable or disable parental control.
+            safebrowsing: Enable or disable safe browsing.
+            safesearch: Enable or disable safe search enforcing.
+            querylog: Enable or disable the query log.
+
+        Returns:
+        -------
+            The state of the features after the changes.
+
+        """
+        requested = {
+            "protection": protection,
+            "filtering": filtering,
+            "parental": parental,
+            "safebrowsing": safebrowsing,
+            "safesearch": safesearch,
+            "querylog": querylog,
+        }
+        # The disable and enable method of each feature, indexed by state
+        toggles: dict[str, tuple[Callable[[], Awaitable[None]], ...]] = {
+            "protection": (self.disable_protection, self.enable_protection),
+            "filtering": (self.filtering.disable, self.filtering.enable),
+            "parental": (self.parental.disable, self.parental.enable),
+            "safebrowsing": (self.safebrowsing.disable, self.safebrowsing.enable),
+            "safesearch": (self.safesearch.disable, self.safesearch.enable),
+            "querylog": (self.querylog.disable, self.querylog.enable),
+        }
+
+        current = await self.features()
+        changes = {
+            name: enabled
+            for name, enabled in requested.items()
+            if enabled is not None and enabled != getattr(current, name)
+        }
+        await asyncio.gather(
+            *(toggles[name][enabled]() for name, enabled in changes.items())
+        )
+        return dataclasses.replace(current, **changes)
+
     async def version(self) -> str:
         """Return the current version of the AdGuard Home instance.
 
@@ -246,7 +691,7 @@ class AdGuardHome:
             The version number of the connected AdGuard Home instance.
 
         """
-        response = await self.request("status")
+        response = await self.request("status", fields={"version"})
         return response["version"]
 
     async def close(self) -> None:
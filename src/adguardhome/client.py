@@ -2,24 +2,37 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, fields
-from typing import TYPE_CHECKING
+import ipaddress
+import re
+import socket
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
+from time import monotonic
+from typing import TYPE_CHECKING, Any, NoReturn, Self
+from urllib.parse import quote
+
+from .concurrency import error_of, gather_bounded
+from .exceptions import AdGuardHomeError
+from .tracing import set_span_attributes
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Collection, Iterable, Iterator, Mapping
+
     from . import AdGuardHome
 
 
-@dataclass
+@dataclass(slots=True)
 class AutoClient:
     """Automatically discovered AdGuard Home client."""
 
     ip_address: str
     name: str
     source: str
-    whois_info: dict[str, str] | None = None
+    whois_info: Mapping[str, str] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Client:
     """Administratively managed AdGuard Home client."""
 
@@ -40,12 +53,754 @@ class Client:
     upstreams_cache_size: int = 0
 
 
+_CLIENT_FIELDS = frozenset(f.name for f in fields(Client))
+
+
+class _FrozenDict(dict[str, str]):
+    """Read-only dictionary, that can be shared between objects.
+
+    Unlike `MappingProxyType`, it can be copied, pickled and encoded as
+    JSON like any other dictionary.
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *_args: object, **_kwargs: object) -> NoReturn:
+        """Refuse changes to the dictionary."""
+        msg = "The dictionary is read-only"
+        raise TypeError(msg)
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __deepcopy__(self, _memo: dict[int, Any]) -> Self:
+        """Return the dictionary itself, since it cannot change."""
+        return self
+
+    def __reduce__(self) -> tuple[type[Self], tuple[dict[str, str]]]:
+        """Pickle the dictionary by its items."""
+        return type(self), (dict(self),)
+
+
+def _parse_auto_client(entry: Mapping[str, Any]) -> AutoClient:
+    """Parse an automatically discovered client from the API."""
+    return AutoClient(
+        ip_address=entry["ip"],
+        name=entry["name"],
+        source=entry["source"],
+        whois_info=entry.get("whois_info"),
+    )
+
+
+def _iter_auto_clients(entries: Iterable[Mapping[str, Any]]) -> Iterator[AutoClient]:
+    """Lazily parse automatically discovered clients from the API.
+
+    On large networks, the names, sources and WHOIS details of discovered
+    clients are heavily repeated. Those strings are interned and identical
+    WHOIS details are shared as a single read-only dictionary.
+    """
+    intern = sys.intern
+    whois_cache: dict[tuple[tuple[str, str], ...], Mapping[str, str]] = {}
+    for entry in entries:
+        whois_info = None
+        if whois := entry.get("whois_info"):
+            key = tuple(sorted(whois.items()))
+            if (whois_info := whois_cache.get(key)) is None:
+                whois_info = _FrozenDict(
+                    (intern(name), intern(value)) for name, value in key
+                )
+                whois_cache[key] = whois_info
+        yield AutoClient(
+            ip_address=entry["ip"],
+            name=intern(entry["name"]),
+            source=intern(entry["source"]),
+            whois_info=whois_info,
+        )
+
+
+def _parse_client(entry: Mapping[str, Any]) -> Client:
+    """Parse an administratively managed client from the API."""
+    return Client(**{k: v for k, v in entry.items() if k in _CLIENT_FIELDS})
+
+
+def _is_managed(entry: Mapping[str, Any]) -> bool:
+    """Return if a `clients/find` entry is a managed client.
+
+    Entries of runtime clients can have a name (e.g., a hostname from rDNS)
+    too, but always have a WHOIS object; managed clients never have one.
+    """
+    return bool(entry.get("name")) and entry.get("whois_info") is None
+
+
+def _find_chunks(
+    identifiers: Iterable[str], max_url_length: int
+) -> list[dict[str, str]]:
+    """Pack identifiers into query parameters of at most a URL length."""
+    chunks: list[dict[str, str]] = []
+    params: dict[str, str] = {}
+    length = 0
+    for identifier in identifiers:
+        key = f"ip{len(params)}"
+        size = len(key) + len(quote(identifier)) + 2
+        if params and length + size > max_url_length:
+            chunks.append(params)
+            params, length = {}, 0
+            key = "ip0"
+        params[key] = identifier
+        length += size
+    if params:
+        chunks.append(params)
+    return chunks
+
+
+def _client_data(client: Client) -> dict[str, Any]:
+    """Return the API representation of a managed client.
+
+    Unset (None) lists are left out, so AdGuard Home applies its defaults.
+    """
+    return {
+        field: value
+        for field in _CLIENT_FIELDS
+        if (value := getattr(client, field)) is not None
+    }
+
+
+def _client_update_data(
+    client: Client, current: Mapping[str, Any] | None
+) -> dict[str, Any]:
+    """Return the API representation of a managed client, to replace another.
+
+    AdGuard Home replaces a client as a whole on updates. Settings that are
+    not part of `Client` (e.g., the blocked services schedule) and unset
+    (None) lists are therefore kept from the current client, if known.
+    """
+    data = {**(current or {}), **_client_data(client)}
+    if isinstance(safe_search := data.get("safe_search"), dict):
+        # Newer versions take safe search from this object, if present
+        data["safe_search"] = {**safe_search, "enabled": client.safesearch_enabled}
+    return data
+
+
+def _client_state(client: Client) -> dict[str, Any]:
+    """Return the state of a client to compare, where unset lists are empty."""
+    return {
+        field: [] if (value := getattr(client, field)) is None else value
+        for field in _CLIENT_FIELDS
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class ClientSyncResult:
+    """Result of syncing a single managed client."""
+
+    name: str
+    action: str
+    error: AdGuardHomeError | None = None
+
+    @property
+    def success(self) -> bool:
+        """Return if the client was synced successfully."""
+        return self.error is None
+
+
+async def _write_all(
+    writes: list[tuple[str, str, Awaitable[None]]], concurrency: int
+) -> list[ClientSyncResult]:
+    """Run client writes concurrently, and return a result per write."""
+    errors = await gather_bounded(
+        (error_of(write) for _, _, write in writes), concurrency
+    )
+    return [
+        ClientSyncResult(name, action, error)
+        for (name, action, _), error in zip(writes, errors, strict=True)
+    ]
+
+
+@dataclass(frozen=True, slots=True)
+class ClientsSnapshot:
+    """All AdGuard Home clients, as returned by a single request."""
+
+    clients: list[Client]
+    auto_clients: list[AutoClient]
+    supported_tags: list[str]
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> ClientsSnapshot:
+        """Create a clients snapshot from a `clients` API response.
+
+        Args:
+        ----
+            data: The decoded JSON response of the `clients` endpoint.
+
+        Returns:
+        -------
+            The parsed clients snapshot.
+
+        """
+        return cls(
+            clients=[_parse_client(entry) for entry in data.get("clients") or []],
+            auto_clients=[
+                _parse_auto_client(entry) for entry in data.get("auto_clients") or []
+            ],
+            supported_tags=data.get("supported_tags") or [],
+        )
+
+
+_FAMILIES = ((4, socket.AF_INET, 32), (6, socket.AF_INET6, 128))
+_MAC_SEPARATORS = re.compile(r"[:.-]")
+_MAC = re.compile(r"[0-9a-f]{12}")
+
+
+def _normalize_mac(value: str) -> str | None:
+    """Return a MAC address in its canonical form, or None if it is not one."""
+    if len(value) not in (12, 14, 17):
+        return None
+    digits = _MAC_SEPARATORS.sub("", value).lower()
+    if not _MAC.fullmatch(digits):
+        return None
+    return ":".join(digits[i : i + 2] for i in range(0, 12, 2))
+
+
+class ClientResolver:
+    """Resolves which managed client an address or identifier belongs to.
+
+    The identifiers of clients mix IP addresses, CIDR networks, MAC
+    addresses and ClientIDs. Networks are kept in a hash table per prefix
+    length, so the longest prefix match of an address costs one dictionary
+    lookup per distinct prefix length in use. MAC addresses and ClientIDs
+    are exact hash lookups.
+    """
+
+    def __init__(self, clients: Iterable[Client] = ()) -> None:
+        """Initialize the resolver.
+
+        Args:
+        ----
+            clients: The managed clients to resolve to.
+
+        """
+        self._clients: dict[str, Client] = {}
+        self._keys: dict[str, list[tuple[Any, ...]]] = {}
+        self._networks: dict[int, dict[int, dict[int, str]]] = {4: {}, 6: {}}
+        self._prefixes: dict[int, list[int]] = {4: [], 6: []}
+        self._macs: dict[str, str] = {}
+        self._ids: dict[str, str] = {}
+        for client in clients:
+            self.add(client)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: ClientsSnapshot) -> ClientResolver:
+        """Create a resolver for the managed clients of a clients snapshot.
+
+        Args:
+        ----
+            snapshot: The clients snapshot to resolve to.
+
+        Returns:
+        -------
+            A resolver for the clients in the snapshot.
+
+        """
+        return cls(snapshot.clients)
+
+    def __len__(self) -> int:
+        """Return the number of clients known to the resolver."""
+        return len(self._clients)
+
+    def add(self, client: Client) -> None:
+        """Add a client, or replace a client with the same name.
+
+        Args:
+        ----
+            client: The client to add.
+
+        """
+        self.remove(client.name)
+        self._clients[client.name] = client
+        keys: list[tuple[Any, ...]] = []
+        for identifier in client.ids:
+            if mac := _normalize_mac(identifier):
+                self._macs[mac] = client.name
+                keys.append(("mac", mac))
+                continue
+            try:
+                network = ipaddress.ip_network(identifier, strict=False)
+            except ValueError:
+                self._ids[identifier] = client.name
+                keys.append(("id", identifier))
+                continue
+
+            version = network.version
+            prefix = network.prefixlen
+            key = int(network.network_address) >> (network.max_prefixlen - prefix)
+            table = self._networks[version].setdefault(prefix, {})
+            table[key] = client.name
+            keys.append(("net", version, prefix, key))
+            if prefix not in self._prefixes[version]:
+                self._prefixes[version] = sorted(self._networks[version], reverse=True)
+        self._keys[client.name] = keys
+
+    def remove(self, name: str) -> None:
+        """Remove a client by name, if known.
+
+        Args:
+        ----
+            name: The name of the client to remove.
+
+        """
+        if self._clients.pop(name, None) is None:
+            return
+        for key in self._keys.pop(name):
+            if key[0] == "mac" and self._macs.get(key[1]) == name:
+                del self._macs[key[1]]
+            elif key[0] == "id" and self._ids.get(key[1]) == name:
+                del self._ids[key[1]]
+            elif key[0] == "net":
+                _, version, prefix, network = key
+                table = self._networks[version].get(prefix, {})
+                if table.get(network) != name:
+                    continue
+                del table[network]
+                if not table:
+                    del self._networks[version][prefix]
+                    self._prefixes[version].remove(prefix)
+
+    def resolve(self, identifier: str) -> Client | None:
+        """Return the client an IP address, MAC address or ClientID belongs to.
+
+        Args:
+        ----
+            identifier: The IP address, MAC address or ClientID to resolve.
+
+        Returns:
+        -------
+            The client with the most specific match, or None if no
+            client matches.
+
+        """
+        if (name := self._ids.get(identifier)) is None:
+            name = self._resolve_address(identifier)
+        return self._clients[name] if name is not None else None
+
+    def _resolve_address(self, identifier: str) -> str | None:
+        """Return the client name matching an IP or MAC address."""
+        # inet_pton is considerably faster than the ipaddress module
+        for version, family, bits in _FAMILIES:
+            try:
+                packed = socket.inet_pton(family, identifier)
+            except OSError:
+                continue
+            value = int.from_bytes(packed, "big")
+            networks = self._networks[version]
+            for prefix in self._prefixes[version]:
+                if (name := networks[prefix].get(value >> (bits - prefix))) is not None:
+                    return name
+            return None
+
+        mac = _normalize_mac(identifier)
+        return self._macs.get(mac) if mac else None
+
+    def resolve_many(self, identifiers: Iterable[str]) -> list[Client | None]:
+        """Resolve many identifiers at once.
+
+        Repeated identifiers, common in query logs, are only resolved once.
+
+        Args:
+        ----
+            identifiers: The IP addresses, MAC addresses or ClientIDs.
+
+        Returns:
+        -------
+            A list with the matching client, or None, for each identifier.
+
+        """
+        resolved: dict[str, Client | None] = {}
+        resolve = self.resolve
+        result = []
+        for identifier in identifiers:
+            if identifier not in resolved:
+                resolved[identifier] = resolve(identifier)
+            result.append(resolved[identifier])
+        return result
+
+
+class _TTLCache:
+    """Least recently used cache, of which entries expire after a TTL."""
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize the cache."""
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float, Client | None]] = OrderedDict()
+
+    def get(self, key: str) -> tuple[bool, Client | None]:
+        """Return if the key is cached, and its value."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry[0] < monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry[1]
+
+    def set(self, key: str, value: Client | None, ttl: float) -> None:
+        """Cache a value for the given number of seconds."""
+        self._entries[key] = (monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        self._entries.clear()
+
+
 @dataclass
 class AdGuardHomeClients:
     """Controls AdGuard Home client management."""
 
     adguard: AdGuardHome
 
+    _find_cache: _TTLCache = field(
+        default_factory=lambda: _TTLCache(4096),
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    async def snapshot(self) -> ClientsSnapshot:
+        """Return all clients and supported tags from a single request.
+
+        Returns
+        -------
+            A snapshot with the configured clients, the automatically
+            discovered clients and the supported tags.
+
+        """
+        response = await self.adguard.request("clients")
+        return ClientsSnapshot.from_dict(response)
+
+    async def add(self, client: Client) -> None:
+        """Add a new managed client to AdGuard Home.
+
+        Args:
+        ----
+            client: The client to add.
+
+        Raises:
+        ------
+            AdGuardHomeError: Failed adding the client.
+
+        """
+        try:
+            await self.adguard.request(
+                "clients/add",
+                method="POST",
+                json_data=_client_data(client),
+            )
+        except AdGuardHomeError as exception:
+            msg = "Failed adding client to AdGuard Home"
+            raise AdGuardHomeError(msg) from exception
+        finally:
+            # Cached lookups may no longer match the managed clients
+            self._find_cache.clear()
+
+    async def update(self, client: Client, *, name: str | None = None) -> None:
+        """Update a managed client in AdGuard Home.
+
+        The current client is fetched first, so its settings that `Client`
+        does not cover (e.g., the blocked services schedule) are kept. To
+        update many clients, use `update_many`, which fetches them once.
+
+        Args:
+        ----
+            client: The new settings of the client.
+            name: The current name of the client, when it is renamed;
+                defaults to the name of the given client.
+
+        Raises:
+        ------
+            AdGuardHomeError: Failed updating the client.
+
+        """
+        name = name or client.name
+        try:
+            response = await self.adguard.request("clients")
+        except AdGuardHomeError as exception:
+            msg = "Failed updating client in AdGuard Home"
+            raise AdGuardHomeError(msg) from exception
+        current = next(
+            (
+                entry
+                for entry in response.get("clients") or []
+                if entry.get("name") == name
+            ),
+            None,
+        )
+        await self._update(client, name, current)
+
+    async def _update(
+        self, client: Client, name: str, current: Mapping[str, Any] | None
+    ) -> None:
+        """Replace a managed client, keeping the settings of the current one."""
+        try:
+            await self.adguard.request(
+                "clients/update",
+                method="POST",
+                json_data={"name": name, "data": _client_update_data(client, current)},
+            )
+        except AdGuardHomeError as exception:
+            msg = "Failed updating client in AdGuard Home"
+            raise AdGuardHomeError(msg) from exception
+        finally:
+            # Cached lookups may no longer match the managed clients
+            self._find_cache.clear()
+
+    async def delete(self, name: str) -> None:
+        """Delete a managed client from AdGuard Home.
+
+        Args:
+        ----
+            name: The name of the client to delete.
+
+        Raises:
+        ------
+            AdGuardHomeError: Failed deleting the client.
+
+        """
+        try:
+            await self.adguard.request(
+                "clients/delete",
+                method="POST",
+                json_data={"name": name},
+            )
+        except AdGuardHomeError as exception:
+            msg = "Failed deleting client from AdGuard Home"
+            raise AdGuardHomeError(msg) from exception
+        finally:
+            # Cached lookups may no longer match the managed clients
+            self._find_cache.clear()
+
+    async def add_many(
+        self, clients: Iterable[Client], *, concurrency: int = 8
+    ) -> list[ClientSyncResult]:
+        """Add many managed clients to AdGuard Home.
+
+        Args:
+        ----
+            clients: The clients to add.
+            concurrency: Maximum number of concurrent writes.
+
+        Returns:
+        -------
+            A result per client, with the error in case adding it failed.
+
+        """
+        return await _write_all(
+            [(client.name, "add", self.add(client)) for client in clients],
+            concurrency,
+        )
+
+    async def update_many(
+        self, clients: Iterable[Client], *, concurrency: int = 8
+    ) -> list[ClientSyncResult]:
+        """Update many managed clients in AdGuard Home, matched by name.
+
+        The current clients are fetched once, so their settings that
+        `Client` does not cover (e.g., the blocked services schedule) are
+        kept. Use `update` to rename a client.
+
+        Args:
+        ----
+            clients: The new settings of the clients.
+            concurrency: Maximum number of concurrent writes.
+
+        Returns:
+        -------
+            A result per client, with the error in case updating it failed.
+
+        Raises:
+        ------
+            AdGuardHomeError: Failed fetching the current clients.
+
+        """
+        try:
+            response = await self.adguard.request("clients")
+        except AdGuardHomeError as exception:
+            msg = "Failed updating clients in AdGuard Home"
+            raise AdGuardHomeError(msg) from exception
+        entries = {entry["name"]: entry for entry in response.get("clients") or []}
+        return await _write_all(
+            [
+                (
+                    client.name,
+                    "update",
+                    self._update(client, client.name, entries.get(client.name)),
+                )
+                for client in clients
+            ],
+            concurrency,
+        )
+
+    async def delete_many(
+        self, names: Iterable[str], *, concurrency: int = 8
+    ) -> list[ClientSyncResult]:
+        """Delete many managed clients from AdGuard Home.
+
+        Args:
+        ----
+            names: The names of the clients to delete.
+            concurrency: Maximum number of concurrent writes.
+
+        Returns:
+        -------
+            A result per client, with the error in case deleting it failed.
+
+        """
+        return await _write_all(
+            [(name, "delete", self.delete(name)) for name in names], concurrency
+        )
+
+    async def sync(
+        self,
+        desired: Iterable[Client],
+        *,
+        delete: bool = True,
+        concurrency: int = 8,
+    ) -> list[ClientSyncResult]:
+        """Make the managed clients in AdGuard Home match the given clients.
+
+        The current clients are fetched once and compared by name; only
+        clients that are new, changed or (optionally) no longer desired
+        cause a write. Writes run concurrently, bounded by `concurrency`.
+
+        Args:
+        ----
+            desired: The managed clients that should exist.
+            delete: Delete managed clients that are not in `desired`.
+            concurrency: Maximum number of concurrent writes.
+
+        Returns:
+        -------
+            A result per client; with the `add`, `update`, `delete` or
+            `unchanged` action taken and the error in case it failed.
+
+        """
+        response = await self.adguard.request("clients")
+        entries = {entry["name"]: entry for entry in response.get("clients") or []}
+        current = {name: _parse_client(entry) for name, entry in entries.items()}
+        wanted = {client.name: client for client in desired}
+
+        results: list[ClientSyncResult] = []
+        writes: list[tuple[str, str, Awaitable[None]]] = []
+        for name, client in wanted.items():
+            if name not in current:
+                writes.append((name, "add", self.add(client)))
+            elif _client_state(client) != _client_state(current[name]):
+                writes.append(
+                    (name, "update", self._update(client, name, entries[name]))
+                )
+            else:
+                results.append(ClientSyncResult(name, "unchanged"))
+        if delete:
+            writes.extend(
+                (name, "delete", self.delete(name))
+                for name in current
+                if name not in wanted
+            )
+
+        results.extend(await _write_all(writes, concurrency))
+        return results
+
+    async def find_many(
+        self,
+        identifiers: Collection[str],
+        *,
+        cache_ttl: float = 60.0,
+        concurrency: int = 4,
+        max_url_length: int = 2000,
+    ) -> dict[str, Client | None]:
+        """Find the clients of many IP addresses or ClientIDs.
+
+        Identifiers are looked up in batches, packing as many as possible
+        in a request without exceeding a safe URL length. Results are kept
+        in a least recently used cache, so repeated lookups stay local. The
+        cache is cleared when managed clients are added, updated or deleted
+        through this API.
+
+        Args:
+        ----
+            identifiers: The IP addresses or ClientIDs to look up.
+            cache_ttl: Number of seconds to cache results; 0 disables the
+                cache, so all identifiers are looked up.
+            concurrency: Maximum number of concurrent requests.
+            max_url_length: Maximum length of the query string of a request.
+
+        Returns:
+        -------
+            A dictionary with the client of each identifier, or None when
+            the identifier does not belong to a known client.
+
+        """
+        result: dict[str, Client | None] = {}
+        missing: list[str] = []
+        for identifier in dict.fromkeys(identifiers):
+            cached, client = (
+                self._find_cache.get(identifier) if cache_ttl > 0 else (False, None)
+            )
+            if cached:
+                result[identifier] = client
+            else:
+                missing.append(identifier)
+        set_span_attributes(
+            {
+                "adguardhome.cache.hits": len(result),
+                "adguardhome.cache.misses": len(missing),
+            }
+        )
+
+        found: dict[str, Any] = {}
+        for response in await gather_bounded(
+            (
+                self.adguard.request("clients/find", params=params)
+                for params in _find_chunks(missing, max_url_length)
+            ),
+            concurrency,
+        ):
+            for entry in response or []:
+                found.update(entry)
+        for identifier in missing:
+            data = found.get(identifier) or {}
+            client = _parse_client(data) if _is_managed(data) else None
+            result[identifier] = client
+            if cache_ttl > 0:
+                self._find_cache.set(identifier, client, cache_ttl)
+
+        return result
+
+    def clear_find_cache(self) -> None:
+        """Clear the cache of results of `find_many`."""
+        self._find_cache.clear()
+
+    async def iter_auto_clients(self) -> Iterator[AutoClient]:
+        """Return a lazy iterator over all automatically discovered clients.
+
+        Unlike `get_auto_clients`, the clients are created while iterating,
+        repeated strings are interned and identical WHOIS details are shared
+        as read-only dictionaries, which saves a lot of memory on large networks.
+        The response itself is still read and decoded as a whole; to avoid
+        that as well, stream the raw entries with
+        `adguard.stream("clients", "auto_clients")`.
+
+        Returns
+        -------
+            An iterator of automatically discovered clients on the
+            AdGuard Home instance.
+
+        """
+        response = await self.adguard.request("clients")
+        return _iter_auto_clients(response.get("auto_clients") or [])
+
     async def get_auto_clients(self) -> list[AutoClient]:
         """Return all automatically discovered clients.
 
@@ -57,13 +812,7 @@ class AdGuardHomeClients:
         """
         response = await self.adguard.request("clients")
         return [
-            AutoClient(
-                ip_address=entry["ip"],
-                name=entry["name"],
-                source=entry["source"],
-                whois_info=entry.get("whois_info"),
-            )
-            for entry in response.get("auto_clients") or []
+            _parse_auto_client(entry) for entry in response.get("auto_clients") or []
         ]
 
     async def get_clients(self) -> list[Client]:
@@ -75,11 +824,7 @@ class AdGuardHomeClients:
 
         """
         response = await self.adguard.request("clients")
-        known = {f.name for f in fields(Client)}
-        return [
-            Client(**{k: v for k, v in entry.items() if k in known})
-            for entry in response.get("clients") or []
-        ]
+        return [_parse_client(entry) for entry in response.get("clients") or []]
 
     async def get_supported_tags(self) -> list[str]:
         """Return the list of supported client tags.
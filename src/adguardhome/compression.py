@@ -0,0 +1,145 @@
+"""Asynchronous Python client for the AdGuard Home API."""
+
+from __future__ import annotations
+
+import importlib
+import zlib
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .exceptions import AdGuardHomeError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import ModuleType
+
+# Modules that provide each optional content coding, in order of preference.
+_OPTIONAL_CODINGS = (
+    ("zstd", ("compression.zstd", "backports.zstd")),
+    ("br", ("brotli", "brotlicffi")),
+)
+
+_modules: dict[str, ModuleType | None] = {}
+
+
+def _module(coding: str) -> ModuleType | None:
+    """Return the module that decompresses an optional coding, if installed."""
+    if coding not in _modules:
+        _modules[coding] = None
+        for name in dict(_OPTIONAL_CODINGS)[coding]:
+            try:
+                _modules[coding] = importlib.import_module(name)
+            except ImportError:
+                continue
+            break
+    return _modules[coding]
+
+
+def _limits_output(module: ModuleType) -> bool:
+    """Return if a decompression module can stop at a maximum output size.
+
+    Only Brotli 1.2.0 and later can limit the output (along with telling
+    if more data can be accepted); older versions and brotlicffi cannot.
+    """
+    return module.__name__ != "brotlicffi" and (
+        module.__name__ != "brotli"
+        or hasattr(module.Decompressor, "can_accept_more_data")
+    )
+
+
+def encodings(*, limited: bool = False) -> tuple[str, ...]:
+    """Return the content codings that can be decompressed, best first.
+
+    Args:
+    ----
+        limited: Only return codings that can be decompressed up to a
+            maximum size.
+
+    Returns:
+    -------
+        `gzip` and `deflate`, preceded by `zstd` and `br` when a library
+        for them is installed.
+
+    """
+    optional = tuple(
+        coding
+        for coding, _ in _OPTIONAL_CODINGS
+        if (module := _module(coding)) and (not limited or _limits_output(module))
+    )
+    return (*optional, "gzip", "deflate")
+
+
+def _decompressor(coding: str, data: bytes, limit: int) -> Callable[[], bytes]:
+    """Return a function that decompresses data, up to a limit if positive."""
+    if coding in ("gzip", "x-gzip", "deflate"):
+        wbits = 16 + zlib.MAX_WBITS
+        if coding == "deflate":
+            # Deflate should be zlib wrapped, but some servers send it raw
+            zlib_wrapped = data[:1] and data[0] & 0x0F == zlib.DEFLATED
+            wbits = zlib.MAX_WBITS if zlib_wrapped else -zlib.MAX_WBITS
+        return lambda: zlib.decompressobj(wbits).decompress(data, max(limit, 0))
+    if coding == "zstd" and (module := _module("zstd")):
+        return lambda: module.ZstdDecompressor().decompress(data, limit)
+    if coding == "br" and (module := _module("br")):
+        if limit < 0:
+            return lambda: module.Decompressor().process(data)
+        if _limits_output(module):
+            return lambda: module.Decompressor().process(
+                data, output_buffer_limit=limit
+            )
+    msg = f"Unsupported content encoding in response: {coding}"
+    raise AdGuardHomeError(msg)
+
+
+def decompress(data: bytes, coding: str, max_size: int | None = None) -> bytes:
+    """Decompress a response body.
+
+    Decompression stops as soon as the output exceeds the maximum size, so
+    a small compressed body cannot expand into a huge one.
+
+    Args:
+    ----
+        data: The compressed response body.
+        coding: The content coding of the body; e.g., `gzip`.
+        max_size: Optional maximum size of the decompressed body, in bytes.
+
+    Returns:
+    -------
+        The decompressed response body.
+
+    Raises:
+    ------
+        AdGuardHomeError: The coding is not supported, the body is invalid
+            or it exceeds the maximum size.
+
+    """
+    run = _decompressor(coding, data, -1 if max_size is None else max_size + 1)
+    try:
+        result = run()
+    except Exception as exception:
+        msg = f"Invalid {coding} compressed response from AdGuard Home"
+        raise AdGuardHomeError(msg) from exception
+    if max_size is not None and len(result) > max_size:
+        msg = (
+            "Decompressed response from AdGuard Home exceeds the maximum size "
+            f"of {max_size} bytes"
+        )
+        raise AdGuardHomeError(msg)
+    return result
+
+
+@dataclass(slots=True)
+class CompressionCounters:
+    """Bytes received and decompressed for an endpoint with compression."""
+
+    responses: int = 0
+    compressed_bytes: int = 0
+    decompressed_bytes: int = 0
+    decompress_time: float = 0.0
+
+    @property
+    def savings(self) -> float:
+        """Return the fraction (0.0 - 1.0) of bytes saved by compression."""
+        if not self.decompressed_bytes:
+            return 0.0
+        return 1.0 - self.compressed_bytes / self.decompressed_bytes
@@ -0,0 +1,54 @@
+"""Asynchronous Python client for the AdGuard Home API."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, TypeVar
+
+from .exceptions import AdGuardHomeError
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Iterable
+
+_T = TypeVar("_T")
+
+
+async def gather_bounded(awaitables: Iterable[Awaitable[_T]], limit: int) -> list[_T]:
+    """Await awaitables concurrently, but no more than a limit at a time.
+
+    Args:
+    ----
+        awaitables: The awaitables to await; e.g., API requests.
+        limit: Maximum number of awaitables awaited at the same time.
+
+    Returns:
+    -------
+        The results of the awaitables, in the same order.
+
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def bounded(awaitable: Awaitable[_T]) -> _T:
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*(bounded(awaitable) for awaitable in awaitables))
+
+
+async def error_of(awaitable: Awaitable[object]) -> AdGuardHomeError | None:
+    """Await an awaitable, and return the AdGuard Home error it raised.
+
+    Args:
+    ----
+        awaitable: The awaitable to await; e.g., a write to the API.
+
+    Returns:
+    -------
+        The error raised by the awaitable, or None if it succeeded.
+
+    """
+    try:
+        await awaitable
+    except AdGuardHomeError as exception:
+        return exception
+    return None
@@ -0,0 +1,259 @@
+"""Asynchronous Python client for the AdGuard Home API."""
+
+from __future__ import annotations
+
+import cProfile
+import heapq
+import io
+import itertools
+import logging
+import pstats
+import random
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .instrumentation import RequestHooks
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from .instrumentation import RequestInfo
+
+_LOGGER = logging.getLogger(__name__)
+
+# Phases in the order they happen, with their name in the log.
+PHASES = (
+    ("connection_queue", "queue"),
+    ("dns", "dns"),
+    ("connect", "connect"),
+    ("ttfb", "ttfb"),
+    ("body", "body"),
+    ("decompress", "decompress"),
+    ("decode", "decode"),
+)
+
+
+def format_phases(phases: Mapping[str, float]) -> str:
+    """Return a phase breakdown of a request in milliseconds.
+
+    Args:
+    ----
+        phases: The duration of each phase in seconds.
+
+    Returns:
+    -------
+        The phases, in the order they happen; e.g., `ttfb=12.3ms body=0.4ms`.
+
+    """
+    return " ".join(
+        f"{label}={phases[phase] * 1000:.1f}ms"
+        for phase, label in PHASES
+        if phase in phases
+    )
+
+
+@dataclass(slots=True, kw_only=True)
+class SlowCall:
+    """A captured slow request, with its profile and memory allocations."""
+
+    endpoint: str
+    status: int | None
+    duration: float
+    phases: dict[str, float]
+    profile: str | None = None
+    memory_peak: int | None = None
+    memory_top: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the slow call as a JSON serializable dictionary."""
+        return {
+            "endpoint": self.endpoint,
+            "status": self.status,
+            "duration": self.duration,
+            "phases": self.phases,
+            "profile": self.profile,
+            "memory_peak": self.memory_peak,
+            "memory_top": self.memory_top,
+        }
+
+
+@dataclass(slots=True)
+class _Capture:
+    """Profiling state of a sampled request."""
+
+    profiler: cProfile.Profile | None = None
+    memory: bool = False
+
+
+class SlowCallLog(RequestHooks):
+    """Logs slow requests with their phase breakdown, and profiles them.
+
+    Requests that take longer than the threshold are logged as a warning,
+    with the time spent per phase. Optionally, a sample of requests is
+    profiled with `cProfile` and/or `tracemalloc`; the captures of the
+    slowest requests are kept in a bounded buffer, that can be dumped on
+    demand. Profiles include everything the thread ran during the request,
+    including other tasks on the event loop. Connection phases are only
+    known for sessions with the trace config of the client; TLS handshakes
+    are part of `connect`.
+    """
+
+    # pylint: disable-next=too-many-arguments
+    def __init__(  # noqa: PLR0913
+        self,
+        threshold: float = 1.0,
+        *,
+        profile: bool = False,
+        memory: bool = False,
+        sample_rate: float = 1.0,
+        keep: int = 10,
+        profile_lines: int = 25,
+    ) -> None:
+        """Initialize the slow call log.
+
+        Args:
+        ----
+            threshold: Duration in seconds above which a request is slow.
+            profile: Profile sampled requests with `cProfile`.
+            memory: Trace the memory allocations of sampled requests with
+                `tracemalloc`, which is started and stopped for each request.
+                Requests are not traced while `tracemalloc` is already
+                tracing; e.g., for another request.
+            sample_rate: Fraction (0.0 - 1.0) of requests to capture.
+            keep: Number of captures of the slowest requests to keep.
+            profile_lines: Number of functions to keep from each profile.
+
+        """
+        self.threshold = threshold
+        self.profile = profile
+        self.memory = memory
+        self.sample_rate = sample_rate
+        self.keep = keep
+        self.profile_lines = profile_lines
+        self._captures: dict[int, _Capture] = {}
+        self._slowest: list[tuple[float, int, SlowCall]] = []
+        self._counter = itertools.count()
+        self._random = random.Random()  # noqa: S311
+        self._profiling = False
+
+    def on_request_start(self, info: RequestInfo) -> None:
+        """Start capturing a sampled request."""
+        if not (self.profile or self.memory) or (
+            self.sample_rate < 1.0 and self._random.random() >= self.sample_rate
+        ):
+            return
+        capture = _Capture()
+        # Only a single profiler can be active at a time, so concurrent
+        # requests are not profiled while another one is.
+        if self.profile and not self._profiling:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                _LOGGER.debug("Another profiler is active, not profiling request")
+            else:
+                capture.profiler = profiler
+                self._profiling = True
+        # Likewise, memory is traced for a single request at a time, since
+        # the peak is of all allocations in the process.
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            capture.memory = True
+        self._captures[id(info)] = capture
+
+    def on_request_end(self, info: RequestInfo) -> None:
+        """Log and keep the request, when it is slow."""
+        slow = info.duration >= self.threshold
+        call = None
+        if (capture := self._captures.pop(id(info), None)) is not None:
+            if slow and self._is_kept(info.duration):
+                call = SlowCall(
+                    endpoint=info.endpoint,
+                    status=info.status,
+                    duration=info.duration,
+                    phases=dict(info.phases),
+                )
+            self._finish(capture, call)
+        if not slow:
+            return
+
+        _LOGGER.warning(
+            "Slow AdGuard Home request %s (status %s) took %.1fms: %s",
+            info.endpoint,
+            info.status,
+            info.duration * 1000,
+            format_phases(info.phases) or "no phases recorded",
+        )
+        if call is None:
+            return
+
+        entry = (info.duration, next(self._counter), call)
+        if len(self._slowest) < self.keep:
+            heapq.heappush(self._slowest, entry)
+        else:
+            heapq.heapreplace(self._slowest, entry)
+
+    def _is_kept(self, duration: float) -> bool:
+        """Return whether a slow request is one of the slowest to keep."""
+        if len(self._slowest) < self.keep:
+            return True
+        return bool(self._slowest) and duration > self._slowest[0][0]
+
+    def _finish(self, capture: _Capture, call: SlowCall | None) -> None:
+        """Stop capturing a request, adding the results to the call, if any."""
+        if capture.profiler is not None:
+            capture.profiler.disable()
+            self._profiling = False
+            if call is not None:
+                output = io.StringIO()
+                stats = pstats.Stats(capture.profiler, stream=output)
+                stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+                    self.profile_lines
+                )
+                call.profile = output.getvalue()
+        if capture.memory:
+            if call is not None:
+                call.memory_peak = tracemalloc.get_traced_memory()[1]
+                snapshot = tracemalloc.take_snapshot()
+                call.memory_top = [
+                    str(statistic) for statistic in snapshot.statistics("lineno")[:10]
+                ]
+            tracemalloc.stop()
+
+    def on_request_error(self, info: RequestInfo) -> None:
+        """Log and keep the failed request, when it is slow."""
+        self.on_request_end(info)
+
+    @property
+    def slowest(self) -> list[SlowCall]:
+        """Return the captured slow requests, slowest first."""
+        return [call for _, _, call in sorted(self._slowest, reverse=True)]
+
+    def dump(self) -> str:
+        """Return a report of the captured slow requests, slowest first.
+
+        Returns
+        -------
+            A human readable report with the phases, profile and memory
+            allocations of each captured request.
+
+        """
+        sections = []
+        for call in self.slowest:
+            lines = [
+                f"{call.endpoint} (status {call.status}) took "
+                f"{call.duration * 1000:.1f}ms",
+                f"Phases: {format_phases(call.phases)}",
+            ]
+            if call.memory_peak is not None:
+                lines.append(f"Memory peak: {call.memory_peak} bytes")
+                lines.extend(f"  {line}" for line in call.memory_top)
+            if call.profile:
+                lines.append(call.profile)
+            sections.append("\n".join(lines))
+        return "\n\n".join(sections)
+
+    def clear(self) -> None:
+        """Clear the captured slow requests."""
+        self._slowest.clear()
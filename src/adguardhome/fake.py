@@ -0,0 +1,512 @@
+"""Asynchronous Python client for the AdGuard Home API."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections import Counter, deque
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any, Self
+
+from aiohttp import web
+
+from .adguardhome import AdGuardHome
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+_QUERYLOG_REASONS = ("NotFilteredNotFound", "FilteredBlackList", "Rewrite")
+_SOURCES = ("arp", "rdns", "dhcp", "etc/hosts")
+
+
+class FakeAdGuardHome:  # pylint: disable=too-many-instance-attributes
+    """Local stand-in for an AdGuard Home instance, for tests and benchmarks.
+
+    The server implements the endpoints used by this library on a real
+    socket, so connection handling of the client is exercised end to end.
+    It keeps state between requests (e.g., added clients and DNS rewrites),
+    and can add latency, generate large payloads and inject errors.
+    """
+
+    # pylint: disable-next=too-many-arguments
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        base_path: str = "/control",
+        compress: bool = False,
+        latency: float = 0.0,
+        payload_size: int = 10,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+        version: str = "v0.107.50",
+    ) -> None:
+        """Initialize the fake AdGuard Home.
+
+        Args:
+        ----
+            base_path: Base path of the API.
+            compress: Compress responses with gzip or deflate, when the
+                client accepts it.
+            latency: Time in seconds each request is delayed.
+            payload_size: Number of generated items in list payloads; e.g.,
+                top lists in stats, discovered clients and query log entries.
+            error_rate: Fraction (0.0 - 1.0) of requests that randomly fail
+                with an internal server error.
+            seed: Optional seed for the random errors, for repeatable runs.
+            version: The AdGuard Home version to report.
+
+        """
+        self.base_path = "/" + base_path.strip("/")
+        self.compress = compress
+        self.latency = latency
+        self.error_rate = error_rate
+        self.version = version
+        self.host = "127.0.0.1"
+        self.port = 0
+        self.requests: Counter[str] = Counter()
+        self._random = random.Random(seed)  # noqa: S311
+        self._errors: dict[str, deque[int]] = {}
+        self._runner: web.AppRunner | None = None
+
+        self.protection_enabled = True
+        self.parental_enabled = False
+        self.safebrowsing_enabled = False
+        self.safesearch_enabled = False
+        self.filtering: dict[str, Any] = {
+            "enabled": True,
+            "interval": 24,
+            "filters": [],
+            "whitelist_filters": [],
+            "user_rules": [],
+        }
+        self.querylog_config: dict[str, Any] = {"enabled": True, "interval": 90}
+        self.stats_interval = 1
+        self.clients: list[dict[str, Any]] = []
+        self.rewrites: list[dict[str, Any]] = []
+        self.update: dict[str, Any] = {"disabled": True}
+        self.generate(payload_size)
+
+    def generate(self, payload_size: int) -> None:
+        """Replace the generated stats, discovered clients and query log.
+
+        Args:
+        ----
+            payload_size: Number of items in each generated list.
+
+        """
+        self.auto_clients = [
+            {
+                "ip": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}",
+                "name": f"device-{i}",
+                "source": _SOURCES[i % len(_SOURCES)],
+                "whois_info": {"orgname": "Local Network"} if i % 2 else {},
+            }
+            for i in range(payload_size)
+        ]
+
+        now = datetime.now(UTC)
+        self.querylog = [
+            {
+                "answer": [],
+                "cached": False,
+                "client": self.auto_clients[i]["ip"],
+                "client_proto": "",
+                "elapsedMs": f"{i % 50}.5",
+                "question": {"class": "IN", "name": f"host-{i}.example", "type": "A"},
+                "reason": _QUERYLOG_REASONS[i % len(_QUERYLOG_REASONS)],
+                "status": "NOERROR",
+                "time": (now - timedelta(seconds=i)).isoformat(),
+                "upstream": "https://dns.quad9.net:443/dns-query",
+            }
+            for i in range(payload_size)
+        ]
+
+        top = [{f"host-{i}.example": payload_size - i} for i in range(payload_size)]
+        series = [i % 100 for i in range(24)]
+        self.stats: dict[str, Any] = {
+            "time_units": "hours",
+            "num_dns_queries": sum(series) * 10,
+            "num_blocked_filtering": sum(series),
+            "num_replaced_safebrowsing": 0,
+            "num_replaced_safesearch": 0,
+            "num_replaced_parental": 0,
+            "avg_processing_time": 0.0125,
+            "dns_queries": [value * 10 for value in series],
+            "blocked_filtering": series,
+            "replaced_safebrowsing": [0] * len(series),
+            "replaced_parental": [0] * len(series),
+            "top_queried_domains": top,
+            "top_blocked_domains": top,
+            "top_clients": [
+                {client["ip"]: payload_size - i}
+                for i, client in enumerate(self.auto_clients)
+            ],
+            "top_upstreams_responses": [{"https://dns.quad9.net:443/dns-query": 1}],
+            "top_upstreams_avg_time": [{"https://dns.quad9.net:443/dns-query": 0.01}],
+        }
+
+    def fail(self, endpoint: str, status: int = 500, *, count: int = 1) -> None:
+        """Let the next requests to an endpoint fail.
+
+        Args:
+        ----
+            endpoint: The endpoint, relative to the base path; e.g., `stats`.
+            status: The HTTP status code to respond with.
+            count: Number of requests that should fail.
+
+        """
+        self._errors.setdefault(endpoint.strip("/"), deque()).extend([status] * count)
+
+    @property
+    def url(self) -> str:
+        """Return the base URL of the API."""
+        return f"http://{self.host}:{self.port}{self.base_path}"
+
+    def client(self, **kwargs: Any) -> AdGuardHome:
+        """Return an AdGuard Home client connected to this server.
+
+        Args:
+        ----
+            **kwargs: Additional arguments for the AdGuard Home client.
+
+        Returns:
+        -------
+            The AdGuard Home client.
+
+        """
+        return AdGuardHome(
+            self.host, port=self.port, base_path=self.base_path, **kwargs
+        )
+
+    @web.middleware
+    async def _middleware(
+        self, request: web.Request, handler: Handler
+    ) -> web.StreamResponse:
+        """Count requests and apply the latency, errors and compression."""
+        endpoint = request.path.removeprefix(self.base_path).strip("/")
+        self.requests[endpoint] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        response: web.StreamResponse
+        if errors := self._errors.get(endpoint):
+            status = errors.popleft()
+            response = web.Response(status=status, text=f"Injected error {status}")
+        elif self.error_rate and self._random.random() < self.error_rate:
+            response = web.Response(status=500, text="Injected random error")
+        else:
+            response = await handler(request)
+        # aiohttp cannot compress responses without a body; e.g., of writes
+        if self.compress and getattr(response, "body", None) is not None:
+            response.enable_compression()
+        return response
+
+    @staticmethod
+    def _bad_request(message: str) -> web.Response:
+        """Return a bad request response, like AdGuard Home does."""
+        return web.Response(status=400, text=message)
+
+    async def _status(self, _request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "dns_addresses": [self.host],
+                "dns_port": 53,
+                "http_port": self.port,
+                "protection_enabled": self.protection_enabled,
+                "running": True,
+                "version": self.version,
+            }
+        )
+
+    async def _protection(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        self.protection_enabled = bool(data["enabled"])
+        return web.Response()
+
+    async def _stats(self, _request: web.Request) -> web.Response:
+        return web.json_response(self.stats)
+
+    async def _stats_info(self, _request: web.Request) -> web.Response:
+        return web.json_response({"interval": self.stats_interval})
+
+    async def _stats_reset(self, _request: web.Request) -> web.Response:
+        for key, value in self.stats.items():
+            if key.startswith("num_"):
+                self.stats[key] = 0
+            elif isinstance(value, list):
+                self.stats[key] = []
+        return web.Response()
+
+    async def _filtering_status(self, _request: web.Request) -> web.Response:
+        return web.json_response(self.filtering)
+
+    async def _filtering_config(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        self.filtering["enabled"] = bool(data["enabled"])
+        self.filtering["interval"] = data["interval"]
+        return web.Response()
+
+    def _filter_list(self, data: dict[str, Any]) -> list[dict[str, Any]]:
+        """Return the block or allow list a filtering request is about."""
+        return self.filtering["whitelist_filters" if data["whitelist"] else "filters"]
+
+    async def _filtering_add_url(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        filters = self._filter_list(data)
+        if any(fil["url"] == data["url"] for fil in filters):
+            return self._bad_request(f"Filter URL already added -- {data['url']}")
+        filters.append(
+            {
+                "enabled": True,
+                "id": len(filters) + 1,
+                "name": data["name"],
+                "rules_count": 100,
+                "url": data["url"],
+            }
+        )
+        return web.Response()
+
+    async def _filtering_remove_url(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        filters = self._filter_list(data)
+        filters[:] = [fil for fil in filters if fil["url"] != data["url"]]
+        return web.Response()
+
+    async def _filtering_set_url(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        for fil in self._filter_list(data):
+            if fil["url"] == data["url"]:
+                fil.update(data["data"])
+                return web.Response()
+        return self._bad_request(f"Filter URL not found -- {data['url']}")
+
+    async def _filtering_refresh(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        return web.json_response({"updated": len(self._filter_list(data))})
+
+    async def _clients(self, _request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "clients": self.clients,
+                "auto_clients": self.auto_clients,
+                "supported_tags": ["device_pc", "device_phone", "device_tablet"],
+            }
+        )
+
+    def _find_client(self, name: str) -> dict[str, Any] | None:
+        """Return the managed client with a name."""
+        return next((client for client in self.clients if client["name"] == name), None)
+
+    async def _clients_find(self, request: web.Request) -> web.Response:
+        result = []
+        for identifier in request.query.values():
+            client = next(
+                (client for client in self.clients if identifier in client["ids"]),
+                {"disallowed": False, "whois_info": {}},
+            )
+            result.append({identifier: client})
+        return web.json_response(result)
+
+    async def _clients_add(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        if self._find_client(data["name"]) is not None:
+            return self._bad_request(f"Client already exists: {data['name']}")
+        self.clients.append(data)
+        return web.Response()
+
+    async def _clients_update(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        if (client := self._find_client(data["name"])) is None:
+            return self._bad_request(f"Client not found: {data['name']}")
+        self.clients[self.clients.index(client)] = data["data"]
+        return web.Response()
+
+    async def _clients_delete(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        if (client := self._find_client(data["name"])) is None:
+            return self._bad_request(f"Client not found: {data['name']}")
+        self.clients.remove(client)
+        return web.Response()
+
+    async def _rewrite_list(self, _request: web.Request) -> web.Response:
+        return web.json_response(self.rewrites)
+
+    def _find_rewrite(self, data: dict[str, Any]) -> dict[str, Any] | None:
+        """Return the DNS rewrite rule matching the domain and answer."""
+        return next(
+            (
+                rule
+                for rule in self.rewrites
+                if (rule["domain"], rule["answer"]) == (data["domain"], data["answer"])
+            ),
+            None,
+        )
+
+    async def _rewrite_add(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        if self._find_rewrite(data) is not None:
+            return self._bad_request("Rewrite already exists")
+        self.rewrites.append(
+            {
+                "domain": data["domain"],
+                "answer": data["answer"],
+                "enabled": data.get("enabled", True),
+            }
+        )
+        return web.Response()
+
+    async def _rewrite_delete(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        if (rule := self._find_rewrite(data)) is None:
+            return self._bad_request("Rewrite not found")
+        self.rewrites.remove(rule)
+        return web.Response()
+
+    async def _rewrite_update(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        if (rule := self._find_rewrite(data["target"])) is None:
+            return self._bad_request("Rewrite not found")
+        rule.update(data["update"])
+        return web.Response()
+
+    async def _querylog(self, request: web.Request) -> web.Response:
+        limit = int(request.query.get("limit", 500))
+        entries = self.querylog
+        if older_than := request.query.get("older_than"):
+            oldest = datetime.fromisoformat(older_than)
+            entries = [
+                entry
+                for entry in entries
+                if datetime.fromisoformat(entry["time"]) < oldest
+            ]
+        page = entries[:limit]
+        return web.json_response(
+            {"data": page, "oldest": page[-1]["time"] if page else ""}
+        )
+
+    async def _querylog_info(self, _request: web.Request) -> web.Response:
+        return web.json_response(self.querylog_config)
+
+    async def _querylog_config(self, request: web.Request) -> web.Response:
+        self.querylog_config.update(await request.json())
+        return web.Response()
+
+    def _toggle(self, attribute: str, *, enabled: bool) -> Handler:
+        """Return a handler that enables or disables a protection feature."""
+
+        async def handler(_request: web.Request) -> web.Response:
+            setattr(self, attribute, enabled)
+            return web.Response()
+
+        return handler
+
+    def _feature_status(self, attribute: str) -> Handler:
+        """Return a handler that returns the state of a protection feature."""
+
+        async def handler(_request: web.Request) -> web.Response:
+            return web.json_response({"enabled": getattr(self, attribute)})
+
+        return handler
+
+    async def _version(self, _request: web.Request) -> web.Response:
+        return web.json_response(self.update)
+
+    async def _update(self, _request: web.Request) -> web.Response:
+        if self.update.get("disabled", True):
+            return self._bad_request("Update is not available")
+        return web.Response()
+
+    def application(self) -> web.Application:
+        """Return a web application serving the fake AdGuard Home API.
+
+        Returns
+        -------
+            The aiohttp web application.
+
+        """
+        app = web.Application(middlewares=[self._middleware])
+        routes: list[tuple[str, str, Handler]] = [
+            ("GET", "status", self._status),
+            ("POST", "protection", self._protection),
+            ("GET", "stats", self._stats),
+            ("GET", "stats_info", self._stats_info),
+            ("POST", "stats_reset", self._stats_reset),
+            ("GET", "filtering/status", self._filtering_status),
+            ("POST", "filtering/config", self._filtering_config),
+            ("POST", "filtering/add_url", self._filtering_add_url),
+            ("POST", "filtering/remove_url", self._filtering_remove_url),
+            ("POST", "filtering/set_url", self._filtering_set_url),
+            ("POST", "filtering/refresh", self._filtering_refresh),
+            ("GET", "clients", self._clients),
+            ("GET", "clients/find", self._clients_find),
+            ("POST", "clients/add", self._clients_add),
+            ("POST", "clients/update", self._clients_update),
+            ("POST", "clients/delete", self._clients_delete),
+            ("GET", "rewrite/list", self._rewrite_list),
+            ("POST", "rewrite/add", self._rewrite_add),
+            ("POST", "rewrite/delete", self._rewrite_delete),
+            ("POST", "rewrite/update", self._rewrite_update),
+            ("GET", "querylog", self._querylog),
+            ("GET", "querylog_info", self._querylog_info),
+            ("POST", "querylog_config", self._querylog_config),
+            ("POST", "version.json", self._version),
+            ("POST", "update", self._update),
+        ]
+        for feature in ("parental", "safebrowsing", "safesearch"):
+            attribute = f"{feature}_enabled"
+            routes.extend(
+                [
+                    ("GET", f"{feature}/status", self._feature_status(attribute)),
+                    (
+                        "POST",
+                        f"{feature}/enable",
+                        self._toggle(attribute, enabled=True),
+                    ),
+                    (
+                        "POST",
+                        f"{feature}/disable",
+                        self._toggle(attribute, enabled=False),
+                    ),
+                ]
+            )
+        for method, endpoint, handler in routes:
+            app.router.add_route(method, f"{self.base_path}/{endpoint}", handler)
+        return app
+
+    async def start(self) -> None:
+        """Start serving on a free port of the loopback interface."""
+        if self._runner is not None:
+            return
+        self._runner = web.AppRunner(self.application(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> Self:
+        """Start the fake AdGuard Home.
+
+        Returns
+        -------
+            The fake AdGuard Home object.
+
+        """
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        """Stop the fake AdGuard Home.
+
+        Args:
+        ----
+            _exc_info: Exception type, value, and traceback.
+
+        """
+        await self.stop()
@@ -0,0 +1,17 @@
+"""Asynchronous Python client for the AdGuard Home API."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class AdGuardHomeFeatures:
+    """State of the features of AdGuard Home that can be toggled."""
+
+    protection: bool
+    filtering: bool
+    parental: bool
+    safebrowsing: bool
+    safesearch: bool
+    querylog: bool
@@ -0,0 +1,229 @@
+"""Asynchronous Python client for the AdGuard Home API."""
+
+from __future__ import annotations
+
+import csv
+import ipaddress
+import re
+from typing import TYPE_CHECKING
+
+from .rewrite import RewriteRule
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+_CSV_HEADER = ("domain", "answer", "enabled")
+_ZONE_CLASSES = {"IN", "CH", "HS", "CS"}
+_ZONE_TYPES = {"A", "AAAA", "CNAME"}
+_ZONE_TTL = re.compile(r"(\d+[smhdw]?)+", re.IGNORECASE)
+
+
+def _ip_version(answer: str) -> int | None:
+    """Return the IP version of an answer, or None if it is not an IP."""
+    try:
+        return ipaddress.ip_address(answer).version
+    except ValueError:
+        return None
+
+
+def read_hosts(lines: Iterable[str]) -> Iterator[RewriteRule]:
+    """Read DNS rewrite rules from a hosts file.
+
+    Args:
+    ----
+        lines: The lines of the hosts file; e.g., an open file.
+
+    Yields:
+    ------
+        A DNS rewrite rule for every hostname in the file.
+
+    """
+    for line in lines:
+        fields = line.split("#", 1)[0].split()
+        if len(fields) < 2 or _ip_version(fields[0]) is None:
+            continue
+        for domain in fields[1:]:
+            yield RewriteRule(domain=domain, answer=fields[0])
+
+
+def write_hosts(rules: Iterable[RewriteRule]) -> Iterator[str]:
+    """Write DNS rewrite rules as hosts file lines.
+
+    A hosts file can only hold exact domains with an IP address, so
+    wildcard and CNAME rules are skipped; disabled rules are commented out.
+
+    Args:
+    ----
+        rules: The DNS rewrite rules to write.
+
+    Yields:
+    ------
+        The lines of the hosts file, including line endings.
+
+    """
+    for rule in rules:
+        if "*" in rule.domain or _ip_version(rule.answer) is None:
+            continue
+        prefix = "" if rule.enabled else "# "
+        yield f"{prefix}{rule.answer}\t{rule.domain}\n"
+
+
+def _zone_records(lines: Iterable[str]) -> Iterator[tuple[str, list[str]]]:
+    """Yield the (raw line, fields) of records in a zone file.
+
+    Comments are stripped and records spanning multiple lines between
+    parentheses are joined.
+    """
+    pending: list[str] = []
+    for line in lines:
+        content = line.split(";", 1)[0].rstrip()
+        if pending:
+            pending.append(content)
+            if ")" not in content:
+                continue
+            content = " ".join(pending).replace("(", " ").replace(")", " ")
+            pending = []
+        elif "(" in content and ")" not in content:
+            pending.append(content)
+            continue
+        if content.strip():
+            yield content, content.split()
+
+
+def read_zone(lines: Iterable[str], origin: str | None = None) -> Iterator[RewriteRule]:
+    """Read DNS rewrite rules from a BIND-style zone file.
+
+    Only `A`, `AAAA` and `CNAME` records are read; other records and
+    directives besides `$ORIGIN` are skipped.
+
+    Args:
+    ----
+        lines: The lines of the zone file; e.g., an open file.
+        origin: The origin of relative names, unless set by `$ORIGIN`.
+
+    Yields:
+    ------
+        A DNS rewrite rule for every address and alias record.
+
+    """
+    origin = origin.rstrip(".") if origin else None
+    owner: str | None = None
+
+    def absolute(name: str) -> str:
+        if name == "@":
+            return origin or ""
+        if name.endswith("."):
+            return name.rstrip(".")
+        return f"{name}.{origin}" if origin else name
+
+    for content, fields in _zone_records(lines):
+        if fields[0].upper() == "$ORIGIN" and len(fields) > 1:
+            origin = fields[1].rstrip(".")
+            continue
+        if fields[0].startswith("$"):
+            continue
+
+        if not content[0].isspace():
+            owner = absolute(fields.pop(0))
+        # Skip the optional TTL and class, in either order
+        while fields and (
+            _ZONE_TTL.fullmatch(fields[0]) or fields[0].upper() in _ZONE_CLASSES
+        ):
+            fields.pop(0)
+
+        if owner is None or len(fields) < 2 or fields[0].upper() not in _ZONE_TYPES:
+            continue
+        answer = fields[1]
+        if fields[0].upper() == "CNAME":
+            answer = absolute(answer)
+        yield RewriteRule(domain=owner, answer=answer)
+
+
+def write_zone(
+    rules: Iterable[RewriteRule], origin: str | None = None
+) -> Iterator[str]:
+    """Write DNS rewrite rules as BIND-style zone file records.
+
+    Args:
+    ----
+        rules: The DNS rewrite rules to write.
+        origin: Optional origin to emit; names within it are made relative.
+
+    Yields:
+    ------
+        The lines of the zone file, including line endings. Disabled rules
+        and rules with a special `A` or `AAAA` answer are skipped.
+
+    """
+    suffix = None
+    if origin:
+        origin = origin.rstrip(".")
+        suffix = f".{origin}"
+        yield f"$ORIGIN {origin}.\n"
+
+    for rule in rules:
+        if not rule.enabled or rule.answer in ("A", "AAAA"):
+            continue
+        name = f"{rule.domain}."
+        if suffix and rule.domain.endswith(suffix):
+            name = rule.domain.removesuffix(suffix)
+        elif rule.domain == origin:
+            name = "@"
+
+        version = _ip_version(rule.answer)
+        if version is None:
+            yield f"{name}\tIN\tCNAME\t{rule.answer.rstrip('.')}.\n"
+        else:
+            yield f"{name}\tIN\t{'A' if version == 4 else 'AAAA'}\t{rule.answer}\n"
+
+
+def read_csv(lines: Iterable[str]) -> Iterator[RewriteRule]:
+    """Read DNS rewrite rules from CSV with domain, answer and enabled columns.
+
+    The header row and the enabled column are optional.
+
+    Args:
+    ----
+        lines: The lines of the CSV file; e.g., an open file.
+
+    Yields:
+    ------
+        A DNS rewrite rule for every row.
+
+    """
+    for row in csv.reader(lines):
+        if len(row) < 2 or tuple(row[:2]) == _CSV_HEADER[:2]:
+            continue
+        enabled = len(row) < 3 or row[2].strip().lower() not in ("false", "0", "no")
+        yield RewriteRule(domain=row[0].strip(), answer=row[1].strip(), enabled=enabled)
+
+
+class _Line:  # pylint: disable=too-few-public-methods
+    """Write target for the CSV writer, that keeps the last written line."""
+
+    value = ""
+
+    def write(self, line: str) -> None:
+        """Keep the written line."""
+        self.value = line
+
+
+def write_csv(rules: Iterable[RewriteRule]) -> Iterator[str]:
+    """Write DNS rewrite rules as CSV, starting with a header row.
+
+    Args:
+    ----
+        rules: The DNS rewrite rules to write.
+
+    Yields:
+    ------
+        The lines of the CSV file, including line endings.
+
+    """
+    line = _Line()
+    writer = csv.writer(line, lineterminator="\n")
+    writer.writerow(_CSV_HEADER)
+    yield line.value
+    for rule in rules:
+        writer.writerow((rule.domain, rule.answer, str(rule.enabled).lower()))
+        yield line.value
@@ -0,0 +1,291 @@
+"""Asynchronous Python client for the AdGuard Home API."""
+
+from __future__ import annotations
+
+import mmap
+import time
+from itertools import pairwise
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+from .exceptions import AdGuardHomeError
+from .stats import AdGuardHomeStatsDelta
+
+if TYPE_CHECKING:
+    from .stats import AdGuardHomeStatsSnapshot
+
+FIELDS = (
+    "dns_queries",
+    "blocked_filtering",
+    "replaced_safebrowsing",
+    "replaced_safesearch",
+    "replaced_parental",
+)
+
+# One minute for a day, one hour for 90 days, one day for 5 years.
+DEFAULT_RESOLUTIONS = ((60, 1440), (3600, 2160), (86400, 1830))
+
+_MAGIC = int.from_bytes(b"AGHHIST1", "little")
+_VERSION = 2
+_ITEM_SIZE = 8
+
+# Header layout (int64 items): magic, version, number of resolutions,
+# followed by a (step, slots) pair per resolution.
+_HEADER_FIXED = 3
+
+# A slot holds the start time of its bucket, followed by the fields.
+_SLOT_SIZE = 1 + len(FIELDS)
+
+
+def _layout_size(resolutions: tuple[tuple[int, int], ...]) -> int:
+    """Return the number of int64 items needed for the given resolutions."""
+    header = _HEADER_FIXED + 2 * len(resolutions)
+    return header + sum(slots * _SLOT_SIZE for _, slots in resolutions)
+
+
+class AdGuardHomeStatsHistory:
+    """Long-term history of AdGuard Home stats in fixed-size ring buffers.
+
+    Every recorded stats snapshot is turned into a delta with the previous
+    one (see `AdGuardHomeStatsDelta`), which is added to the current bucket
+    of the finest resolution. Coarser buckets are consolidated from the
+    buckets of the next finer resolution. Each resolution is a ring buffer,
+    so the oldest buckets are overwritten and memory use never grows. The
+    history can be backed by a memory-mapped file, so it survives restarts
+    of the process.
+    """
+
+    def __init__(
+        self,
+        resolutions: tuple[tuple[int, int], ...] = DEFAULT_RESOLUTIONS,
+        *,
+        path: str | Path | None = None,
+    ) -> None:
+        """Initialize the stats history.
+
+        Args:
+        ----
+            resolutions: Tuple of `(step, slots)` pairs; the length of a
+                bucket in seconds and the number of buckets to keep, finest
+                first. Each step must be a multiple of the previous one,
+                whose buckets must span at least one bucket of it.
+            path: Optional file to persist the history in. An existing file
+                is resumed; it must have been created with the same
+                resolutions.
+
+        Raises:
+        ------
+            AdGuardHomeError: Invalid resolutions or an incompatible file.
+
+        """
+        if not resolutions or any(
+            step <= 0 or slots <= 0 for step, slots in resolutions
+        ):
+            msg = "History resolutions must have a positive step and slot count"
+            raise AdGuardHomeError(msg)
+        for (finer, finer_slots), (step, _) in pairwise(resolutions):
+            if step <= finer or step % finer or finer * finer_slots < step:
+                msg = (
+                    f"History resolution of {step} seconds cannot be consolidated "
+                    f"from the resolution of {finer} seconds"
+                )
+                raise AdGuardHomeError(msg)
+
+        self.resolutions = tuple(resolutions)
+        self.path = Path(path) if path is not None else None
+
+        size = _layout_size(self.resolutions) * _ITEM_SIZE
+        self._file = None
+        self._mmap: mmap.mmap | None = None
+        if self.path is None:
+            self._buffer: bytearray | mmap.mmap = bytearray(size)
+            fresh = True
+        else:
+            fresh = not self.path.exists() or self.path.stat().st_size == 0
+            if not fresh and self.path.stat().st_size != size:
+                msg = f"History file {self.path} does not match the resolutions"
+                raise AdGuardHomeError(msg)
+            # pylint: disable-next=consider-using-with
+            self._file = self.path.open("w+b" if fresh else "r+b")
+            if fresh:
+                self._file.truncate(size)
+            self._mmap = mmap.mmap(self._file.fileno(), size)
+            self._buffer = self._mmap
+
+        self._data = memoryview(self._buffer).cast("q")
+        if fresh:
+            self._data[0] = _MAGIC
+            self._data[1] = _VERSION
+            self._data[2] = len(self.resolutions)
+            for i, (step, slots) in enumerate(self.resolutions):
+                self._data[_HEADER_FIXED + 2 * i] = step
+                self._data[_HEADER_FIXED + 2 * i + 1] = slots
+        elif self._layout() != (_MAGIC, _VERSION, self.resolutions):
+            self.close()
+            msg = f"History file {self.path} does not match the resolutions"
+            raise AdGuardHomeError(msg)
+
+        offset = _HEADER_FIXED + 2 * len(self.resolutions)
+        self._offsets: dict[int, tuple[int, int]] = {}
+        for step, slots in self.resolutions:
+            self._offsets[step] = (offset, slots)
+            offset += slots * _SLOT_SIZE
+
+        self._previous: AdGuardHomeStatsSnapshot | None = None
+
+    def _layout(self) -> tuple[int, int, tuple[tuple[int, int], ...]]:
+        """Return the magic, version and resolutions stored in the header."""
+        data = self._data
+        count = min(data[2], len(self.resolutions))
+        resolutions = tuple(
+            (data[_HEADER_FIXED + 2 * i], data[_HEADER_FIXED + 2 * i + 1])
+            for i in range(count)
+        )
+        return data[0], data[1], resolutions
+
+    def _slot(self, step: int, timestamp: int) -> int:
+        """Return the offset of the slot of the bucket a timestamp is in."""
+        offset, slots = self._offsets[step]
+        return offset + (timestamp // step) % slots * _SLOT_SIZE
+
+    def _bucket(self, step: int, timestamp: int) -> int:
+        """Return the offset of the current bucket, clearing an expired one."""
+        data = self._data
+        start = timestamp - timestamp % step
+        base = self._slot(step, timestamp)
+        if data[base] != start:
+            # The slot still holds an expired bucket; reuse it
+            data[base] = start
+            for i in range(base + 1, base + _SLOT_SIZE):
+                data[i] = 0
+        return base
+
+    def record(
+        self,
+        snapshot: AdGuardHomeStatsSnapshot,
+        timestamp: float | None = None,
+    ) -> None:
+        """Record a stats snapshot into the history.
+
+        The first snapshot only sets the baseline; following snapshots add
+        their delta to the bucket their timestamp is in. The baseline is
+        kept in memory, so after a restart the first snapshot sets it again.
+
+        Args:
+        ----
+            snapshot: The stats snapshot to record.
+            timestamp: UNIX timestamp of the snapshot; defaults to now.
+
+        """
+        now = int(time.time() if timestamp is None else timestamp)
+        previous, self._previous = self._previous, snapshot
+        if previous is None:
+            return
+        delta = AdGuardHomeStatsDelta.between(previous, snapshot, 0.0)
+        deltas = [getattr(delta, name) for name in FIELDS]
+        if not any(deltas):
+            return
+
+        data = self._data
+        (finer, _), *coarser = self.resolutions
+        for i, value in enumerate(deltas, start=self._bucket(finer, now) + 1):
+            data[i] += value
+        for step, _ in coarser:
+            self._consolidate(step, finer, now)
+            finer = step
+
+    def _consolidate(self, step: int, finer: int, timestamp: int) -> None:
+        """Sum the finer buckets up to a timestamp into their coarser bucket."""
+        data = self._data
+        base = self._bucket(step, timestamp)
+        totals = [0] * len(FIELDS)
+        for start in range(data[base], timestamp + 1, finer):
+            slot = self._slot(finer, start)
+            if data[slot] == start:
+                for i in range(len(FIELDS)):
+                    totals[i] += data[slot + 1 + i]
+        for i, total in enumerate(totals, start=base + 1):
+            data[i] = total
+
+    def series(
+        self,
+        step: int,
+        field: str = "dns_queries",
+        *,
+        start: float | None = None,
+        end: float | None = None,
+    ) -> list[tuple[int, int]]:
+        """Return the history of a field at a resolution.
+
+        Args:
+        ----
+            step: The resolution (bucket length in seconds) to read.
+            field: The counter to read; e.g., `dns_queries`.
+            start: Optional UNIX timestamp of the oldest bucket to include.
+            end: Optional UNIX timestamp of the newest bucket to include.
+
+        Returns:
+        -------
+            A list of `(bucket start time, value)` tuples, oldest first.
+            Buckets without any recorded data are left out.
+
+        Raises:
+        ------
+            AdGuardHomeError: Unknown resolution or field.
+
+        """
+        if step not in self._offsets:
+            msg = f"History has no resolution with a step of {step} seconds"
+            raise AdGuardHomeError(msg)
+        if field not in FIELDS:
+            msg = f"History has no field named {field}"
+            raise AdGuardHomeError(msg)
+
+        offset, slots = self._offsets[step]
+        index = FIELDS.index(field) + 1
+        data = self._data
+        result = [
+            (data[base], data[base + index])
+            for base in range(offset, offset + slots * _SLOT_SIZE, _SLOT_SIZE)
+            if data[base]
+            and (start is None or data[base] >= start)
+            and (end is None or data[base] <= end)
+        ]
+        result.sort()
+        return result
+
+    def flush(self) -> None:
+        """Flush the history to disk, when backed by a file."""
+        if self._mmap is not None:
+            self._mmap.flush()
+
+    def close(self) -> None:
+        """Flush and close the history file, when backed by a file."""
+        self._data.release()
+        if self._mmap is not None:
+            self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> Self:
+        """Enter the history context.
+
+        Returns
+        -------
+            The stats history object.
+
+        """
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        """Exit the history context.
+
+        Args:
+        ----
+            _exc_info: Exception type, value, and traceback.
+
+        """
+        self.close()
@@ -0,0 +1,257 @@
+"""Asynchronous Python client for the AdGuard Home API."""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Sequence
+    from types import SimpleNamespace
+
+    TraceCallback = Callable[
+        [aiohttp.ClientSession, SimpleNamespace, object], Awaitable[None]
+    ]
+
+# Phases of setting up a connection, reported by the trace config.
+CONNECTION_PHASES = ("connection_queue", "dns", "connect")
+
+# Default histogram buckets in seconds, the same as Prometheus clients use.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass(slots=True, kw_only=True)
+class RequestInfo:
+    """Information about a single request to the AdGuard Home API.
+
+    Phases are durations in seconds. `connection_queue`, `dns` and
+    `connect` are only known when the session uses the trace config of
+    `trace_config()`, and are missing when a pooled connection is reused.
+    `ttfb` is the time until the response headers arrived, excluding those
+    connection phases; `body` and `decode` are the time spent reading and
+    decoding the response body. For endpoints with compression enabled,
+    `compressed_bytes` is the size of the body as received, and
+    `decompress` the time spent decompressing it.
+    """
+
+    method: str
+    uri: str
+    url: str
+    start: float = field(default_factory=time.perf_counter)
+    status: int | None = None
+    request_bytes: int = 0
+    response_bytes: int = 0
+    compressed_bytes: int | None = None
+    duration: float = 0.0
+    phases: dict[str, float] = field(default_factory=dict)
+    error: BaseException | None = None
+
+    @property
+    def endpoint(self) -> str:
+        """Return the method and URI of the request; e.g., `GET stats`."""
+        return f"{self.method} {self.uri.strip('/')}"
+
+    def add_phase(self, name: str, start: float) -> float:
+        """Add the time since start to a phase.
+
+        Args:
+        ----
+            name: The name of the phase.
+            start: The `time.perf_counter()` value at the start of the phase.
+
+        Returns:
+        -------
+            The current `time.perf_counter()` value.
+
+        """
+        now = time.perf_counter()
+        self.phases[name] = self.phases.get(name, 0.0) + now - start
+        return now
+
+
+class RequestHooks:
+    """Base class for hooks that are called for every API request.
+
+    Subclasses override the methods they are interested in. Hooks are
+    called synchronously from the request, so they should be fast.
+    """
+
+    def on_request_start(self, info: RequestInfo) -> None:
+        """Handle the start of a request."""
+
+    def on_request_end(self, info: RequestInfo) -> None:
+        """Handle a request that completed successfully."""
+
+    def on_request_error(self, info: RequestInfo) -> None:
+        """Handle a request that failed; `info.error` holds the exception."""
+
+
+def _request_info(ctx: SimpleNamespace) -> RequestInfo | None:
+    """Return the request info of a traced request, if it is instrumented."""
+    info = ctx.trace_request_ctx
+    return info if isinstance(info, RequestInfo) else None
+
+
+def trace_config() -> aiohttp.TraceConfig:
+    """Return an aiohttp trace config that reports connection phases.
+
+    Sessions created by the client get this trace config automatically when
+    hooks are registered. Add it to the `trace_configs` of a shared session
+    to get the connection phases for it as well.
+
+    Returns
+    -------
+        The aiohttp trace config.
+
+    """
+    config = aiohttp.TraceConfig()
+
+    def phase(name: str) -> tuple[TraceCallback, TraceCallback]:
+        async def on_start(
+            _session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: object
+        ) -> None:
+            if _request_info(ctx) is not None:
+                setattr(ctx, name, time.perf_counter())
+
+        async def on_end(
+            _session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: object
+        ) -> None:
+            if (info := _request_info(ctx)) is not None:
+                info.add_phase(name, getattr(ctx, name))
+
+        return on_start, on_end
+
+    for name, signals in (
+        ("connection_queue", "connection_queued"),
+        ("dns", "dns_resolvehost"),
+        ("connect", "connection_create"),
+    ):
+        on_start, on_end = phase(name)
+        getattr(config, f"on_{signals}_start").append(on_start)
+        getattr(config, f"on_{signals}_end").append(on_end)
+
+    async def on_chunk_sent(
+        _session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestChunkSentParams,
+    ) -> None:
+        if (info := _request_info(ctx)) is not None:
+            info.request_bytes += len(params.chunk)
+
+    config.on_request_chunk_sent.append(on_chunk_sent)
+    config.freeze()
+    return config
+
+
+@dataclass(slots=True)
+class _EndpointHistogram:
+    """Latency histogram and totals of a single endpoint."""
+
+    counts: list[int]
+    count: int = 0
+    errors: int = 0
+    total: float = 0.0
+    response_bytes: int = 0
+    phases: dict[str, float] = field(default_factory=dict)
+
+
+class LatencyHistogram(RequestHooks):
+    """Collects latency histograms per endpoint in memory.
+
+    Register it as a hook on one or more clients, and export the collected
+    data at any time; e.g., to log it or to feed it into a metrics system.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """Initialize the histogram collector.
+
+        Args:
+        ----
+            buckets: Upper bounds of the histogram buckets in seconds.
+
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._endpoints: dict[str, _EndpointHistogram] = {}
+
+    def _record(self, info: RequestInfo) -> _EndpointHistogram:
+        """Record a finished request."""
+        if (histogram := self._endpoints.get(info.endpoint)) is None:
+            histogram = _EndpointHistogram([0] * (len(self.buckets) + 1))
+            self._endpoints[info.endpoint] = histogram
+        histogram.counts[bisect_left(self.buckets, info.duration)] += 1
+        histogram.count += 1
+        histogram.total += info.duration
+        histogram.response_bytes += info.response_bytes
+        for name, duration in info.phases.items():
+            histogram.phases[name] = histogram.phases.get(name, 0.0) + duration
+        return histogram
+
+    def on_request_end(self, info: RequestInfo) -> None:
+        """Record a successful request."""
+        self._record(info)
+
+    def on_request_error(self, info: RequestInfo) -> None:
+        """Record a failed request."""
+        self._record(info).errors += 1
+
+    def quantile(self, endpoint: str, quantile: float) -> float | None:
+        """Estimate a latency quantile of an endpoint from its histogram.
+
+        Args:
+        ----
+            endpoint: The endpoint; e.g., `GET stats`.
+            quantile: The quantile to estimate; e.g., 0.99.
+
+        Returns:
+        -------
+            The upper bound of the bucket the quantile falls in, infinity
+            when it is above all buckets, or None without any data.
+
+        """
+        if (histogram := self._endpoints.get(endpoint)) is None:
+            return None
+        rank = quantile * histogram.count
+        seen = 0
+        for bound, count in zip(self.buckets, histogram.counts, strict=False):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def export(self) -> dict[str, dict[str, Any]]:
+        """Export the collected data.
+
+        Returns
+        -------
+            A JSON serializable dictionary per endpoint with the number of
+            requests and errors, the total duration, received bytes, the
+            total duration per phase and cumulative bucket counts (like
+            Prometheus histograms, the last bucket is `+Inf`).
+
+        """
+        result = {}
+        for endpoint, histogram in self._endpoints.items():
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip(
+                (*map(str, self.buckets), "+Inf"), histogram.counts, strict=True
+            ):
+                cumulative += count
+                buckets[bound] = cumulative
+            result[endpoint] = {
+                "count": histogram.count,
+                "errors": histogram.errors,
+                "sum": histogram.total,
+                "response_bytes": histogram.response_bytes,
+                "phases": dict(histogram.phases),
+                "buckets": buckets,
+            }
+        return result
+
+    def reset(self) -> None:
+        """Clear all collected data."""
+        self._endpoints.clear()
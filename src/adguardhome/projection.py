@@ -0,0 +1,130 @@
+"""Asynchronous Python client for the AdGuard Home API."""
+
+from __future__ import annotations
+
+import importlib
+import json
+from typing import TYPE_CHECKING, Any
+
+from .exceptions import AdGuardHomeError
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+    from types import ModuleType
+
+_simdjson: ModuleType | None = None  # pylint: disable=invalid-name
+_parser: Any = None  # pylint: disable=invalid-name
+
+
+def backend() -> str:
+    """Return the name of the backend used for decoding fields.
+
+    Returns
+    -------
+        `simdjson` when pysimdjson is installed, which only turns the
+        requested fields into Python objects; otherwise `json`, which
+        decodes the whole document and drops everything else.
+
+    """
+    global _simdjson, _parser  # noqa: PLW0603 pylint: disable=global-statement
+    if _simdjson is None:
+        try:
+            _simdjson = importlib.import_module("simdjson")
+        except ImportError:
+            return "json"
+        _parser = _simdjson.Parser()
+    return "simdjson"
+
+
+def _insert(result: dict[str, Any], keys: list[str], value: Any) -> None:
+    """Insert a value in a nested dictionary, creating the parents."""
+    for key in keys[:-1]:
+        result = result.setdefault(key, {})
+    result[keys[-1]] = value
+
+
+def _project_json(body: bytes, fields: Collection[str]) -> dict[str, Any]:
+    """Decode the whole document and pick the fields."""
+    document = json.loads(body)
+    if not isinstance(document, dict):
+        msg = "Only fields of JSON objects can be decoded"
+        raise AdGuardHomeError(msg)
+    result: dict[str, Any] = {}
+    for field in fields:
+        keys = field.split(".")
+        value: Any = document
+        for key in keys:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            _insert(result, keys, value)
+    return result
+
+
+def _materialize(value: Any) -> Any:
+    """Turn a simdjson object or array into a dictionary or list."""
+    if isinstance(value, _simdjson.Object):  # type: ignore[union-attr]
+        return value.as_dict()
+    if isinstance(value, _simdjson.Array):  # type: ignore[union-attr]
+        return value.as_list()
+    return value
+
+
+def _project_simdjson(body: bytes, fields: Collection[str]) -> dict[str, Any]:
+    """Parse the document and only turn the fields into Python objects."""
+    global _parser  # noqa: PLW0603 pylint: disable=global-statement
+    try:
+        document = _parser.parse(body)
+    except RuntimeError:
+        # The shared parser is still in use by another thread
+        _parser = _simdjson.Parser()  # type: ignore[union-attr]
+        document = _parser.parse(body)
+    try:
+        if not isinstance(document, _simdjson.Object):  # type: ignore[union-attr]
+            msg = "Only fields of JSON objects can be decoded"
+            raise AdGuardHomeError(msg)
+        result: dict[str, Any] = {}
+        for field in fields:
+            keys = field.split(".")
+            # Like `_project_json`, only keys of objects are followed; not
+            # the indices of arrays, as a JSON pointer would
+            value: Any = document
+            for key in keys:
+                if not isinstance(value, _simdjson.Object) or key not in value:  # type: ignore[union-attr]
+                    break
+                value = value[key]
+            else:
+                _insert(result, keys, _materialize(value))
+        return result
+    finally:
+        # Release the document, so the parser can be reused
+        del document
+
+
+def project(body: bytes, fields: Collection[str]) -> dict[str, Any]:
+    """Decode only some fields of a JSON object.
+
+    Args:
+    ----
+        body: The encoded JSON object.
+        fields: Key paths of the fields to decode, with a dot between the
+            keys of nested objects; e.g., `num_dns_queries`.
+
+    Returns:
+    -------
+        The requested fields, nested like in the document. Fields that do
+        not exist in the document are left out.
+
+    Raises:
+    ------
+        AdGuardHomeError: The document is not a JSON object.
+
+    """
+    try:
+        if backend() == "simdjson":
+            return _project_simdjson(body, fields)
+        return _project_json(body, fields)
+    except ValueError as exception:
+        msg = "Invalid JSON document"
+        raise AdGuardHomeError(msg) from exception
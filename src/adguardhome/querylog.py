@@ -3,13 +3,151 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
 
 from .exceptions import AdGuardHomeError
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Mapping
+
     from . import AdGuardHome
 
+    QueryLogPredicate = Callable[[Mapping[str, Any]], bool]
+
+
+def _entry_time(entry: Mapping[str, Any]) -> datetime:
+    """Return the timestamp of a query log entry."""
+    return datetime.fromisoformat(entry["time"])
+
+
+def _entry_host(entry: Mapping[str, Any]) -> str:
+    """Return the lower-cased queried host of a query log entry."""
+    question = entry.get("question") or {}
+    host = question.get("name") or question.get("host") or ""
+    return host.rstrip(".").lower()
+
+
+def _matches_suffix(host: str, suffixes: frozenset[str]) -> bool:
+    """Return if the host equals, or is a subdomain of, one of the suffixes."""
+    while True:
+        if host in suffixes:
+            return True
+        dot = host.find(".")
+        if dot < 0:
+            return False
+        host = host[dot + 1 :]
+
+
+@dataclass(frozen=True, kw_only=True)
+class QueryLogFilter:
+    """Filter expression for AdGuard Home query log entries.
+
+    Criteria the AdGuard Home API supports (`search` and `response_status`)
+    are sent along with the request, so the server drops non-matching entries
+    before they are transferred. All other criteria are compiled into a
+    single predicate that is evaluated on the client. Naive `since` and
+    `until` datetimes are taken to be in UTC.
+    """
+
+    clients: Collection[str] | None = None
+    domain_suffixes: Collection[str] | None = None
+    reasons: Collection[str] | None = None
+    statuses: Collection[str] | None = None
+    upstreams: Collection[str] | None = None
+    response_status: str | None = None
+    search: str | None = None
+    since: datetime | None = None
+    until: datetime | None = None
+    min_elapsed_ms: float | None = None
+    max_elapsed_ms: float | None = None
+
+    def __post_init__(self) -> None:
+        """Normalize naive datetimes to UTC, so they compare to entry times."""
+        for name in ("since", "until"):
+            value = getattr(self, name)
+            if value is not None and value.tzinfo is None:
+                object.__setattr__(self, name, value.replace(tzinfo=UTC))
+
+    def params(self) -> dict[str, str]:
+        """Return the request parameters the server can filter on.
+
+        Returns
+        -------
+            A dictionary of query log request parameters.
+
+        """
+        params: dict[str, str] = {}
+        if self.response_status:
+            params["response_status"] = self.response_status
+
+        # The server only takes a single substring to search for; it is used
+        # to narrow down the result when there is exactly one candidate.
+        search = self.search
+        if search is None and not self.domain_suffixes:
+            if self.clients and len(self.clients) == 1:
+                search = next(iter(self.clients))
+        elif (
+            search is None
+            and self.domain_suffixes
+            and not self.clients
+            and len(self.domain_suffixes) == 1
+        ):
+            search = next(iter(self.domain_suffixes)).strip(".")
+        if search:
+            params["search"] = search
+
+        if self.until is not None:
+            params["older_than"] = self.until.isoformat()
+        return params
+
+    def compile(self) -> QueryLogPredicate:
+        """Compile the client-side criteria into a single predicate.
+
+        Returns
+        -------
+            A callable that returns True for query log entries matching
+            all criteria of this filter.
+
+        """
+        checks: list[QueryLogPredicate] = []
+
+        if self.clients:
+            clients = frozenset(self.clients)
+            checks.append(lambda entry: entry.get("client") in clients)
+        if self.domain_suffixes:
+            suffixes = frozenset(
+                suffix.strip(".").lower() for suffix in self.domain_suffixes
+            )
+            checks.append(lambda entry: _matches_suffix(_entry_host(entry), suffixes))
+        if self.reasons:
+            reasons = frozenset(self.reasons)
+            checks.append(lambda entry: entry.get("reason") in reasons)
+        if self.statuses:
+            statuses = frozenset(self.statuses)
+            checks.append(lambda entry: entry.get("status") in statuses)
+        if self.upstreams:
+            upstreams = frozenset(self.upstreams)
+            checks.append(lambda entry: entry.get("upstream") in upstreams)
+        if self.since is not None:
+            since = self.since
+            checks.append(lambda entry: _entry_time(entry) >= since)
+        if self.until is not None:
+            until = self.until
+            checks.append(lambda entry: _entry_time(entry) < until)
+        if self.min_elapsed_ms is not None:
+            low = self.min_elapsed_ms
+            checks.append(lambda entry: float(entry.get("elapsedMs", 0)) >= low)
+        if self.max_elapsed_ms is not None:
+            high = self.max_elapsed_ms
+            checks.append(lambda entry: float(entry.get("elapsedMs", 0)) <= high)
+
+        if not checks:
+            return lambda _entry: True
+        if len(checks) == 1:
+            return checks[0]
+        return lambda entry: all(check(entry) for check in checks)
+
 
 @dataclass
 class AdGuardHomeQueryLog:
@@ -38,6 +176,51 @@ class AdGuardHomeQueryLog:
             json_data={"enabled": enabled, "interval": interval},
         )
 
+    async def entries(
+        self,
+        query_filter: QueryLogFilter | None = None,
+        *,
+        limit: int = 100,
+        page_size: int = 500,
+    ) -> list[dict[str, Any]]:
+        """Return query log entries, newest first, matching a filter.
+
+        Args:
+        ----
+            query_filter: Optional filter the entries must match.
+            limit: Maximum number of matching entries to return.
+            page_size: Number of entries to request from the API per page.
+
+        Returns:
+        -------
+            A list of raw query log entries as returned by the API.
+
+        """
+        query_filter = query_filter or QueryLogFilter()
+        params = query_filter.params()
+        params["limit"] = str(page_size)
+        predicate = query_filter.compile()
+        since = query_filter.since
+
+        result: list[dict[str, Any]] = []
+        while True:
+            response = await self.adguard.request("querylog", params=params)
+            data = response.get("data") or []
+            for entry in data:
+                if since is not None and _entry_time(entry) < since:
+                    return result
+                if predicate(entry):
+                    result.append(entry)
+                    if len(result) >= limit:
+                        return result
+
+            # Pages of filtered requests can be short while older entries
+            # remain, so only an empty `oldest` marks the end of the log.
+            oldest = response.get("oldest")
+            if not oldest or oldest == params.get("older_than"):
+                return result
+            params["older_than"] = oldest
+
     async def enabled(self) -> bool:
         """Return if AdGuard Home query log is enabled or not.
 
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+import ipaddress
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+from .concurrency import error_of, gather_bounded
 from .exceptions import AdGuardHomeError
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Iterable
+
     from . import AdGuardHome
 
 
@@ -20,6 +24,140 @@ class RewriteRule:
     enabled: bool = True
 
 
+@dataclass(frozen=True, slots=True)
+class RewriteSyncResult:
+    """Result of syncing a single DNS rewrite rule."""
+
+    rule: RewriteRule
+    action: str
+    error: AdGuardHomeError | None = None
+
+    @property
+    def success(self) -> bool:
+        """Return if the rule was synced successfully."""
+        return self.error is None
+
+
+def _group(rules: Iterable[RewriteRule]) -> dict[str, list[RewriteRule]]:
+    """Group rewrite rules by domain, dropping duplicates."""
+    grouped: dict[str, list[RewriteRule]] = {}
+    for rule in rules:
+        domain_rules = grouped.setdefault(rule.domain, [])
+        if rule not in domain_rules:
+            domain_rules.append(rule)
+    return grouped
+
+
+def _is_cname(answer: str) -> bool:
+    """Return if the answer of a rewrite rule is a domain (CNAME)."""
+    if answer in ("A", "AAAA", ""):
+        return False
+    try:
+        ipaddress.ip_address(answer)
+    except ValueError:
+        return True
+    return False
+
+
+class RewriteResolver:
+    """Resolves which DNS rewrite rules apply to a host, without querying DNS.
+
+    Follows the semantics of AdGuard Home: an exact domain match takes
+    precedence over wildcards, and the most specific wildcard wins. A
+    wildcard like `*.example.com` matches all subdomains of `example.com`,
+    but not `example.com` itself. Disabled rules are ignored.
+    """
+
+    def __init__(self, rules: Iterable[RewriteRule] = ()) -> None:
+        """Initialize the resolver.
+
+        Args:
+        ----
+            rules: The DNS rewrite rules to resolve with.
+
+        """
+        # Wildcards are indexed by their suffix, including the leading dot.
+        # Walking the labels of a host from the most to the least specific
+        # suffix and stopping at the first hit, is equivalent to the deepest
+        # match in a reversed-label trie; but a lot faster in Python.
+        self._exact: dict[str, list[RewriteRule]] = {}
+        self._wildcards: dict[str, list[RewriteRule]] = {}
+        for rule in rules:
+            self.add(rule)
+
+    def add(self, rule: RewriteRule) -> None:
+        """Add a DNS rewrite rule.
+
+        Args:
+        ----
+            rule: The DNS rewrite rule to add.
+
+        """
+        if not rule.enabled:
+            return
+        domain = rule.domain.rstrip(".").lower()
+        if domain.startswith("*."):
+            self._wildcards.setdefault(domain[1:], []).append(rule)
+        else:
+            self._exact.setdefault(domain, []).append(rule)
+
+    def resolve(self, host: str) -> list[RewriteRule]:
+        """Return the DNS rewrite rules that apply to a host.
+
+        Args:
+        ----
+            host: The host to resolve; e.g., `www.example.com`.
+
+        Returns:
+        -------
+            The rules of the most specific matching domain pattern, or an
+            empty list when no rule applies.
+
+        """
+        host = host.rstrip(".").lower()
+        if (rules := self._exact.get(host)) is not None:
+            return rules
+        wildcards = self._wildcards
+        dot = host.find(".")
+        while dot >= 0:
+            if (rules := wildcards.get(host[dot:])) is not None:
+                return rules
+            dot = host.find(".", dot + 1)
+        return []
+
+    def resolve_chain(self, host: str, max_depth: int = 10) -> list[RewriteRule]:
+        """Return the DNS rewrite rules that apply to a host, following CNAMEs.
+
+        When the matching rules rewrite to another domain (CNAME), the
+        rules of that domain are resolved as well, like AdGuard Home does.
+
+        Args:
+        ----
+            host: The host to resolve; e.g., `www.example.com`.
+            max_depth: The maximum number of CNAMEs to follow.
+
+        Returns:
+        -------
+            The CNAME rules that were followed, in order, followed by the
+            rules that matched the last domain in the chain.
+
+        """
+        chain: list[RewriteRule] = []
+        seen = {host.rstrip(".").lower()}
+        rules = self.resolve(host)
+        while len(chain) < max_depth:
+            cname = next((rule for rule in rules if _is_cname(rule.answer)), None)
+            if cname is None:
+                break
+            target = cname.answer.rstrip(".").lower()
+            if target in seen or not (next_rules := self.resolve(target)):
+                break
+            seen.add(target)
+            chain.append(cname)
+            rules = next_rules
+        return chain + rules
+
+
 @dataclass
 class AdGuardHomeRewrite:
     """Controls AdGuard Home DNS rewrites."""
@@ -38,24 +176,31 @@ class AdGuardHomeRewrite:
         response = await self.adguard.request("rewrite/list")
         return [RewriteRule(**entry) for entry in response or []]
 
-    async def add(self, domain: str, answer: str) -> None:
+    async def add(
+        self, domain: str, answer: str, *, enabled: bool | None = None
+    ) -> None:
         """Add a new DNS rewrite rule to AdGuard Home.
 
         Args:
         ----
             domain: The domain pattern to rewrite (e.g., "*.example.com").
             answer: The IP address or domain to rewrite to.
+            enabled: Optionally, whether the rule is enabled.
 
         Raises:
         ------
             AdGuardHomeError: Failed adding the DNS rewrite rule.
 
         """
+        data: dict[str, str | bool] = {"domain": domain, "answer": answer}
+        if enabled is not None:
+            data["enabled"] = enabled
+
         try:
             await self.adguard.request(
                 "rewrite/add",
                 method="POST",
-                json_data={"domain": domain, "answer": answer},
+                json_data=data,
             )
         except AdGuardHomeError as exception:
             msg = "Failed to add DNS rewrite rule to AdGuard Home"
@@ -83,3 +228,116 @@ class AdGuardHomeRewrite:
         except AdGuardHomeError as exception:
             msg = "Failed to delete DNS rewrite rule from AdGuard Home"
             raise AdGuardHomeError(msg) from exception
+
+    async def update(self, target: RewriteRule, update: RewriteRule) -> None:
+        """Update a DNS rewrite rule in place.
+
+        Args:
+        ----
+            target: The existing DNS rewrite rule to update.
+            update: The new DNS rewrite rule.
+
+        Raises:
+        ------
+            AdGuardHomeError: Failed to update the DNS rewrite rule.
+
+        """
+        try:
+            await self.adguard.request(
+                "rewrite/update",
+                method="POST",
+                json_data={
+                    "target": {
+                        "domain": target.domain,
+                        "answer": target.answer,
+                        "enabled": target.enabled,
+                    },
+                    "update": {
+                        "domain": update.domain,
+                        "answer": update.answer,
+                        "enabled": update.enabled,
+                    },
+                },
+            )
+        except AdGuardHomeError as exception:
+            msg = "Failed to update DNS rewrite rule in AdGuard Home"
+            raise AdGuardHomeError(msg) from exception
+
+    async def sync(
+        self,
+        rules: Iterable[RewriteRule],
+        *,
+        delete: bool = True,
+        concurrency: int = 8,
+    ) -> list[RewriteSyncResult]:
+        """Make the DNS rewrite rules in AdGuard Home match the given rules.
+
+        The current rules are fetched once and compared per domain. Rules
+        of a domain with a changed answer are updated in place, instead of
+        being deleted and added again. Writes run concurrently, bounded by
+        `concurrency`.
+
+        Args:
+        ----
+            rules: The DNS rewrite rules that should exist.
+            delete: Delete rules that are not in `rules`. Without deleting,
+                changed answers of a domain are still updated in place; only
+                rules that no new rule replaces are kept.
+            concurrency: Maximum number of concurrent writes.
+
+        Returns:
+        -------
+            A result per rule; with the `add`, `update`, `delete` or
+            `unchanged` action taken and the error in case it failed.
+
+        """
+        current = _group(await self.list_rules())
+        desired = _group(rules)
+
+        results: list[RewriteSyncResult] = []
+        writes: list[tuple[RewriteRule, str, Awaitable[None]]] = []
+        domains = [*desired, *(domain for domain in current if domain not in desired)]
+        for domain in domains:
+            existing = current.get(domain, [])
+            wanted = desired.get(domain, [])
+            unchanged = [rule for rule in wanted if rule in existing]
+            results.extend(RewriteSyncResult(rule, "unchanged") for rule in unchanged)
+            writes.extend(
+                self._writes(
+                    [rule for rule in existing if rule not in unchanged],
+                    [rule for rule in wanted if rule not in unchanged],
+                    delete=delete,
+                )
+            )
+
+        errors = await gather_bounded(
+            (error_of(write) for _, _, write in writes), concurrency
+        )
+        results.extend(
+            RewriteSyncResult(rule, action, error)
+            for (rule, action, _), error in zip(writes, errors, strict=True)
+        )
+        return results
+
+    def _writes(
+        self, removed: list[RewriteRule], added: list[RewriteRule], *, delete: bool
+    ) -> list[tuple[RewriteRule, str, Awaitable[None]]]:
+        """Return the writes that replace the removed rules of a domain.
+
+        Removed rules are updated in place to added ones, as far as there
+        are both; the rest of the rules is added, or deleted if `delete`.
+        """
+        writes: list[tuple[RewriteRule, str, Awaitable[None]]] = [
+            (new, "update", self.update(old, new))
+            for old, new in zip(removed, added, strict=False)
+        ]
+        writes.extend(
+            (rule, "add", self.add(rule.domain, rule.answer, enabled=rule.enabled))
+            for rule in added[len(removed) :]
+        )
+        if delete:
+            writes.extend(
+                (rule, "delete", self.delete(rule.domain, rule.answer))
+                for rule in removed[len(added) :]
+            )
+        return writes
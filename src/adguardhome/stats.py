@@ -2,14 +2,446 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+import asyncio
+import functools
+import importlib
+import logging
+import random
+from array import array
+from dataclasses import dataclass, field
+from itertools import accumulate
+from time import monotonic
+from typing import TYPE_CHECKING, Any
 
 from .exceptions import AdGuardHomeError
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+    from types import ModuleType
+
     from . import AdGuardHome
 
+_LOGGER = logging.getLogger(__name__)
+
+BUCKET_SECONDS = {"hours": 3600, "days": 86400}
+
+
+def _series(values: list[int] | None) -> array[int]:
+    """Return a time-series from the API as a compact integer array."""
+    return array("q", values or [])
+
+
+@functools.cache
+def _numpy() -> ModuleType | None:
+    """Return NumPy, to vectorize time-series computations, if installed."""
+    try:
+        return importlib.import_module("numpy")
+    except ImportError:
+        return None
+
+
+def _floats(values: Any) -> array[float]:
+    """Return a NumPy array of floats as a compact float array."""
+    return array("d", values.astype("float64").tobytes())
+
+
+def _series_delta(previous: array[int], current: array[int]) -> int:
+    """Return the events a time-series counted since a previous version of it.
+
+    Only the newest bucket of a time-series still counts; completed buckets
+    never change, until they roll out of the series. The number of buckets
+    the series rolled over is the smallest shift that lines up the completed
+    buckets of both versions, without the previously newest bucket going
+    down. Without any such shift (e.g., the stats were reset), all events
+    in the series are new. Series of different lengths (e.g., the stats
+    interval changed) cannot be compared, and count as no events.
+    """
+    size = len(previous)
+    if len(current) != size:
+        return 0
+    for shift in range(size):
+        end = size - shift - 1
+        if current[end] >= previous[-1] and current[:end] == previous[shift:-1]:
+            return current[end] - previous[-1] + sum(current[end + 1 :])
+    return sum(current)
+
+
+def _top(values: list[dict[str, Any]] | None) -> tuple[tuple[str, Any], ...]:
+    """Return a top list from the API as `(name, value)` tuples."""
+    return tuple(item for entry in values or [] for item in entry.items())
+
+
+@dataclass(frozen=True, kw_only=True)
+class AdGuardHomeStatsSnapshot:  # pylint: disable=too-many-instance-attributes
+    """All statistics of AdGuard Home, as returned by a single request.
+
+    The time-series are `array("q")` objects, oldest bucket first. They
+    support the buffer protocol, so they can be wrapped without copying
+    by e.g. `numpy.frombuffer(snapshot.dns_queries, dtype="int64")`. The
+    computations on them are vectorized with NumPy when it is installed.
+    """
+
+    time_units: str
+    num_dns_queries: int
+    num_blocked_filtering: int
+    num_replaced_safebrowsing: int
+    num_replaced_safesearch: int
+    num_replaced_parental: int
+    avg_processing_time: float
+    dns_queries: array[int]
+    blocked_filtering: array[int]
+    replaced_safebrowsing: array[int]
+    replaced_parental: array[int]
+    top_queried_domains: tuple[tuple[str, int], ...] = ()
+    top_blocked_domains: tuple[tuple[str, int], ...] = ()
+    top_clients: tuple[tuple[str, int], ...] = ()
+    top_upstreams_responses: tuple[tuple[str, int], ...] = ()
+    top_upstreams_avg_time: tuple[tuple[str, float], ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> AdGuardHomeStatsSnapshot:
+        """Create a stats snapshot from a `stats` API response.
+
+        Args:
+        ----
+            data: The decoded JSON response of the `stats` endpoint.
+
+        Returns:
+        -------
+            The parsed stats snapshot.
+
+        """
+        return cls(
+            time_units=data.get("time_units") or "hours",
+            num_dns_queries=data["num_dns_queries"],
+            num_blocked_filtering=data["num_blocked_filtering"],
+            num_replaced_safebrowsing=data["num_replaced_safebrowsing"],
+            num_replaced_safesearch=data["num_replaced_safesearch"],
+            num_replaced_parental=data["num_replaced_parental"],
+            avg_processing_time=data["avg_processing_time"] * 1000,
+            dns_queries=_series(data.get("dns_queries")),
+            blocked_filtering=_series(data.get("blocked_filtering")),
+            replaced_safebrowsing=_series(data.get("replaced_safebrowsing")),
+            replaced_parental=_series(data.get("replaced_parental")),
+            top_queried_domains=_top(data.get("top_queried_domains")),
+            top_blocked_domains=_top(data.get("top_blocked_domains")),
+            top_clients=_top(data.get("top_clients")),
+            top_upstreams_responses=_top(data.get("top_upstreams_responses")),
+            top_upstreams_avg_time=_top(data.get("top_upstreams_avg_time")),
+        )
+
+    @property
+    def bucket_seconds(self) -> int:
+        """Return the length of a single time-series bucket in seconds."""
+        return BUCKET_SECONDS.get(self.time_units, 3600)
+
+    @property
+    def blocked_percentage(self) -> float:
+        """Return the percentage of blocked DNS queries in this snapshot."""
+        if not self.num_dns_queries:
+            return 0.0
+        return (self.num_blocked_filtering / self.num_dns_queries) * 100.0
+
+    def rates(self, series: array[int] | None = None) -> array[float]:
+        """Return the per-second rate of each bucket of a time-series.
+
+        Args:
+        ----
+            series: The time-series to compute the rates for; defaults
+                to the DNS queries.
+
+        Returns:
+        -------
+            An array with the average events per second of each bucket.
+
+        """
+        if series is None:
+            series = self.dns_queries
+        seconds = self.bucket_seconds
+        if numpy := _numpy():
+            return _floats(numpy.frombuffer(series, dtype=series.typecode) / seconds)
+        return array("d", (value / seconds for value in series))
+
+    def blocked_ratio(self) -> array[float]:
+        """Return the ratio of blocked DNS queries for each bucket.
+
+        Returns
+        -------
+            An array with the fraction (0.0 to 1.0) of blocked queries
+            of each bucket; buckets without queries have a ratio of 0.0.
+
+        """
+        if numpy := _numpy():
+            size = min(len(self.blocked_filtering), len(self.dns_queries))
+            blocked = numpy.frombuffer(self.blocked_filtering, dtype="q")[:size]
+            queries = numpy.frombuffer(self.dns_queries, dtype="q")[:size]
+            return _floats(
+                numpy.divide(
+                    blocked, queries, out=numpy.zeros(size), where=queries != 0
+                )
+            )
+        return array(
+            "d",
+            (
+                blocked / queries if queries else 0.0
+                for blocked, queries in zip(
+                    self.blocked_filtering, self.dns_queries, strict=False
+                )
+            ),
+        )
+
+    def moving_average(
+        self, window: int, series: array[int] | None = None
+    ) -> array[float]:
+        """Return the trailing moving average of a time-series.
+
+        Args:
+        ----
+            window: The number of buckets to average over.
+            series: The time-series to average; defaults to the DNS queries.
+
+        Returns:
+        -------
+            An array of the same length as the series. The first buckets,
+            that have less than `window` predecessors, are averaged over
+            the buckets available.
+
+        Raises:
+        ------
+            AdGuardHomeError: The window is smaller than one bucket.
+
+        """
+        if window < 1:
+            msg = "Moving average window must be at least 1"
+            raise AdGuardHomeError(msg)
+        if series is None:
+            series = self.dns_queries
+
+        if numpy := _numpy():
+            values = numpy.frombuffer(series, dtype=series.typecode)
+            sums = numpy.concatenate(([0], numpy.cumsum(values, dtype="int64")))
+            index = numpy.arange(1, len(sums))
+            return _floats(
+                (sums[index] - sums[numpy.maximum(index - window, 0)])
+                / numpy.minimum(index, window)
+            )
+
+        sums = [0, *accumulate(series)]
+        return array(
+            "d",
+            (
+                (sums[i] - sums[max(0, i - window)]) / min(i, window)
+                for i in range(1, len(sums))
+            ),
+        )
+
+
+@dataclass(frozen=True, kw_only=True)
+class AdGuardHomeStatsDelta:
+    """Change between two consecutive stats snapshots.
+
+    The `num_*` counters of AdGuard Home cover a rolling time window, so
+    under steady traffic they barely change. Deltas are therefore taken
+    from the newest buckets of the time-series instead, taking buckets
+    that rolled over in between into account. AdGuard Home has no
+    time-series of enforced safe searches; that delta is taken from its
+    rolling counter, and is never negative.
+    """
+
+    previous: AdGuardHomeStatsSnapshot | None
+    current: AdGuardHomeStatsSnapshot
+    elapsed: float
+    dns_queries: int = 0
+    blocked_filtering: int = 0
+    replaced_safebrowsing: int = 0
+    replaced_safesearch: int = 0
+    replaced_parental: int = 0
+
+    @classmethod
+    def between(
+        cls,
+        previous: AdGuardHomeStatsSnapshot | None,
+        current: AdGuardHomeStatsSnapshot,
+        elapsed: float,
+    ) -> AdGuardHomeStatsDelta:
+        """Compute the delta between two stats snapshots.
+
+        Args:
+        ----
+            previous: The earlier snapshot, or None for the first one.
+            current: The latest snapshot.
+            elapsed: Time in seconds between taking both snapshots.
+
+        Returns:
+        -------
+            The delta between both snapshots.
+
+        """
+        if previous is None:
+            return cls(previous=None, current=current, elapsed=elapsed)
+        return cls(
+            previous=previous,
+            current=current,
+            elapsed=elapsed,
+            dns_queries=_series_delta(previous.dns_queries, current.dns_queries),
+            blocked_filtering=_series_delta(
+                previous.blocked_filtering, current.blocked_filtering
+            ),
+            replaced_safebrowsing=_series_delta(
+                previous.replaced_safebrowsing, current.replaced_safebrowsing
+            ),
+            replaced_safesearch=max(
+                0, current.num_replaced_safesearch - previous.num_replaced_safesearch
+            ),
+            replaced_parental=_series_delta(
+                previous.replaced_parental, current.replaced_parental
+            ),
+        )
+
+    @property
+    def queries_per_second(self) -> float:
+        """Return the DNS queries per second since the previous snapshot."""
+        if self.elapsed <= 0:
+            return 0.0
+        return self.dns_queries / self.elapsed
+
+    @property
+    def blocked_per_second(self) -> float:
+        """Return the blocked DNS queries per second since the previous snapshot."""
+        if self.elapsed <= 0:
+            return 0.0
+        return self.blocked_filtering / self.elapsed
+
+
+@dataclass
+class AdGuardHomeStatsPoller:
+    """Polls AdGuard Home stats and emits changes.
+
+    Listeners are only called when the stats changed since the previous
+    poll. While no new DNS queries are seen, or polling fails, the interval
+    is backed off up to `max_interval`; it resets as soon as queries come
+    in again. Every delay is jittered, so multiple pollers do not
+    synchronize.
+    """
+
+    adguard: AdGuardHome
+    interval: float = 10.0
+    max_interval: float = 300.0
+    backoff: float = 2.0
+    jitter: float = 0.1
+
+    _listeners: list[Callable[[AdGuardHomeStatsDelta], None]] = field(
+        default_factory=list, init=False, repr=False
+    )
+    _previous: AdGuardHomeStatsSnapshot | None = field(
+        default=None, init=False, repr=False
+    )
+    _previous_time: float = field(default=0.0, init=False, repr=False)
+    _current_interval: float = field(default=0.0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Validate the polling configuration.
+
+        Raises
+        ------
+            AdGuardHomeError: The polling configuration is invalid.
+
+        """
+        if self.interval <= 0 or self.max_interval < self.interval:
+            msg = "Poll interval must be positive and not exceed the max interval"
+            raise AdGuardHomeError(msg)
+        if self.backoff < 1 or not 0 <= self.jitter < 1:
+            msg = "Poll backoff must be at least 1 and jitter between 0 and 1"
+            raise AdGuardHomeError(msg)
+        self._current_interval = self.interval
+
+    @property
+    def current_interval(self) -> float:
+        """Return the current (backed off) interval, without jitter."""
+        return self._current_interval
+
+    @property
+    def snapshot(self) -> AdGuardHomeStatsSnapshot | None:
+        """Return the most recently polled stats snapshot."""
+        return self._previous
+
+    def subscribe(
+        self, listener: Callable[[AdGuardHomeStatsDelta], None]
+    ) -> Callable[[], None]:
+        """Register a listener that is called when the stats change.
+
+        Args:
+        ----
+            listener: Callable that receives the stats delta.
+
+        Returns:
+        -------
+            A callable that removes the listener again.
+
+        """
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    async def poll(self) -> AdGuardHomeStatsDelta | None:
+        """Poll the stats once and notify listeners on changes.
+
+        Returns
+        -------
+            The delta with the previous poll, or None if nothing changed.
+
+        """
+        current = await self.adguard.stats.snapshot()
+        now = monotonic()
+
+        previous = self._previous
+        elapsed = now - self._previous_time if previous is not None else 0.0
+        self._previous = current
+        self._previous_time = now
+
+        changed = current != previous
+        delta = AdGuardHomeStatsDelta.between(previous, current, elapsed)
+        if previous is None or delta.dns_queries:
+            self._current_interval = self.interval
+        else:
+            self._back_off()
+
+        if not changed:
+            return None
+        for listener in list(self._listeners):
+            listener(delta)
+        return delta
+
+    def _back_off(self) -> None:
+        """Increase the current interval, up to the max interval."""
+        self._current_interval = min(
+            self._current_interval * self.backoff, self.max_interval
+        )
+
+    def next_delay(self) -> float:
+        """Return the jittered delay until the next poll.
+
+        Returns
+        -------
+            The number of seconds to wait before polling again.
+
+        """
+        spread = self._current_interval * self.jitter
+        return self._current_interval + random.uniform(-spread, spread)  # noqa: S311
+
+    async def run(self) -> None:
+        """Poll the stats until cancelled.
+
+        A failing poll (e.g., AdGuard Home is unreachable) is logged and
+        backs off the interval; polling continues.
+        """
+        while True:
+            try:
+                await self.poll()
+            except AdGuardHomeError as exception:
+                _LOGGER.warning("Polling AdGuard Home stats failed: %s", exception)
+                self._back_off()
+            await asyncio.sleep(self.next_delay())
+
 
 @dataclass
 class AdGuardHomeStats:
@@ -17,6 +449,31 @@ class AdGuardHomeStats:
 
     adguard: AdGuardHome
 
+    async def snapshot(self) -> AdGuardHomeStatsSnapshot:
+        """Return all statistics, including time-series and top lists.
+
+        Returns
+        -------
+            A snapshot of all statistics of the AdGuard Home instance.
+
+        """
+        response = await self.adguard.request("stats")
+        return AdGuardHomeStatsSnapshot.from_dict(response)
+
+    def poller(self, **kwargs: Any) -> AdGuardHomeStatsPoller:
+        """Return a poller that emits stats changes.
+
+        Args:
+        ----
+            **kwargs: Options passed on to `AdGuardHomeStatsPoller`.
+
+        Returns:
+        -------
+            A new stats poller for this AdGuard Home instance.
+
+        """
+        return AdGuardHomeStatsPoller(self.adguard, **kwargs)
+
     async def dns_queries(self) -> int:
         """Return number of DNS queries.
 
@@ -25,7 +482,7 @@ class AdGuardHomeStats:
             The number of DNS queries performed by the AdGuard Home instance.
 
         """
-        response = await self.adguard.request("stats")
+        response = await self.adguard.request("stats", fields={"num_dns_queries"})
         return response["num_dns_queries"]
 
     async def blocked_filtering(self) -> int:
@@ -36,7 +493,7 @@ class AdGuardHomeStats:
             The number of DNS queries blocked by the AdGuard Home instance.
 
         """
-        response = await self.adguard.request("stats")
+        response = await self.adguard.request("stats", fields={"num_blocked_filtering"})
         return response["num_blocked_filtering"]
 
     async def blocked_percentage(self) -> float:
@@ -48,7 +505,9 @@ class AdGuardHomeStats:
             instance.
 
         """
-        response = await self.adguard.request("stats")
+        response = await self.adguard.request(
+            "stats", fields={"num_dns_queries", "num_blocked_filtering"}
+        )
         if not response["num_dns_queries"]:
             return 0.0
         return (response["num_blocked_filtering"] / response["num_dns_queries"]) * 100.0
@@ -62,7 +521,9 @@ class AdGuardHomeStats:
             browsing feature of the AdGuard Home instance.
 
         """
-        response = await self.adguard.request("stats")
+        response = await self.adguard.request(
+            "stats", fields={"num_replaced_safebrowsing"}
+        )
         return response["num_replaced_safebrowsing"]
 
     async def replaced_parental(self) -> int:
@@ -74,7 +535,7 @@ class AdGuardHomeStats:
             feature of the AdGuard Home instance.
 
         """
-        response = await self.adguard.request("stats")
+        response = await self.adguard.request("stats", fields={"num_replaced_parental"})
         return response["num_replaced_parental"]
 
     async def replaced_safesearch(self) -> int:
@@ -86,7 +547,9 @@ class AdGuardHomeStats:
             AdGuard Home instance.
 
         """
-        response = await self.adguard.request("stats")
+        response = await self.adguard.request(
+            "stats", fields={"num_replaced_safesearch"}
+        )
         return response["num_replaced_safesearch"]
 
     async def avg_processing_time(self) -> float:
@@ -98,7 +561,7 @@ class AdGuardHomeStats:
             as performed by the AdGuard Home instance.
 
         """
-        response = await self.adguard.request("stats")
+        response = await self.adguard.request("stats", fields={"avg_processing_time"})
         return round(response["avg_processing_time"] * 1000, 2)
 
     async def period(self) -> int:
@@ -0,0 +1,169 @@
+"""Asynchronous Python client for the AdGuard Home API."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import TYPE_CHECKING, Any
+
+from .exceptions import AdGuardHomeError
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# A complete string, an incomplete string (a lone quote) or structure.
+_TOKENS = re.compile(rb'"(?:[^"\\]|\\.)*"|["{}\[\],]', re.DOTALL)
+
+
+class JSONArrayParser:
+    """Incremental parser for the elements of an array in a JSON document.
+
+    The document is fed in chunks; every element of the array is decoded
+    as soon as it is complete, so memory use depends on the size of a
+    single element instead of the whole document. Everything outside the
+    array is skipped without decoding it.
+    """
+
+    def __init__(self, path: Sequence[str] = ()) -> None:
+        """Initialize the parser.
+
+        Args:
+        ----
+            path: Keys of the nested objects leading to the array; e.g.,
+                `("data",)`. An empty path selects a top-level array.
+
+        """
+        self.path = tuple(path)
+        self.done = False
+        self._buffer = bytearray()
+        self._position = 0
+        self._stack: list[int] = []
+        self._matched = 0
+        self._expect_key = False
+        self._last_key: bytes | None = None
+        self._array_depth: int | None = None
+        self._element_start = 0
+
+    def _on_path(self, depth: int) -> bool:
+        """Return whether a value at a depth is at the next key of the path."""
+        if not self.path:
+            return depth == 0
+        return (
+            depth == self._matched + 1
+            and self._stack[-1] == ord("{")
+            and self._last_key is not None
+            and json.loads(self._last_key) == self.path[self._matched]
+        )
+
+    def _open(self, token: int, position: int) -> None:
+        """Handle the start of an object or array."""
+        depth = len(self._stack)
+        if self._array_depth is None and self._on_path(depth):
+            if self._matched < len(self.path) - 1:
+                self._matched += 1
+            elif token == ord("["):
+                self._array_depth = depth + 1
+                self._element_start = position + 1
+            else:
+                msg = f"JSON value at {'.'.join(self.path)} is not an array"
+                raise AdGuardHomeError(msg)
+        self._stack.append(token)
+        self._expect_key = token == ord("{")
+
+    def _element(self, end: int) -> list[Any]:
+        """Return the element that ends at a position, if it is not empty."""
+        element = bytes(self._buffer[self._element_start : end]).strip()
+        self._element_start = end + 1
+        return [json.loads(element)] if element else []
+
+    def _comma(self, position: int, elements: list[Any]) -> None:
+        """Handle a separator of object members or array elements."""
+        if self._stack and self._stack[-1] == ord("{"):
+            self._expect_key = True
+        elif len(self._stack) == self._array_depth:
+            elements.extend(self._element(position))
+
+    def _close(self, position: int, elements: list[Any]) -> bool:
+        """Handle the end of an object or array; return True at the array end."""
+        if len(self._stack) == self._array_depth:
+            elements.extend(self._element(position))
+            self.done = True
+            return True
+        if not self._stack:
+            msg = "Invalid JSON document"
+            raise AdGuardHomeError(msg)
+        self._stack.pop()
+        # The object of the last matched key of the path is at the depth of
+        # the number of matched keys; when it ends, that key no longer matches
+        if self._matched and len(self._stack) <= self._matched:
+            self._matched -= 1
+        return False
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Feed a chunk of the document to the parser.
+
+        Args:
+        ----
+            chunk: The next chunk of the JSON document.
+
+        Returns:
+        -------
+            The elements of the array that were completed by the chunk.
+
+        Raises:
+        ------
+            AdGuardHomeError: The document or an element is invalid JSON.
+
+        """
+        if self.done:
+            return []
+        self._buffer += chunk
+        elements: list[Any] = []
+        try:
+            for match in _TOKENS.finditer(self._buffer, self._position):
+                token = match.group()
+                if token == b'"':
+                    # Incomplete string; wait for the rest of it
+                    self._position = match.start()
+                    break
+                self._position = match.end()
+                first = token[0]
+                if first == ord('"'):
+                    if self._expect_key and self._stack[-1] == ord("{"):
+                        self._last_key = token
+                        self._expect_key = False
+                elif first in b"{[":
+                    self._open(first, match.start())
+                elif first == ord(","):
+                    self._comma(match.start(), elements)
+                elif self._close(match.start(), elements):
+                    break
+            else:
+                self._position = len(self._buffer)
+        except ValueError as exception:
+            msg = "Invalid JSON element in document"
+            raise AdGuardHomeError(msg) from exception
+
+        # Drop everything before the current element, or the current token
+        keep = self._element_start if self._array_depth else self._position
+        keep = min(keep, self._position)
+        del self._buffer[:keep]
+        self._position -= keep
+        self._element_start -= keep
+        return elements
+
+    def close(self) -> None:
+        """Signal the end of the document.
+
+        Raises
+        ------
+            AdGuardHomeError: The document has no array at the path, or it
+                ended inside the array.
+
+        """
+        if self._array_depth is None:
+            msg = f"No JSON array at {'.'.join(self.path) or 'the top level'}"
+            raise AdGuardHomeError(msg)
+        if not self.done:
+            msg = "JSON document ended inside the array"
+            raise AdGuardHomeError(msg)
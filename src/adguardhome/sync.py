@@ -0,0 +1,189 @@
+"""Asynchronous Python client for the AdGuard Home API."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import threading
+from typing import TYPE_CHECKING, Any, Self, TypeVar
+
+from .adguardhome import AdGuardHome
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        AsyncGenerator,
+        Awaitable,
+        Callable,
+        Coroutine,
+        Iterator,
+    )
+
+_T = TypeVar("_T")
+
+
+async def _await(awaitable: Awaitable[_T]) -> _T:
+    """Await an awaitable, which may not be a coroutine; e.g., `anext()`."""
+    return await awaitable
+
+
+class _SyncProxy:
+    """Synchronous proxy of an API object, running its coroutines on a loop."""
+
+    def __init__(self, target: Any, client: SyncAdGuardHome) -> None:
+        """Initialize the proxy of an API object."""
+        self._target = target
+        self._client = client
+        self._lock = threading.Lock()
+        self._proxies: dict[str, _SyncProxy] = {}
+
+    def _wrap(self, value: Any) -> Any:
+        """Return a synchronous version of an attribute value."""
+        if inspect.iscoroutinefunction(value):
+            return self._client._sync_method(value)  # noqa: SLF001 pylint: disable=protected-access
+        if inspect.isasyncgenfunction(value):
+            return self._client._sync_iterator(value)  # noqa: SLF001 pylint: disable=protected-access
+        if getattr(value, "adguard", None) is self._client.adguard:
+            return _SyncProxy(value, self._client)
+        return value
+
+    def __getattr__(self, name: str) -> Any:
+        """Return an attribute of the API object, with synchronous methods."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if (proxy := self._proxies.get(name)) is not None:
+            return proxy
+        # Sub-APIs are created on first access, which is not thread-safe
+        with self._lock:
+            value = self._wrap(getattr(self._target, name))
+            if isinstance(value, _SyncProxy):
+                value = self._proxies.setdefault(name, value)
+        return value
+
+    def __dir__(self) -> list[str]:
+        """Return the attributes of the API object."""
+        return [name for name in dir(self._target) if not name.startswith("_")]
+
+
+class SyncAdGuardHome(_SyncProxy):
+    """Synchronous AdGuard Home client, for scripts and threaded code.
+
+    All methods of `AdGuardHome` and its sub-APIs (e.g., `stats.snapshot()`)
+    are available as regular, blocking, methods. They run on a single event
+    loop in a background thread, which is kept for the lifetime of the
+    client, so all calls share one pooled HTTP session. Methods can be
+    called from many threads at once; calls from different threads run
+    concurrently on the loop.
+    """
+
+    def __init__(self, host: str, **kwargs: Any) -> None:
+        """Initialize the client and start its event loop thread.
+
+        Args:
+        ----
+            host: Hostname or IP address of the AdGuard Home instance.
+            **kwargs: Additional arguments for the `AdGuardHome` client;
+                e.g., `port`, `password` or `hooks`. A shared session is
+                not supported, since it is bound to another event loop.
+
+        """
+        if "session" in kwargs:
+            msg = "SyncAdGuardHome creates its own session"
+            raise TypeError(msg)
+        self.adguard = AdGuardHome(host, **kwargs)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="adguardhome", daemon=True
+        )
+        self._thread.start()
+        super().__init__(self.adguard, self)
+
+    def run(self, coroutine: Coroutine[Any, Any, _T]) -> _T:
+        """Run a coroutine on the event loop of the client.
+
+        Args:
+        ----
+            coroutine: The coroutine to run; e.g., one using `self.adguard`.
+
+        Returns:
+        -------
+            The result of the coroutine.
+
+        Raises:
+        ------
+            RuntimeError: The client is closed, or the method is called
+                from the event loop of the client, which would deadlock.
+
+        """
+        if self._loop.is_closed():
+            coroutine.close()
+            msg = "SyncAdGuardHome is closed"
+            raise RuntimeError(msg)
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            msg = "SyncAdGuardHome cannot be called from its own event loop"
+            raise RuntimeError(msg)
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def _sync_method(
+        self, method: Callable[..., Coroutine[Any, Any, Any]]
+    ) -> Callable[..., Any]:
+        """Return a blocking version of a coroutine method."""
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return self.run(method(*args, **kwargs))
+
+        wrapper.__name__ = method.__name__
+        wrapper.__doc__ = method.__doc__
+        return wrapper
+
+    def _sync_iterator(
+        self, method: Callable[..., AsyncGenerator[Any, None]]
+    ) -> Callable[..., Iterator[Any]]:
+        """Return a blocking version of an asynchronous generator method."""
+
+        def wrapper(*args: Any, **kwargs: Any) -> Iterator[Any]:
+            iterator = method(*args, **kwargs)
+            try:
+                while True:
+                    try:
+                        yield self.run(_await(anext(iterator)))
+                    except StopAsyncIteration:
+                        return
+            finally:
+                if not self._loop.is_closed():
+                    self.run(_await(iterator.aclose()))
+
+        wrapper.__name__ = method.__name__
+        wrapper.__doc__ = method.__doc__
+        return wrapper
+
+    def close(self) -> None:
+        """Close the session of the client and stop its event loop."""
+        if self._loop.is_closed():
+            return
+        try:
+            self.run(self.adguard.close())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+    def __enter__(self) -> Self:
+        """Enter the client context.
+
+        Returns
+        -------
+            The synchronous AdGuard Home client.
+
+        """
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        """Exit the client context, closing the client.
+
+        Args:
+        ----
+            _exc_info: Exception type, value, and traceback.
+
+        """
+        self.close()
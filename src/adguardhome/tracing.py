@@ -0,0 +1,173 @@
+"""Asynchronous Python client for the AdGuard Home API."""
+
+from __future__ import annotations
+
+import functools
+import importlib
+import inspect
+from typing import TYPE_CHECKING, Any
+
+from .instrumentation import RequestInfo
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Coroutine, Mapping
+    from types import ModuleType
+
+    from opentelemetry.trace import SpanKind, Tracer, TracerProvider
+    from yarl import URL
+
+    from .adguardhome import AdGuardHome
+
+# Module, class and span name prefix of the APIs that get spans.
+_TRACED_APIS = (
+    ("adguardhome", "AdGuardHome", "adguardhome"),
+    ("client", "AdGuardHomeClients", "adguardhome.clients"),
+    ("filtering", "AdGuardHomeFiltering", "adguardhome.filtering"),
+    ("parental", "AdGuardHomeParental", "adguardhome.parental"),
+    ("querylog", "AdGuardHomeQueryLog", "adguardhome.querylog"),
+    ("rewrite", "AdGuardHomeRewrite", "adguardhome.rewrite"),
+    ("safebrowsing", "AdGuardHomeSafeBrowsing", "adguardhome.safebrowsing"),
+    ("safesearch", "AdGuardHomeSafeSearch", "adguardhome.safesearch"),
+    ("stats", "AdGuardHomeStats", "adguardhome.stats"),
+    ("update", "AdGuardHomeUpdate", "adguardhome.update"),
+)
+
+# Methods of the client that do not call the API on their own.
+_UNTRACED_METHODS = frozenset({"request", "close"})
+
+_trace: ModuleType | None = None  # pylint: disable=invalid-name
+_originals: dict[tuple[type, str], Callable[..., Any]] = {}
+
+
+def _api_span(
+    tracer: Tracer, name: str, method: Callable[..., Coroutine[Any, Any, Any]]
+) -> Callable[..., Coroutine[Any, Any, Any]]:
+    """Wrap an API method in a span."""
+
+    @functools.wraps(method)
+    async def wrapper(api: Any, *args: Any, **kwargs: Any) -> Any:
+        adguard = getattr(api, "adguard", api)
+        with tracer.start_as_current_span(
+            name,
+            attributes={"server.address": adguard.host, "server.port": adguard.port},
+        ):
+            return await method(api, *args, **kwargs)
+
+    return wrapper
+
+
+def _http_span(
+    tracer: Tracer, kind: SpanKind, method: Callable[..., Coroutine[Any, Any, Any]]
+) -> Callable[..., Coroutine[Any, Any, Any]]:
+    """Wrap the HTTP request method of the client in a span of the kind."""
+
+    @functools.wraps(method)
+    # pylint: disable-next=too-many-arguments, too-many-positional-arguments
+    async def wrapper(  # noqa: PLR0913
+        adguard: AdGuardHome,
+        url: URL,
+        http_method: str,
+        data: Any | None,
+        json_data: dict[str, Any] | None,
+        params: Mapping[str, str] | None,
+        info: RequestInfo | None,
+        fields: Collection[str] | None = None,
+    ) -> Any:
+        if info is None:
+            uri = url.path.removeprefix(adguard.base_path)
+            info = RequestInfo(method=http_method, uri=uri, url=str(url))
+        with tracer.start_as_current_span(
+            f"{http_method} {info.uri.strip('/')}",
+            kind=kind,
+            attributes={
+                "http.request.method": http_method,
+                "url.full": info.url,
+                "server.address": adguard.host,
+                "server.port": adguard.port,
+                "adguardhome.endpoint": info.endpoint,
+            },
+        ) as span:
+            try:
+                return await method(
+                    adguard, url, http_method, data, json_data, params, info, fields
+                )
+            finally:
+                if info.status is not None:
+                    span.set_attribute("http.response.status_code", info.status)
+                span.set_attribute(
+                    "http.response.body.size",
+                    info.response_bytes
+                    if info.compressed_bytes is None
+                    else info.compressed_bytes,
+                )
+                for phase, duration in info.phases.items():
+                    span.set_attribute(f"adguardhome.phase.{phase}", duration)
+
+    return wrapper
+
+
+def instrument(tracer_provider: TracerProvider | None = None) -> bool:
+    """Trace all AdGuard Home API calls with OpenTelemetry.
+
+    Every public API method (e.g., `filtering.enable_url`) gets a span,
+    with a client span for each HTTP request it makes. When OpenTelemetry
+    is not installed, nothing is changed, so there is no overhead at all.
+
+    Args:
+    ----
+        tracer_provider: Optional tracer provider; defaults to the global
+            tracer provider.
+
+    Returns:
+    -------
+        True when tracing is enabled, False when OpenTelemetry is missing.
+
+    """
+    try:
+        trace = importlib.import_module("opentelemetry.trace")
+    except ImportError:
+        return False
+
+    global _trace  # noqa: PLW0603 pylint: disable=global-statement
+    uninstrument()
+    _trace = trace
+    tracer = trace.get_tracer("adguardhome", tracer_provider=tracer_provider)
+
+    for module, name, prefix in _TRACED_APIS:
+        cls = getattr(importlib.import_module(f".{module}", __package__), name)
+        for attribute, method in list(vars(cls).items()):
+            if (
+                attribute.startswith("_")
+                or attribute in _UNTRACED_METHODS
+                or not inspect.iscoroutinefunction(method)
+            ):
+                continue
+            _originals[cls, attribute] = method
+            setattr(cls, attribute, _api_span(tracer, f"{prefix}.{attribute}", method))
+
+    cls = importlib.import_module(".adguardhome", __package__).AdGuardHome
+    # pylint: disable=protected-access
+    _originals[cls, "_request"] = cls._request
+    cls._request = _http_span(tracer, trace.SpanKind.CLIENT, cls._request)
+    return True
+
+
+def uninstrument() -> None:
+    """Stop tracing AdGuard Home API calls."""
+    global _trace  # noqa: PLW0603 pylint: disable=global-statement
+    for (cls, attribute), method in _originals.items():
+        setattr(cls, attribute, method)
+    _originals.clear()
+    _trace = None
+
+
+def set_span_attributes(attributes: Mapping[str, Any]) -> None:
+    """Add attributes to the current span, when tracing is enabled.
+
+    Args:
+    ----
+        attributes: The attributes to add; e.g., cache hits of a lookup.
+
+    """
+    if _trace is not None:
+        _trace.get_current_span().set_attributes(attributes)
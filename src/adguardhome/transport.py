@@ -0,0 +1,286 @@
+"""Asynchronous Python client for the AdGuard Home API."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from multidict import CIMultiDict
+
+from .exceptions import AdGuardHomeError
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Mapping
+
+    from yarl import URL
+
+    SendFunction = Callable[["TransportRequest"], Awaitable["TransportResponse"]]
+
+# Headers that do not apply to the decompressed body of a recording.
+_SKIPPED_HEADERS = frozenset({"content-encoding", "content-length", "date"})
+
+CASSETTE_VERSION = 1
+
+
+@dataclass(slots=True, kw_only=True)
+class TransportRequest:
+    """A request to the AdGuard Home API, as passed to a transport."""
+
+    method: str
+    url: URL
+    data: Any | None = None
+    json_data: dict[str, Any] | None = None
+    params: Mapping[str, str] | None = None
+
+    @property
+    def key(self) -> str:
+        """Return a key that identifies equal requests.
+
+        The key consists of the method, path, sorted query parameters and
+        a digest of the request body; e.g., `GET /control/stats`.
+        """
+        key = f"{self.method} {self.url.path}"
+        query = sorted({**self.url.query, **(self.params or {})}.items())
+        if query:
+            key += "?" + "&".join(f"{name}={value}" for name, value in query)
+        body: bytes | None = None
+        if self.json_data is not None:
+            body = json.dumps(self.json_data, sort_keys=True).encode()
+        elif isinstance(self.data, str | bytes):
+            body = self.data.encode() if isinstance(self.data, str) else self.data
+        if body is not None:
+            key += f" #{hashlib.sha256(body).hexdigest()[:16]}"
+        return key
+
+
+@dataclass(slots=True, kw_only=True)
+class TransportResponse:
+    """A response of the AdGuard Home API, with a decompressed body."""
+
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+
+    @property
+    def charset(self) -> str:
+        """Return the charset of the body, from the content type header."""
+        for parameter in self.headers.get("Content-Type", "").split(";")[1:]:
+            name, _, value = parameter.partition("=")
+            if name.strip().lower() == "charset" and value.strip():
+                return value.strip().strip('"')
+        return "utf-8"
+
+
+class Transport:  # pylint: disable=too-few-public-methods
+    """Base class for transports, which send the requests of a client.
+
+    A transport gets every request, and the function that sends it over
+    HTTP; it can pass the request on, change it, or respond on its own.
+    The base class passes all requests on. Streamed requests (`stream()`)
+    always use HTTP.
+    """
+
+    async def send(
+        self, request: TransportRequest, send: SendFunction
+    ) -> TransportResponse:
+        """Send a request and return its response.
+
+        Args:
+        ----
+            request: The request to send.
+            send: Function that sends the request over HTTP.
+
+        Returns:
+        -------
+            The response to the request.
+
+        """
+        return await send(request)
+
+
+@dataclass(slots=True, kw_only=True)
+class Interaction:
+    """A recorded request and its response."""
+
+    key: str
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    duration: float
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the interaction as a JSON serializable dictionary."""
+        try:
+            body, encoding = self.body.decode(), None
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(self.body).decode(), "base64"
+        result = {
+            "key": self.key,
+            "status": self.status,
+            "headers": self.headers,
+            "body": body,
+            "duration": self.duration,
+        }
+        if encoding:
+            result["encoding"] = encoding
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Interaction:
+        """Create an interaction from a dictionary of `as_dict()`."""
+        body = data["body"].encode()
+        if data.get("encoding") == "base64":
+            body = base64.b64decode(body)
+        return cls(
+            key=data["key"],
+            status=data["status"],
+            headers=dict(data["headers"]),
+            body=body,
+            duration=data["duration"],
+        )
+
+
+@dataclass(slots=True)
+class Cassette:
+    """Recorded interactions, stored as JSON lines; gzipped for `.gz` files."""
+
+    interactions: list[Interaction] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: str | Path) -> Cassette:
+        """Load a cassette from a file.
+
+        Args:
+        ----
+            path: The path of the cassette file.
+
+        Returns:
+        -------
+            The cassette with the recorded interactions.
+
+        Raises:
+        ------
+            AdGuardHomeError: The file is not a (supported) cassette.
+
+        """
+        path = Path(path)
+        data = path.read_bytes()
+        if path.suffix == ".gz":
+            data = gzip.decompress(data)
+        try:
+            header, *lines = data.decode().splitlines()
+            if json.loads(header).get("version") != CASSETTE_VERSION:
+                msg = f"Unsupported cassette version in {path}"
+                raise AdGuardHomeError(msg)
+            return cls([Interaction.from_dict(json.loads(line)) for line in lines])
+        except (ValueError, KeyError, AttributeError) as exception:
+            msg = f"Invalid cassette file {path}"
+            raise AdGuardHomeError(msg) from exception
+
+    def save(self, path: str | Path) -> None:
+        """Save the cassette to a file.
+
+        Args:
+        ----
+            path: The path of the cassette file; ending with `.gz` to
+                compress it.
+
+        """
+        path = Path(path)
+        lines = [json.dumps({"version": CASSETTE_VERSION})]
+        lines.extend(
+            json.dumps(interaction.as_dict(), separators=(",", ":"))
+            for interaction in self.interactions
+        )
+        data = ("\n".join(lines) + "\n").encode()
+        if path.suffix == ".gz":
+            data = gzip.compress(data, mtime=0)
+        path.write_bytes(data)
+
+
+class RecordingTransport(Transport):  # pylint: disable=too-few-public-methods
+    """Transport that records all requests and responses in a cassette."""
+
+    def __init__(self, cassette: Cassette | None = None) -> None:
+        """Initialize the recording transport.
+
+        Args:
+        ----
+            cassette: Optional cassette to add the recordings to.
+
+        """
+        self.cassette = cassette if cassette is not None else Cassette()
+
+    async def send(
+        self, request: TransportRequest, send: SendFunction
+    ) -> TransportResponse:
+        """Send a request over HTTP, and record it with its response."""
+        start = time.perf_counter()
+        response = await send(request)
+        self.cassette.interactions.append(
+            Interaction(
+                key=request.key,
+                status=response.status,
+                headers={
+                    name: value
+                    for name, value in response.headers.items()
+                    if name.lower() not in _SKIPPED_HEADERS
+                },
+                body=response.body,
+                duration=round(time.perf_counter() - start, 6),
+            )
+        )
+        return response
+
+
+class ReplayTransport(Transport):  # pylint: disable=too-few-public-methods
+    """Transport that responds with the recordings of a cassette.
+
+    Requests with the same key get their recorded responses in the order
+    they were recorded; after the last one, they start over from the first.
+    Nothing is sent over the network.
+    """
+
+    def __init__(self, cassette: Cassette, *, timing: float = 0.0) -> None:
+        """Initialize the replay transport.
+
+        Args:
+        ----
+            cassette: The cassette with the recordings to replay.
+            timing: Factor for the recorded duration of responses; e.g.,
+                1.0 to respond as fast as the original, or 0.0 (default)
+                to respond immediately.
+
+        """
+        self.cassette = cassette
+        self.timing = timing
+        self._interactions: dict[str, list[Interaction]] = defaultdict(list)
+        for interaction in cassette.interactions:
+            self._interactions[interaction.key].append(interaction)
+        self._played: dict[str, int] = defaultdict(int)
+
+    async def send(
+        self, request: TransportRequest, _send: SendFunction
+    ) -> TransportResponse:
+        """Respond with the next recording of the request."""
+        key = request.key
+        if not (interactions := self._interactions.get(key)):
+            msg = f"No recorded response for {key}"
+            raise AdGuardHomeError(msg)
+        interaction = interactions[self._played[key] % len(interactions)]
+        self._played[key] += 1
+        if self.timing:
+            await asyncio.sleep(interaction.duration * self.timing)
+        return TransportResponse(
+            status=interaction.status,
+            headers=CIMultiDict(interaction.headers),
+            body=interaction.body,
+        )
@@ -10,6 +10,7 @@ import pytest
 from aioresponses import aioresponses
 
 from adguardhome import AdGuardHome
+from adguardhome.fake import FakeAdGuardHome
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
@@ -38,3 +39,16 @@ async def adguard() -> AsyncGenerator[AdGuardHome, None]:
     """Yield an AdGuardHome client wired to example.com with default settings."""
     async with aiohttp.ClientSession() as session:
         yield AdGuardHome("example.com", session=session)
+
+
+@pytest.fixture
+def fake_options() -> dict[str, Any]:
+    """Return the options of the fake AdGuard Home; overridden per module."""
+    return {}
+
+
+@pytest.fixture
+async def fake(fake_options: dict[str, Any]) -> AsyncGenerator[FakeAdGuardHome, None]:
+    """Yield a running fake AdGuard Home."""
+    async with FakeAdGuardHome(**fake_options) as server:
+        yield server
@@ -1,12 +1,16 @@
 """Tests for `adguardhome.adguardhome`."""
 
+import subprocess
+import sys
+from typing import Any
 from unittest.mock import patch
 
 import aiohttp
 import pytest
 from aioresponses import CallbackResult, aioresponses
 
-from adguardhome import AdGuardHome
+import adguardhome
+from adguardhome import AdGuardHome, AdGuardHomeFeatures
 from adguardhome.exceptions import AdGuardHomeConnectionError, AdGuardHomeError
 
 URL_ROOT = "http://example.com:3000/"
@@ -222,3 +226,137 @@ async def test_version(responses: aioresponses, adguard: AdGuardHome) -> None:
     """Test requesting AdGuard Home instance version."""
     responses.get(URL_STATUS, status=200, payload={"version": "1.1"})
     assert await adguard.version() == "1.1"
+
+
+def _mock_features(responses: aioresponses, *, enabled: bool) -> None:
+    """Mock the status endpoints of all features."""
+    responses.get(URL_STATUS, payload={"protection_enabled": enabled}, repeat=True)
+    for uri in (
+        "filtering/status",
+        "parental/status",
+        "safebrowsing/status",
+        "safesearch/status",
+        "querylog_info",
+    ):
+        responses.get(
+            f"{URL_ROOT}control/{uri}",
+            payload={"enabled": enabled, "interval": 1},
+            repeat=True,
+        )
+
+
+async def test_features(responses: aioresponses, adguard: AdGuardHome) -> None:
+    """Test requesting the state of all features."""
+    _mock_features(responses, enabled=True)
+
+    assert await adguard.features() == AdGuardHomeFeatures(
+        protection=True,
+        filtering=True,
+        parental=True,
+        safebrowsing=True,
+        safesearch=True,
+        querylog=True,
+    )
+
+
+async def test_set_features(responses: aioresponses, adguard: AdGuardHome) -> None:
+    """Test only features that differ are changed."""
+    _mock_features(responses, enabled=False)
+    writes: list[tuple[str, object]] = []
+
+    def callback(url: Any, **kwargs: object) -> CallbackResult:
+        writes.append((url.path, kwargs.get("json")))
+        return CallbackResult(status=200, body="OK", content_type="text/plain")
+
+    responses.post(URL_PROTECTION, callback=callback)
+    responses.post(f"{URL_ROOT}control/parental/enable", callback=callback)
+
+    result = await adguard.set_features(
+        protection=True,
+        parental=True,
+        safesearch=False,
+    )
+
+    assert sorted(writes, key=str) == [
+        ("/control/parental/enable", None),
+        ("/control/protection", {"enabled": True}),
+    ]
+    assert result == AdGuardHomeFeatures(
+        protection=True,
+        filtering=False,
+        parental=True,
+        safebrowsing=False,
+        safesearch=False,
+        querylog=False,
+    )
+
+
+async def test_set_features_error(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+) -> None:
+    """Test a failing feature change is raised."""
+    _mock_features(responses, enabled=True)
+    responses.post(
+        f"{URL_ROOT}control/safesearch/disable",
+        status=500,
+        body="Error",
+        content_type="text/plain",
+    )
+
+    with pytest.raises(AdGuardHomeError):
+        await adguard.set_features(safesearch=False)
+
+
+def _loaded_modules(code: str) -> set[str]:
+    """Return the modules loaded after running code in a fresh interpreter."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", f"{code}\nimport sys\nprint(*sys.modules)"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return set(result.stdout.split())
+
+
+def test_lazy_package_import() -> None:
+    """Test importing the package does not import aiohttp or the API modules."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import adguardhome"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    modules = {
+        line.rsplit("|", 1)[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    assert "adguardhome" in modules
+    assert "aiohttp" not in modules
+    assert "adguardhome.adguardhome" not in modules
+
+
+def test_lazy_sub_apis() -> None:
+    """Test sub-API modules are only imported when they are first used."""
+    modules = _loaded_modules(
+        "from adguardhome import AdGuardHome; AdGuardHome('example.com').stats"
+    )
+    assert "adguardhome.adguardhome" in modules
+    assert "adguardhome.stats" in modules
+    assert "adguardhome.client" not in modules
+    assert "adguardhome.rewrite" not in modules
+
+
+def test_lazy_exports() -> None:
+    """Test the lazy exports of the package."""
+    assert "RewriteRule" in dir(adguardhome)
+    assert adguardhome.AdGuardHomeError.__module__ == "adguardhome.exceptions"
+    with pytest.raises(AttributeError, match="no attribute 'Unknown'"):
+        _ = adguardhome.Unknown
+
+
+async def test_sub_api_cached(adguard: AdGuardHome) -> None:
+    """Test sub-APIs are created once per client."""
+    assert adguard.stats is adguard.stats
+    assert adguard.stats.adguard is adguard
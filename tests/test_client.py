@@ -1,14 +1,36 @@
 """Tests for `adguardhome.client`."""
 
+import copy
+import dataclasses
+import json
+import pickle
+import re
+from typing import Any
+from unittest.mock import patch
+
 import pytest
-from aioresponses import aioresponses
+from aioresponses import CallbackResult, aioresponses
 from syrupy.assertion import SnapshotAssertion
+from yarl import URL
 
-from adguardhome import AdGuardHome, AutoClient
+from adguardhome import (
+    AdGuardHome,
+    AutoClient,
+    Client,
+    ClientResolver,
+    ClientsSnapshot,
+    ClientSyncResult,
+)
+from adguardhome.client import _client_data
+from adguardhome.exceptions import AdGuardHomeError
 
 from .conftest import FixtureLoader
 
 URL_CLIENTS = "http://example.com:3000/control/clients"
+URL_ADD = "http://example.com:3000/control/clients/add"
+URL_UPDATE = "http://example.com:3000/control/clients/update"
+URL_DELETE = "http://example.com:3000/control/clients/delete"
+URL_FIND = re.compile(r"^http://example\.com:3000/control/clients/find\?.*$")
 
 
 async def test_get_auto_clients(
@@ -116,6 +138,531 @@ async def test_get_supported_tags(
     assert "user_child" in result
 
 
+async def test_snapshot(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+    load_fixture: FixtureLoader,
+) -> None:
+    """Test a single request serves clients, auto clients and tags."""
+    responses.get(URL_CLIENTS, status=200, payload=load_fixture("clients"))
+
+    result = await adguard.clients.snapshot()
+
+    assert len(responses.requests) == 1
+    assert [client.name for client in result.clients] == ["Kids devices"]
+    assert result.clients[0].blocked_services == ["youtube"]
+    assert [client.name for client in result.auto_clients] == ["phone", "laptop"]
+    assert len(result.supported_tags) == 10
+
+
+def test_snapshot_empty() -> None:
+    """Test a clients snapshot of a response without any clients."""
+    assert ClientsSnapshot.from_dict({"clients": None}) == ClientsSnapshot(
+        clients=[], auto_clients=[], supported_tags=[]
+    )
+
+
+def test_slots() -> None:
+    """Test client objects do not carry a per-instance dictionary."""
+    assert not hasattr(Client(name="test", ids=[]), "__dict__")
+    assert not hasattr(AutoClient(ip_address="", name="", source=""), "__dict__")
+
+
+def test_resolver() -> None:
+    """Test resolving addresses and identifiers to managed clients."""
+    resolver = ClientResolver(
+        [
+            Client(name="lan", ids=["192.168.1.0/24", "2001:db8::/32"]),
+            Client(name="kids", ids=["192.168.1.30", "AA-BB-CC-DD-EE-FF"]),
+            Client(name="subnet", ids=["192.168.1.128/25"]),
+            Client(name="phone", ids=["my-phone", "2001:db8::1"]),
+        ]
+    )
+
+    def name(identifier: str) -> str | None:
+        client = resolver.resolve(identifier)
+        return client.name if client else None
+
+    assert len(resolver) == 4
+    assert name("192.168.1.30") == "kids"
+    assert name("192.168.1.31") == "lan"
+    assert name("192.168.1.200") == "subnet"
+    assert name("192.168.2.1") is None
+    assert name("aa:bb:cc:dd:ee:ff") == "kids"
+    assert name("aabb.ccdd.eeff") == "kids"
+    assert name("aa:bb:cc:dd:ee:00") is None
+    assert name("2001:db8::1") == "phone"
+    assert name("2001:db8::2") == "lan"
+    assert name("2001:db9::1") is None
+    assert name("my-phone") == "phone"
+    assert name("unknown") is None
+
+
+def test_resolver_updates() -> None:
+    """Test clients can be changed and removed incrementally."""
+    resolver = ClientResolver.from_snapshot(
+        ClientsSnapshot(
+            clients=[
+                Client(name="a", ids=["10.0.0.0/8", "aa:bb:cc:dd:ee:ff", "id-a"]),
+                Client(name="b", ids=["10.1.0.0/16"]),
+            ],
+            auto_clients=[],
+            supported_tags=[],
+        )
+    )
+    assert resolver.resolve("10.1.2.3") == Client(name="b", ids=["10.1.0.0/16"])
+
+    resolver.add(Client(name="b", ids=["10.2.0.0/16"]))
+    assert resolver.resolve("10.1.2.3").name == "a"
+    assert resolver.resolve("10.2.2.3").name == "b"
+
+    # A network taken over by another client stays with that client
+    resolver.add(Client(name="c", ids=["10.0.0.0/8", "id-a", "aa:bb:cc:dd:ee:ff"]))
+    resolver.remove("c")
+    resolver.remove("a")
+    resolver.remove("unknown")
+    assert resolver.resolve("10.3.0.1") is None
+    assert resolver.resolve("id-a") is None
+    assert resolver.resolve("aa:bb:cc:dd:ee:ff") is None
+    assert resolver.resolve("10.2.0.1").name == "b"
+    assert len(resolver) == 1
+
+
+def test_resolver_many() -> None:
+    """Test resolving a batch of identifiers."""
+    kids = Client(name="kids", ids=["192.168.1.0/24"])
+    resolver = ClientResolver([kids])
+
+    result = resolver.resolve_many(["192.168.1.1", "10.0.0.1", "192.168.1.1"])
+
+    assert result == [kids, None, kids]
+
+
+async def test_add(responses: aioresponses, adguard: AdGuardHome) -> None:
+    """Test adding a managed client."""
+
+    def callback(_url: str, **kwargs: Any) -> CallbackResult:
+        assert kwargs["json"]["name"] == "tv"
+        assert kwargs["json"]["ids"] == ["192.168.1.50"]
+        assert kwargs["json"]["tags"] == ["device_tv"]
+        assert "upstreams" not in kwargs["json"]
+        return CallbackResult(status=200, content_type="text/plain")
+
+    responses.post(URL_ADD, callback=callback)
+    await adguard.clients.add(
+        Client(name="tv", ids=["192.168.1.50"], tags=["device_tv"])
+    )
+
+
+async def test_update(responses: aioresponses, adguard: AdGuardHome) -> None:
+    """Test updating (and renaming) a managed client, keeping other settings."""
+    schedule = {"time_zone": "Local", "mon": {"start": 0, "end": 3600000}}
+    responses.get(
+        URL_CLIENTS,
+        status=200,
+        payload={
+            "clients": [
+                {
+                    "name": "old",
+                    "ids": ["10.0.0.9"],
+                    "blocked_services": ["youtube"],
+                    "blocked_services_schedule": schedule,
+                    "safe_search": {"enabled": False, "youtube": True},
+                    "safesearch_enabled": False,
+                }
+            ]
+        },
+    )
+
+    def callback(_url: str, **kwargs: Any) -> CallbackResult:
+        assert kwargs["json"]["name"] == "old"
+        data = kwargs["json"]["data"]
+        assert data["name"] == "new"
+        assert data["ids"] == ["10.0.0.1"]
+        assert data["blocked_services"] == ["youtube"]
+        assert data["blocked_services_schedule"] == schedule
+        assert data["safe_search"] == {"enabled": True, "youtube": True}
+        assert data["safesearch_enabled"] is True
+        return CallbackResult(status=200, content_type="text/plain")
+
+    responses.post(URL_UPDATE, callback=callback)
+    await adguard.clients.update(
+        Client(name="new", ids=["10.0.0.1"], safesearch_enabled=True), name="old"
+    )
+
+
+async def test_delete(responses: aioresponses, adguard: AdGuardHome) -> None:
+    """Test deleting a managed client."""
+
+    def callback(_url: str, **kwargs: Any) -> CallbackResult:
+        assert kwargs["json"] == {"name": "tv"}
+        return CallbackResult(status=200, content_type="text/plain")
+
+    responses.post(URL_DELETE, callback=callback)
+    await adguard.clients.delete("tv")
+
+
+@pytest.mark.parametrize(
+    ("method", "url", "args"),
+    [
+        ("add", URL_ADD, (Client(name="tv", ids=[]),)),
+        ("update", URL_UPDATE, (Client(name="tv", ids=[]),)),
+        ("delete", URL_DELETE, ("tv",)),
+    ],
+)
+async def test_write_error(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+    method: str,
+    url: str,
+    args: tuple[Any, ...],
+) -> None:
+    """Test client writes fail on HTTP errors."""
+    responses.get(URL_CLIENTS, status=200, payload={"clients": []})
+    responses.post(url, status=400, body="Error", content_type="text/plain")
+    with pytest.raises(AdGuardHomeError):
+        await getattr(adguard.clients, method)(*args)
+
+
+async def test_many(responses: aioresponses, adguard: AdGuardHome) -> None:
+    """Test bulk writes, fetching the current clients once for updates."""
+    schedule = {"time_zone": "Local"}
+    responses.get(
+        URL_CLIENTS,
+        status=200,
+        payload={
+            "clients": [
+                {
+                    "name": "a",
+                    "ids": ["10.0.0.1"],
+                    "blocked_services_schedule": schedule,
+                },
+                {"name": "b", "ids": ["10.0.0.2"]},
+            ]
+        },
+    )
+    writes: list[tuple[str, Any]] = []
+
+    def callback(url: Any, **kwargs: Any) -> CallbackResult:
+        writes.append((url.path.rsplit("/", 1)[-1], kwargs["json"]))
+        if kwargs["json"].get("name") == "fail":
+            return CallbackResult(status=500, body="Error", content_type="text/plain")
+        return CallbackResult(status=200, content_type="text/plain")
+
+    responses.post(URL_ADD, callback=callback, repeat=True)
+    responses.post(URL_UPDATE, callback=callback, repeat=True)
+    responses.post(URL_DELETE, callback=callback, repeat=True)
+
+    results = await adguard.clients.add_many(
+        [Client(name="c", ids=["10.0.0.3"]), Client(name="fail", ids=[])]
+    )
+    assert [(result.name, result.success) for result in results] == [
+        ("c", True),
+        ("fail", False),
+    ]
+
+    results = await adguard.clients.update_many(
+        [
+            Client(name="a", ids=["10.0.0.1"], filtering_enabled=True),
+            Client(name="b", ids=["10.0.0.2"], filtering_enabled=True),
+        ],
+        concurrency=1,
+    )
+    assert [result.action for result in results] == ["update", "update"]
+    assert all(result.success for result in results)
+    updates = [data for action, data in writes if action == "update"]
+    assert updates[0]["data"]["blocked_services_schedule"] == schedule
+    assert all(update["data"]["filtering_enabled"] for update in updates)
+
+    results = await adguard.clients.delete_many(["a", "b"])
+    assert [(result.name, result.action) for result in results] == [
+        ("a", "delete"),
+        ("b", "delete"),
+    ]
+    assert [data for action, data in writes if action == "delete"] == [
+        {"name": "a"},
+        {"name": "b"},
+    ]
+    # The current clients are only fetched once, for all updates
+    assert len(responses.requests[("GET", URL(URL_CLIENTS))]) == 1
+
+
+async def test_update_many_error(responses: aioresponses, adguard: AdGuardHome) -> None:
+    """Test updates fail when the current clients cannot be fetched."""
+    responses.get(
+        URL_CLIENTS, status=500, body="Error", content_type="text/plain", repeat=True
+    )
+    with pytest.raises(AdGuardHomeError, match="Failed updating client in"):
+        await adguard.clients.update(Client(name="a", ids=[]))
+    with pytest.raises(AdGuardHomeError, match="Failed updating clients"):
+        await adguard.clients.update_many([Client(name="a", ids=[])])
+
+
+async def test_sync(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+    load_fixture: FixtureLoader,
+) -> None:
+    """Test syncing only writes clients that differ."""
+    payload = load_fixture("clients")
+    payload["clients"].append({"name": "old", "ids": ["10.0.0.1"]})
+    responses.get(URL_CLIENTS, status=200, payload=payload)
+    writes: list[tuple[str, Any]] = []
+
+    def callback(url: Any, **kwargs: Any) -> CallbackResult:
+        writes.append((url.path.rsplit("/", 1)[-1], kwargs["json"]))
+        return CallbackResult(status=200, content_type="text/plain")
+
+    responses.post(URL_ADD, callback=callback)
+    responses.post(URL_UPDATE, callback=callback)
+    responses.post(URL_DELETE, callback=callback)
+
+    current = ClientsSnapshot.from_dict(load_fixture("clients")).clients[0]
+    results = await adguard.clients.sync(
+        [
+            current,
+            Client(name="new", ids=["10.0.0.2"]),
+        ],
+    )
+
+    writes.sort(key=lambda write: write[0])
+    assert [action for action, _ in writes] == ["add", "delete"]
+    assert writes[0][1]["name"] == "new"
+    assert writes[0][1]["ids"] == ["10.0.0.2"]
+    assert writes[1][1] == {"name": "old"}
+    assert sorted(results, key=lambda result: result.name) == [
+        ClientSyncResult("Kids devices", "unchanged"),
+        ClientSyncResult("new", "add"),
+        ClientSyncResult("old", "delete"),
+    ]
+
+
+async def test_sync_update_and_errors(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+) -> None:
+    """Test syncing changed clients and reporting failed writes."""
+    responses.get(
+        URL_CLIENTS,
+        status=200,
+        payload={
+            "clients": [
+                {"name": "a", "ids": ["10.0.0.1"], "upstreams": []},
+                {"name": "b", "ids": ["10.0.0.2"], "tags": ["device_pc"]},
+                {"name": "keep", "ids": ["10.0.0.3"]},
+            ]
+        },
+    )
+    updates: list[dict[str, Any]] = []
+
+    def callback(_url: str, **kwargs: Any) -> CallbackResult:
+        updates.append(kwargs["json"])
+        return CallbackResult(status=200, content_type="text/plain")
+
+    responses.post(URL_UPDATE, callback=callback)
+    responses.post(URL_ADD, status=500, body="Error", content_type="text/plain")
+
+    results = await adguard.clients.sync(
+        [
+            # Unset lists are equal to empty lists
+            Client(name="a", ids=["10.0.0.1"], upstreams=None),
+            Client(name="b", ids=["10.0.0.2"], filtering_enabled=True),
+            Client(name="c", ids=["10.0.0.4"], filtering_enabled=True),
+        ],
+        delete=False,
+        concurrency=1,
+    )
+
+    assert [result.action for result in results] == ["unchanged", "update", "add"]
+    assert updates == [
+        {
+            "name": "b",
+            "data": {
+                **_client_data(Client(name="b", ids=["10.0.0.2"])),
+                "filtering_enabled": True,
+                "tags": ["device_pc"],
+            },
+        }
+    ]
+    assert results[0].success
+    assert results[1].success
+    assert not results[2].success
+    assert isinstance(results[2].error, AdGuardHomeError)
+
+
+async def test_sync_unchanged(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+    load_fixture: FixtureLoader,
+) -> None:
+    """Test re-applying the current clients does not write anything."""
+    payload = load_fixture("clients")
+    responses.get(URL_CLIENTS, status=200, payload=payload)
+
+    results = await adguard.clients.sync(ClientsSnapshot.from_dict(payload).clients)
+
+    assert len(responses.requests) == 1
+    assert [result.action for result in results] == ["unchanged"]
+
+
+def _find_callback(requested: list[list[str]]) -> Any:
+    """Return a clients/find callback that records the requested identifiers."""
+
+    def callback(url: Any, **_kwargs: object) -> CallbackResult:
+        identifiers = list(url.query.values())
+        requested.append(identifiers)
+        return CallbackResult(
+            status=200,
+            payload=[
+                {
+                    identifier: {
+                        "name": f"client {identifier}",
+                        "ids": [identifier],
+                        "disallowed": False,
+                    }
+                    if identifier.startswith("192.168.")
+                    # A runtime client, named by its hostname
+                    else {
+                        "name": "laptop",
+                        "ids": [identifier],
+                        "disallowed": False,
+                        "whois_info": {},
+                    }
+                }
+                for identifier in identifiers
+            ],
+        )
+
+    return callback
+
+
+async def test_find_many(responses: aioresponses, adguard: AdGuardHome) -> None:
+    """Test finding many clients in batches, with caching."""
+    requested: list[list[str]] = []
+    responses.get(URL_FIND, callback=_find_callback(requested), repeat=True)
+    identifiers = [f"192.168.1.{i}" for i in range(10)] + ["10.0.0.1"]
+
+    result = await adguard.clients.find_many(identifiers, max_url_length=60)
+
+    assert len(requested) == 4
+    assert sorted(i for chunk in requested for i in chunk) == sorted(identifiers)
+    assert all(len(chunk) <= 3 for chunk in requested)
+    assert result["192.168.1.5"] == Client(
+        name="client 192.168.1.5", ids=["192.168.1.5"]
+    )
+    assert result["10.0.0.1"] is None
+
+    # Cached results, including unknown clients, do not cause requests
+    again = await adguard.clients.find_many(["192.168.1.5", "10.0.0.1"])
+    assert again == {"192.168.1.5": result["192.168.1.5"], "10.0.0.1": None}
+    assert len(requested) == 4
+
+    adguard.clients.clear_find_cache()
+    await adguard.clients.find_many(["192.168.1.5", "192.168.1.5"])
+    assert requested[-1] == ["192.168.1.5"]
+
+
+async def test_find_many_cache_invalidation(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+) -> None:
+    """Test writes to managed clients clear the cached results."""
+    requested: list[list[str]] = []
+    responses.get(URL_FIND, callback=_find_callback(requested), repeat=True)
+    responses.get(URL_CLIENTS, status=200, payload={"clients": []}, repeat=True)
+    responses.post(URL_ADD, status=200, body="OK", content_type="text/plain")
+    responses.post(URL_UPDATE, status=400, body="Error", content_type="text/plain")
+    responses.post(URL_DELETE, status=200, body="OK", content_type="text/plain")
+
+    await adguard.clients.find_many(["192.168.1.1"])
+    await adguard.clients.add(Client(name="tv", ids=["192.168.1.1"]))
+    await adguard.clients.find_many(["192.168.1.1"])
+    with pytest.raises(AdGuardHomeError):
+        await adguard.clients.update(Client(name="tv", ids=["192.168.1.2"]))
+    await adguard.clients.find_many(["192.168.1.1"])
+    await adguard.clients.delete("tv")
+    await adguard.clients.find_many(["192.168.1.1"])
+    await adguard.clients.find_many(["192.168.1.1"])
+
+    assert len(requested) == 4
+
+
+async def test_find_many_cache_expiry(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+) -> None:
+    """Test cached results expire, and the cache is not used with a TTL of 0."""
+    requested: list[list[str]] = []
+    responses.get(URL_FIND, callback=_find_callback(requested), repeat=True)
+
+    with patch("adguardhome.client.monotonic", return_value=0):
+        await adguard.clients.find_many(["192.168.1.1"], cache_ttl=10)
+    with patch("adguardhome.client.monotonic", return_value=5):
+        await adguard.clients.find_many(["192.168.1.1"])
+        assert len(requested) == 1
+        # Earlier results are not used without caching
+        await adguard.clients.find_many(["192.168.1.1"], cache_ttl=0)
+        assert len(requested) == 2
+        await adguard.clients.find_many(["192.168.1.1"])
+    assert len(requested) == 2
+    with patch("adguardhome.client.monotonic", return_value=11):
+        await adguard.clients.find_many(["192.168.1.1"], cache_ttl=0)
+        await adguard.clients.find_many(["192.168.1.1"])
+    assert len(requested) == 4
+
+
+async def test_find_many_cache_size(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+) -> None:
+    """Test the least recently used entries are evicted from the cache."""
+    requested: list[list[str]] = []
+    responses.get(URL_FIND, callback=_find_callback(requested), repeat=True)
+    adguard.clients._find_cache.maxsize = 2
+
+    await adguard.clients.find_many(["192.168.1.1", "192.168.1.2"])
+    await adguard.clients.find_many(["192.168.1.1"])
+    await adguard.clients.find_many(["192.168.1.3"])
+    await adguard.clients.find_many(["192.168.1.1", "192.168.1.2"])
+
+    assert requested[1:] == [["192.168.1.3"], ["192.168.1.2"]]
+
+
+async def test_iter_auto_clients(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+    load_fixture: FixtureLoader,
+) -> None:
+    """Test lazily iterating over discovered clients."""
+    payload = load_fixture("clients")
+    payload["auto_clients"].append(
+        {
+            "ip": "192.168.1.21",
+            "name": "tablet",
+            "source": "arp",
+            "whois_info": {"orgname": "Local Network"},
+        }
+    )
+    responses.get(URL_CLIENTS, status=200, payload=payload)
+
+    result = list(await adguard.clients.iter_auto_clients())
+
+    assert result[0] == AutoClient(
+        ip_address="192.168.1.10", name="phone", source="rdns"
+    )
+    assert result[1].whois_info == {"orgname": "Local Network"}
+    assert result[1].whois_info is result[2].whois_info
+    with pytest.raises(TypeError, match="read-only"):
+        result[1].whois_info["orgname"] = "Other"  # type: ignore[index]
+
+    # Shared WHOIS details behave like those of `get_auto_clients`
+    data = dataclasses.asdict(result[1])
+    assert data["whois_info"] == {"orgname": "Local Network"}
+    assert json.loads(json.dumps(data)) == data
+    assert copy.deepcopy(result[1]) == result[1]
+    assert pickle.loads(pickle.dumps(result[1])) == result[1]  # noqa: S301
+
+
 @pytest.mark.parametrize(
     ("method", "payload"),
     [
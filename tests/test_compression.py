@@ -0,0 +1,141 @@
+"""Tests for `adguardhome.compression`."""
+
+import gzip
+import zlib
+from types import ModuleType
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from adguardhome import AdGuardHomeError, LatencyHistogram
+from adguardhome.compression import CompressionCounters, decompress, encodings
+from adguardhome.fake import FakeAdGuardHome
+
+DATA = b'{"num_dns_queries": 666}' * 100
+
+
+@pytest.fixture
+def fake_options() -> dict[str, Any]:
+    """Return the options of a fake AdGuard Home that compresses responses."""
+    return {"compress": True, "payload_size": 500}
+
+
+def test_encodings() -> None:
+    """Test optional codings are only offered when a library is installed."""
+    assert encodings()[-2:] == ("gzip", "deflate")
+    with patch.dict("adguardhome.compression._modules", {"zstd": None, "br": None}):
+        assert encodings() == ("gzip", "deflate")
+
+
+@pytest.mark.parametrize(
+    ("coding", "data"),
+    [
+        ("gzip", gzip.compress(DATA)),
+        ("x-gzip", gzip.compress(DATA)),
+        ("deflate", zlib.compress(DATA)),
+        ("deflate", zlib.compress(DATA, wbits=-zlib.MAX_WBITS)),
+    ],
+)
+def test_decompress(coding: str, data: bytes) -> None:
+    """Test decompressing gzip and (raw) deflate bodies."""
+    assert decompress(data, coding) == DATA
+    assert decompress(data, coding, len(DATA)) == DATA
+    with pytest.raises(AdGuardHomeError, match="maximum size of 100 bytes"):
+        decompress(data, coding, 100)
+
+
+@pytest.mark.parametrize(
+    ("coding", "module"), [("br", "brotli"), ("zstd", "backports.zstd")]
+)
+def test_decompress_optional(coding: str, module: str) -> None:
+    """Test decompressing brotli and zstd bodies, when supported."""
+    data = pytest.importorskip(module).compress(DATA)
+    assert coding in encodings()
+    assert decompress(data, coding) == DATA
+    with pytest.raises(AdGuardHomeError, match="maximum size"):
+        decompress(data, coding, 100)
+
+
+@pytest.mark.parametrize("name", ["brotli", "brotlicffi"])
+def test_decompress_brotli_unlimited(name: str) -> None:
+    """Test br is not used with a maximum size, when it cannot be limited."""
+
+    class Decompressor:
+        """Decompressor of Brotli before 1.2.0, without an output limit."""
+
+        def process(self, data: bytes) -> bytes:
+            return data
+
+    module = ModuleType(name)
+    module.Decompressor = Decompressor  # type: ignore[attr-defined]
+    with patch.dict("adguardhome.compression._modules", {"br": module}):
+        assert "br" in encodings()
+        assert "br" not in encodings(limited=True)
+        assert decompress(DATA, "br") == DATA
+        with pytest.raises(AdGuardHomeError, match="Unsupported content encoding"):
+            decompress(DATA, "br", len(DATA))
+
+
+@pytest.mark.parametrize(
+    ("coding", "data", "message"),
+    [
+        ("compress", b"data", "Unsupported content encoding"),
+        ("gzip", b"not gzip", "Invalid gzip compressed response"),
+    ],
+)
+def test_decompress_invalid(coding: str, data: bytes, message: str) -> None:
+    """Test unsupported and invalid bodies raise an error."""
+    with pytest.raises(AdGuardHomeError, match=message):
+        decompress(data, coding)
+
+
+def test_counters() -> None:
+    """Test the savings of compression."""
+    assert CompressionCounters().savings == 0.0
+    counters = CompressionCounters(compressed_bytes=25, decompressed_bytes=100)
+    assert counters.savings == 0.75
+
+
+async def test_request_compression(fake: FakeAdGuardHome) -> None:
+    """Test responses of opted in endpoints are compressed and counted."""
+    histogram = LatencyHistogram()
+    async with fake.client(compression={"querylog"}, hooks=[histogram]) as adguard:
+        response = await adguard.request("querylog")
+        assert response["data"] == fake.querylog
+        await adguard.version()
+
+    assert list(adguard.compression_counters) == ["querylog"]
+    counters = adguard.compression_counters["querylog"]
+    assert counters.responses == 1
+    assert counters.compressed_bytes < counters.decompressed_bytes
+    assert counters.savings > 0.5
+    assert counters.decompress_time > 0
+
+    querylog = histogram.export()["GET querylog"]
+    assert querylog["response_bytes"] == counters.decompressed_bytes
+    assert "decompress" in querylog["phases"]
+    assert "decompress" not in histogram.export()["GET status"]["phases"]
+
+
+async def test_request_compression_all(fake: FakeAdGuardHome) -> None:
+    """Test compression can be enabled for all endpoints."""
+    fake.compress = False
+    async with fake.client(compression=True) as adguard:
+        assert await adguard.version() == fake.version
+        fake.fail("status", 503)
+        fake.compress = True
+        with pytest.raises(AdGuardHomeError) as error:
+            await adguard.version()
+
+    assert error.value.args == (503, {"message": "Injected error 503"})
+    counters = adguard.compression_counters["status"]
+    assert counters.responses == 2
+    assert counters.savings < 0.5
+
+
+async def test_request_compression_size(fake: FakeAdGuardHome) -> None:
+    """Test the size cap applies to the decompressed body."""
+    async with fake.client(compression=True, max_response_size=32768) as adguard:
+        with pytest.raises(AdGuardHomeError, match="Decompressed response"):
+            await adguard.request("querylog")
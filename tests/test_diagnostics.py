@@ -0,0 +1,118 @@
+"""Tests for `adguardhome.diagnostics`."""
+
+import logging
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+
+from adguardhome import AdGuardHomeError, SlowCallLog
+from adguardhome.diagnostics import format_phases
+from adguardhome.fake import FakeAdGuardHome
+
+
+def test_format_phases() -> None:
+    """Test phases are formatted in the order they happen."""
+    assert format_phases({"body": 0.0004, "connect": 0.0021, "ttfb": 0.0123}) == (
+        "connect=2.1ms ttfb=12.3ms body=0.4ms"
+    )
+    assert not format_phases({})
+
+
+async def test_slow_call_log(
+    fake: FakeAdGuardHome, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test slow requests are logged with their phases."""
+    slow_log = SlowCallLog(threshold=0.02)
+    async with fake.client(hooks=[slow_log]) as adguard:
+        await adguard.version()
+        fake.latency = 0.03
+        with caplog.at_level(logging.WARNING):
+            await adguard.stats.period()
+
+    assert len(caplog.records) == 1
+    message = caplog.records[0].getMessage()
+    assert message.startswith("Slow AdGuard Home request GET stats_info (status 200)")
+    assert "ttfb=" in message
+    # Nothing is captured without profiling
+    assert slow_log.slowest == []
+    assert not slow_log.dump()
+
+
+async def test_profile_slowest(fake: FakeAdGuardHome) -> None:
+    """Test profiles of the slowest requests are kept."""
+    slow_log = SlowCallLog(threshold=0.0, profile=True, keep=2, profile_lines=5)
+    async with fake.client(hooks=[slow_log]) as adguard:
+        for latency in (0.01, 0.03, 0.02, 0.0):
+            fake.latency = latency
+            await adguard.stats.period()
+        fake.fail("status", 500)
+        with pytest.raises(AdGuardHomeError):
+            await adguard.version()
+
+    slowest = slow_log.slowest
+    assert len(slowest) == 2
+    assert slowest[0].duration > slowest[1].duration >= 0.02
+    assert "cumulative" in (slowest[0].profile or "")
+    assert slowest[0].as_dict()["endpoint"] == "GET stats_info"
+
+    report = slow_log.dump()
+    assert report.startswith("GET stats_info (status 200) took")
+    assert "Phases: " in report
+
+    slow_log.clear()
+    assert slow_log.slowest == []
+
+
+async def test_memory(fake: FakeAdGuardHome) -> None:
+    """Test memory allocations of sampled requests are captured."""
+    slow_log = SlowCallLog(threshold=0.0, memory=True, sample_rate=0.999)
+    async with fake.client(hooks=[slow_log]) as adguard:
+        with patch.object(slow_log._random, "random", side_effect=[0.5, 0.9999]):
+            await adguard.version()
+            await adguard.version()
+
+    # Memory is only traced during the sampled requests
+    assert not tracemalloc.is_tracing()
+    (call,) = slow_log.slowest
+    assert call.profile is None
+    assert call.memory_peak
+    assert call.memory_top
+    assert "Memory peak: " in slow_log.dump()
+
+
+async def test_memory_busy(fake: FakeAdGuardHome) -> None:
+    """Test memory is not traced while tracemalloc is tracing already."""
+    slow_log = SlowCallLog(threshold=0.0, memory=True)
+    tracemalloc.start()
+    try:
+        async with fake.client(hooks=[slow_log]) as adguard:
+            await adguard.version()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+    (call,) = slow_log.slowest
+    assert call.memory_peak is None
+
+
+async def test_keep_none(fake: FakeAdGuardHome) -> None:
+    """Test slow requests are only logged when none are kept."""
+    slow_log = SlowCallLog(threshold=0.0, profile=True, memory=True, keep=0)
+    async with fake.client(hooks=[slow_log]) as adguard:
+        await adguard.version()
+
+    assert slow_log.slowest == []
+    assert not tracemalloc.is_tracing()
+
+
+async def test_profiler_busy(fake: FakeAdGuardHome) -> None:
+    """Test requests are not profiled while another profiler is active."""
+    slow_log = SlowCallLog(threshold=0.0, profile=True)
+    with patch("adguardhome.diagnostics.cProfile.Profile") as profile:
+        profile.return_value.enable.side_effect = ValueError
+        async with fake.client(hooks=[slow_log]) as adguard:
+            await adguard.version()
+
+    (call,) = slow_log.slowest
+    assert call.profile is None
@@ -0,0 +1,172 @@
+"""Tests for `adguardhome.fake`."""
+
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest
+
+from adguardhome import AdGuardHome, AdGuardHomeError, Client, RewriteRule
+from adguardhome.fake import FakeAdGuardHome
+
+
+@pytest.fixture
+def fake_options() -> dict[str, Any]:
+    """Return the options of the fake AdGuard Home."""
+    return {"payload_size": 25, "seed": 1}
+
+
+@pytest.fixture
+async def client(fake: FakeAdGuardHome) -> AsyncGenerator[AdGuardHome, None]:
+    """Yield an AdGuard Home client connected to the fake AdGuard Home."""
+    async with fake.client() as adguard:
+        yield adguard
+
+
+async def test_status(fake: FakeAdGuardHome, client: AdGuardHome) -> None:
+    """Test the status and protection endpoints."""
+    assert fake.url == f"http://127.0.0.1:{fake.port}/control"
+    assert await client.version() == "v0.107.50"
+    assert await client.protection_enabled()
+    await client.disable_protection(duration=60)
+    assert not await client.protection_enabled()
+    assert fake.requests["status"] == 3
+
+
+async def test_features(fake: FakeAdGuardHome, client: AdGuardHome) -> None:
+    """Test toggling all protection features."""
+    await client.set_features(
+        protection=False,
+        filtering=False,
+        parental=True,
+        safebrowsing=True,
+        safesearch=True,
+        querylog=False,
+    )
+    features = await client.features()
+    assert not features.protection
+    assert not features.filtering
+    assert features.parental
+    assert features.safebrowsing
+    assert features.safesearch
+    assert not features.querylog
+    assert fake.safesearch_enabled
+
+
+async def test_stats(fake: FakeAdGuardHome, client: AdGuardHome) -> None:
+    """Test the generated stats and resetting them."""
+    snapshot = await client.stats.snapshot()
+    assert len(snapshot.top_queried_domains) == 25
+    assert await client.stats.period() == 1
+    assert await client.stats.avg_processing_time() == 12.5
+
+    await client.stats.reset()
+    assert await client.stats.dns_queries() == 0
+    assert fake.stats["top_clients"] == []
+
+
+async def test_filtering(fake: FakeAdGuardHome, client: AdGuardHome) -> None:
+    """Test managing filter subscriptions."""
+    url = "https://example.com/list.txt"
+    await client.filtering.add_url(allowlist=False, name="List", url=url)
+    with pytest.raises(AdGuardHomeError):
+        await client.filtering.add_url(allowlist=False, name="List", url=url)
+    assert await client.filtering.rules_count(allowlist=False) == 100
+
+    await client.filtering.disable_url(allowlist=False, url=url)
+    assert not fake.filtering["filters"][0]["enabled"]
+    with pytest.raises(AdGuardHomeError):
+        await client.filtering.enable_url(allowlist=True, url=url)
+    await client.filtering.refresh(allowlist=False, force=True)
+    assert await client.filtering.interval(interval=7) == 7
+    assert await client.filtering.interval() == 7
+
+    await client.filtering.remove_url(allowlist=False, url=url)
+    assert await client.filtering.rules_count(allowlist=False) == 0
+
+
+async def test_clients(fake: FakeAdGuardHome, client: AdGuardHome) -> None:
+    """Test managing clients and finding them."""
+    kids = Client(name="Kids", ids=["192.168.1.30"])
+    result = await client.clients.sync([kids])
+    assert [item.action for item in result] == ["add"]
+    with pytest.raises(AdGuardHomeError):
+        await client.clients.add(kids)
+
+    await client.clients.update(Client(name="Kids", ids=["192.168.1.31"]))
+    found = await client.clients.find_many(["192.168.1.31", "192.168.1.99"])
+    assert found["192.168.1.31"] is not None
+    assert found["192.168.1.99"] is None
+    assert len(await client.clients.get_auto_clients()) == 25
+
+    await client.clients.delete("Kids")
+    assert fake.clients == []
+    with pytest.raises(AdGuardHomeError):
+        await client.clients.delete("Kids")
+    with pytest.raises(AdGuardHomeError):
+        await client.clients.update(kids)
+
+
+async def test_rewrites(fake: FakeAdGuardHome, client: AdGuardHome) -> None:
+    """Test managing DNS rewrite rules."""
+    rule = RewriteRule(domain="nas.lan", answer="192.168.1.2")
+    await client.rewrite.sync([rule])
+    with pytest.raises(AdGuardHomeError):
+        await client.rewrite.add("nas.lan", "192.168.1.2")
+
+    moved = RewriteRule(domain="nas.lan", answer="192.168.1.3")
+    await client.rewrite.update(rule, moved)
+    assert await client.rewrite.list_rules() == [moved]
+    with pytest.raises(AdGuardHomeError):
+        await client.rewrite.update(rule, moved)
+
+    await client.rewrite.delete("nas.lan", "192.168.1.3")
+    assert fake.rewrites == []
+    with pytest.raises(AdGuardHomeError):
+        await client.rewrite.delete("nas.lan", "192.168.1.3")
+
+
+async def test_querylog(fake: FakeAdGuardHome, client: AdGuardHome) -> None:
+    """Test paging through the query log."""
+    entries = await client.querylog.entries(limit=100, page_size=10)
+    assert entries == fake.querylog
+    assert fake.requests["querylog"] == 4
+
+    await client.querylog.interval(30)
+    assert await client.querylog.interval() == 30
+
+
+async def test_update(fake: FakeAdGuardHome, client: AdGuardHome) -> None:
+    """Test checking for and starting an update."""
+    assert (await client.update.update_available()).disabled
+    with pytest.raises(AdGuardHomeError):
+        await client.update.begin_update()
+
+    fake.update = {"disabled": False, "new_version": "v0.108.0"}
+    assert (await client.update.update_available()).new_version == "v0.108.0"
+    await client.update.begin_update()
+
+
+async def test_error_injection(fake: FakeAdGuardHome, client: AdGuardHome) -> None:
+    """Test injected errors and latency."""
+    fake.fail("/stats", 503, count=2)
+    for _ in range(2):
+        with pytest.raises(AdGuardHomeError) as error:
+            await client.stats.dns_queries()
+        assert error.value.args[0] == 503
+    assert await client.stats.dns_queries() == fake.stats["num_dns_queries"]
+
+    fake.error_rate = 1.0
+    fake.latency = 0.01
+    with pytest.raises(AdGuardHomeError):
+        await client.version()
+
+
+async def test_restart() -> None:
+    """Test starting and stopping the server multiple times."""
+    fake = FakeAdGuardHome(payload_size=0)
+    await fake.start()
+    await fake.start()
+    async with fake.client() as adguard:
+        assert await adguard.clients.get_auto_clients() == []
+    await fake.stop()
+    await fake.stop()
@@ -0,0 +1,157 @@
+"""Tests for `adguardhome.formats`."""
+
+import io
+
+from aioresponses import aioresponses
+
+from adguardhome import AdGuardHome, RewriteRule
+from adguardhome.formats import (
+    read_csv,
+    read_hosts,
+    read_zone,
+    write_csv,
+    write_hosts,
+    write_zone,
+)
+
+URL_LIST = "http://example.com:3000/control/rewrite/list"
+URL_ADD = "http://example.com:3000/control/rewrite/add"
+
+HOSTS = """\
+# Static hosts
+127.0.0.1   localhost
+192.168.1.10  nas.lan  files.lan   # storage
+fd00::10 nas6.lan
+
+not-an-ip broken.lan
+192.168.1.11
+"""
+
+ZONE = """\
+$ORIGIN lan.
+$TTL 3600
+@       IN  SOA ns.lan. admin.lan. (
+            2024010101 ; serial
+            3600 )
+        IN  NS  ns.lan.
+@       IN  A   192.168.1.1
+ns      1h  IN  A   192.168.1.2
+nas     IN  3600 AAAA fd00::10
+        A   192.168.1.10
+*.k8s   IN  A   192.168.1.20
+www     IN  CNAME nas
+mail    IN  CNAME mail.example.com.
+txt     IN  TXT "ignored"
+$ORIGIN example.org.
+api     A   10.0.0.1
+"""
+
+
+def test_read_hosts() -> None:
+    """Test reading rules from a hosts file."""
+    assert list(read_hosts(io.StringIO(HOSTS))) == [
+        RewriteRule("localhost", "127.0.0.1"),
+        RewriteRule("nas.lan", "192.168.1.10"),
+        RewriteRule("files.lan", "192.168.1.10"),
+        RewriteRule("nas6.lan", "fd00::10"),
+    ]
+
+
+def test_write_hosts() -> None:
+    """Test writing rules as a hosts file."""
+    assert list(
+        write_hosts(
+            [
+                RewriteRule("nas.lan", "192.168.1.10"),
+                RewriteRule("old.lan", "192.168.1.11", enabled=False),
+                RewriteRule("*.k8s.lan", "192.168.1.20"),
+                RewriteRule("www.lan", "nas.lan"),
+            ]
+        )
+    ) == ["192.168.1.10\tnas.lan\n", "# 192.168.1.11\told.lan\n"]
+
+
+def test_read_zone() -> None:
+    """Test reading rules from a zone file."""
+    assert list(read_zone(io.StringIO(ZONE))) == [
+        RewriteRule("lan", "192.168.1.1"),
+        RewriteRule("ns.lan", "192.168.1.2"),
+        RewriteRule("nas.lan", "fd00::10"),
+        RewriteRule("nas.lan", "192.168.1.10"),
+        RewriteRule("*.k8s.lan", "192.168.1.20"),
+        RewriteRule("www.lan", "nas.lan"),
+        RewriteRule("mail.lan", "mail.example.com"),
+        RewriteRule("api.example.org", "10.0.0.1"),
+    ]
+
+
+def test_read_zone_origin() -> None:
+    """Test reading a zone file with a given or without an origin."""
+    assert list(read_zone(["www A 10.0.0.1", "@ A 10.0.0.2"], origin="lan.")) == [
+        RewriteRule("www.lan", "10.0.0.1"),
+        RewriteRule("lan", "10.0.0.2"),
+    ]
+    assert list(read_zone(["  A 10.0.0.1", "www A 10.0.0.2"])) == [
+        RewriteRule("www", "10.0.0.2"),
+    ]
+
+
+def test_write_zone() -> None:
+    """Test writing rules as zone file records."""
+    rules = [
+        RewriteRule("lan", "192.168.1.1"),
+        RewriteRule("nas.lan", "fd00::10"),
+        RewriteRule("www.lan", "nas.lan"),
+        RewriteRule("other.org", "10.0.0.1"),
+        RewriteRule("old.lan", "10.0.0.2", enabled=False),
+        RewriteRule("typed.lan", "AAAA"),
+    ]
+
+    assert list(write_zone(rules, origin="lan")) == [
+        "$ORIGIN lan.\n",
+        "@\tIN\tA\t192.168.1.1\n",
+        "nas\tIN\tAAAA\tfd00::10\n",
+        "www\tIN\tCNAME\tnas.lan.\n",
+        "other.org.\tIN\tA\t10.0.0.1\n",
+    ]
+    assert list(read_zone(write_zone(rules, origin="lan"))) == rules[:4]
+    assert next(write_zone(rules)) == "lan.\tIN\tA\t192.168.1.1\n"
+
+
+def test_csv_round_trip() -> None:
+    """Test writing rules as CSV and reading them back."""
+    rules = [
+        RewriteRule("nas.lan", "192.168.1.10"),
+        RewriteRule("old,lan", "192.168.1.11", enabled=False),
+    ]
+
+    lines = list(write_csv(rules))
+
+    assert lines == [
+        "domain,answer,enabled\n",
+        "nas.lan,192.168.1.10,true\n",
+        '"old,lan",192.168.1.11,false\n',
+    ]
+    assert list(read_csv(lines)) == rules
+
+
+def test_read_csv_without_header() -> None:
+    """Test reading CSV without header and enabled column."""
+    assert list(read_csv(["nas.lan, 192.168.1.10", "", "broken"])) == [
+        RewriteRule("nas.lan", "192.168.1.10"),
+    ]
+
+
+async def test_import_into_sync(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+) -> None:
+    """Test imported rules feed directly into a rewrite sync."""
+    responses.get(URL_LIST, status=200, payload=[])
+    responses.post(
+        URL_ADD, status=200, body="OK", content_type="text/plain", repeat=True
+    )
+
+    results = await adguard.rewrite.sync(read_hosts(io.StringIO(HOSTS)))
+
+    assert [result.action for result in results] == ["add"] * 4
@@ -0,0 +1,158 @@
+"""Tests for `adguardhome.history`."""
+
+from pathlib import Path
+
+import pytest
+
+from adguardhome import AdGuardHomeStatsHistory
+from adguardhome.exceptions import AdGuardHomeError
+from adguardhome.stats import AdGuardHomeStatsSnapshot
+
+from .conftest import FixtureLoader
+
+RESOLUTIONS = ((60, 60), (3600, 2))
+
+
+def _snapshot(
+    queries: list[int], blocked: list[int] | None = None
+) -> AdGuardHomeStatsSnapshot:
+    """Return a stats snapshot with the given time-series."""
+    blocked = blocked or [0] * len(queries)
+    return AdGuardHomeStatsSnapshot.from_dict(
+        {
+            "num_dns_queries": sum(queries),
+            "num_blocked_filtering": sum(blocked),
+            "num_replaced_safebrowsing": 0,
+            "num_replaced_safesearch": 0,
+            "num_replaced_parental": 0,
+            "avg_processing_time": 0,
+            "dns_queries": queries,
+            "blocked_filtering": blocked,
+        }
+    )
+
+
+def test_record_and_consolidate() -> None:
+    """Test deltas are recorded and consolidated into coarser buckets."""
+    history = AdGuardHomeStatsHistory(RESOLUTIONS)
+
+    history.record(_snapshot([5, 7, 100], [0, 0, 10]), timestamp=3600)
+    assert history.series(60) == []
+
+    history.record(_snapshot([5, 7, 110], [0, 0, 12]), timestamp=3610)
+    history.record(_snapshot([5, 7, 125], [0, 0, 12]), timestamp=3650)
+    # The stats rolled over to the next hour bucket
+    history.record(_snapshot([7, 125, 5], [0, 12, 3]), timestamp=3700)
+
+    assert history.series(60) == [(3600, 25), (3660, 5)]
+    assert history.series(60, "blocked_filtering") == [(3600, 2), (3660, 3)]
+    assert history.series(3600) == [(3600, 30)]
+    assert history.series(3600, "blocked_filtering") == [(3600, 5)]
+    assert history.series(60, start=3660) == [(3660, 5)]
+    assert history.series(60, end=3600) == [(3600, 25)]
+
+
+def test_steady_traffic() -> None:
+    """Test steady traffic is recorded, while the rolling totals stay equal."""
+    history = AdGuardHomeStatsHistory(((60, 60), (3600, 24), (86400, 2)))
+    day = 86400
+    queries = [60, 60, 0]
+    history.record(_snapshot(queries), timestamp=day)
+    for minute in range(1, 121):
+        if minute % 60 == 0:
+            queries = [*queries[1:], 0]
+        queries[-1] += 1
+        history.record(_snapshot(queries), timestamp=day + minute * 60)
+
+    assert history.series(60)[-2:] == [(day + 7140, 1), (day + 7200, 1)]
+    assert history.series(3600) == [(day, 59), (day + 3600, 60), (day + 7200, 1)]
+    assert history.series(86400) == [(day, 120)]
+
+
+def test_ring_buffer_wraps() -> None:
+    """Test old buckets are overwritten once the ring buffer is full."""
+    history = AdGuardHomeStatsHistory(((60, 3),))
+    history.record(_snapshot([0]), timestamp=3600)
+    for minute in range(1, 6):
+        history.record(_snapshot([minute * 10]), timestamp=3600 + minute * 60)
+
+    assert history.series(60) == [(3780, 10), (3840, 10), (3900, 10)]
+
+
+def test_stats_reset() -> None:
+    """Test a reset of the stats is not recorded as a negative delta."""
+    history = AdGuardHomeStatsHistory(RESOLUTIONS)
+    history.record(_snapshot([0, 100]), timestamp=60)
+    history.record(_snapshot([0, 0]), timestamp=70)
+    history.record(_snapshot([0, 10]), timestamp=80)
+
+    assert history.series(60) == [(60, 10)]
+
+
+def test_record_default_timestamp(load_fixture: FixtureLoader) -> None:
+    """Test recording a snapshot at the current time."""
+    history = AdGuardHomeStatsHistory()
+    payload = load_fixture("stats")
+    history.record(AdGuardHomeStatsSnapshot.from_dict(payload))
+    payload["dns_queries"][-1] += 666
+    payload["replaced_parental"][-1] += 13
+    history.record(AdGuardHomeStatsSnapshot.from_dict(payload))
+
+    assert [value for _, value in history.series(86400)] == [666]
+    assert [value for _, value in history.series(60, "replaced_parental")] == [13]
+
+
+def test_persistence(tmp_path: Path) -> None:
+    """Test the history resumes from its memory-mapped file."""
+    path = tmp_path / "history.bin"
+    with AdGuardHomeStatsHistory(RESOLUTIONS, path=path) as history:
+        history.record(_snapshot([100]), timestamp=60)
+        history.record(_snapshot([150]), timestamp=70)
+        history.flush()
+
+    with AdGuardHomeStatsHistory(RESOLUTIONS, path=path) as history:
+        assert history.series(60) == [(60, 50)]
+        # The baseline is not persisted; it is set again after a restart
+        history.record(_snapshot([160]), timestamp=130)
+        history.record(_snapshot([170]), timestamp=140)
+        assert history.series(60) == [(60, 50), (120, 10)]
+
+
+def test_persistence_mismatch(tmp_path: Path) -> None:
+    """Test a history file with other resolutions is rejected."""
+    path = tmp_path / "history.bin"
+    AdGuardHomeStatsHistory(RESOLUTIONS, path=path).close()
+
+    with pytest.raises(AdGuardHomeError):
+        AdGuardHomeStatsHistory(((60, 3),), path=path)
+    with pytest.raises(AdGuardHomeError):
+        AdGuardHomeStatsHistory(((60, 60), (3600, 3)), path=path)
+
+    path.write_bytes(b"\0" * path.stat().st_size)
+    with pytest.raises(AdGuardHomeError):
+        AdGuardHomeStatsHistory(RESOLUTIONS, path=path)
+
+
+@pytest.mark.parametrize(
+    "resolutions",
+    [
+        (),
+        ((0, 10),),
+        ((60, 0),),
+        ((3600, 2), (60, 60)),
+        ((60, 60), (90, 2)),
+        ((60, 59), (3600, 2)),
+    ],
+)
+def test_invalid_resolutions(resolutions: tuple[tuple[int, int], ...]) -> None:
+    """Test invalid resolutions are rejected."""
+    with pytest.raises(AdGuardHomeError):
+        AdGuardHomeStatsHistory(resolutions)
+
+
+@pytest.mark.parametrize(("step", "field"), [(30, "dns_queries"), (60, "unknown")])
+def test_series_invalid(step: int, field: str) -> None:
+    """Test reading an unknown resolution or field."""
+    history = AdGuardHomeStatsHistory(RESOLUTIONS)
+    with pytest.raises(AdGuardHomeError):
+        history.series(step, field)
@@ -0,0 +1,151 @@
+"""Tests for `adguardhome.instrumentation`."""
+
+import json
+
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+
+from adguardhome import AdGuardHome, AdGuardHomeError, LatencyHistogram
+from adguardhome.fake import FakeAdGuardHome
+from adguardhome.instrumentation import RequestHooks, RequestInfo, trace_config
+
+URL_STATUS = "http://example.com:3000/control/status"
+
+
+class Recorder(RequestHooks):
+    """Hooks that record all calls."""
+
+    def __init__(self) -> None:
+        """Initialize the recorder."""
+        self.calls: list[tuple[str, RequestInfo]] = []
+
+    def on_request_start(self, info: RequestInfo) -> None:
+        """Record the start of a request."""
+        self.calls.append(("start", info))
+
+    def on_request_end(self, info: RequestInfo) -> None:
+        """Record the end of a request."""
+        self.calls.append(("end", info))
+
+    def on_request_error(self, info: RequestInfo) -> None:
+        """Record a failed request."""
+        self.calls.append(("error", info))
+
+
+async def test_hooks(responses: aioresponses, adguard: AdGuardHome) -> None:
+    """Test hooks are called with the details of a request."""
+    recorder = Recorder()
+    adguard.hooks.append(recorder)
+    responses.get(URL_STATUS, status=200, payload={"version": "v0.107.50"})
+
+    assert await adguard.version() == "v0.107.50"
+    assert [call for call, _ in recorder.calls] == ["start", "end"]
+    info = recorder.calls[-1][1]
+    assert info.endpoint == "GET status"
+    assert info.url == URL_STATUS
+    assert info.status == 200
+    assert info.response_bytes == len(json.dumps({"version": "v0.107.50"}))
+    assert set(info.phases) == {"ttfb", "body", "decode"}
+    assert info.duration >= sum(info.phases.values())
+    assert info.error is None
+
+
+async def test_hooks_error(responses: aioresponses, adguard: AdGuardHome) -> None:
+    """Test hooks are called when a request fails."""
+    recorder = Recorder()
+    adguard.hooks.append(recorder)
+    responses.get(URL_STATUS, status=502, body="Bad gateway", content_type="text/plain")
+    responses.get(URL_STATUS, exception=aiohttp.ClientError())
+
+    with pytest.raises(AdGuardHomeError):
+        await adguard.request("status")
+    with pytest.raises(AdGuardHomeError):
+        await adguard.request("status")
+
+    assert [call for call, _ in recorder.calls] == ["start", "error"] * 2
+    http_error, connection_error = recorder.calls[1][1], recorder.calls[3][1]
+    assert http_error.status == 502
+    assert http_error.response_bytes == len("Bad gateway")
+    assert isinstance(http_error.error, AdGuardHomeError)
+    assert connection_error.status is None
+
+
+async def test_hooks_text(responses: aioresponses) -> None:
+    """Test instrumenting a text response, from the constructor."""
+    recorder = Recorder()
+    responses.get(URL_STATUS, status=200, body="OK", content_type="text/plain")
+    async with AdGuardHome("example.com", hooks=[recorder]) as adguard:
+        assert await adguard.request("status") == {"message": "OK"}
+    assert recorder.calls[-1][1].response_bytes == 2
+
+
+async def test_base_hooks(responses: aioresponses, adguard: AdGuardHome) -> None:
+    """Test the base hooks do nothing."""
+    adguard.hooks.append(RequestHooks())
+    responses.get(URL_STATUS, status=200, payload={})
+    responses.get(URL_STATUS, status=500, payload={})
+    assert await adguard.request("status") == {}
+    with pytest.raises(AdGuardHomeError):
+        await adguard.request("status")
+
+
+async def test_trace_phases(fake: FakeAdGuardHome) -> None:
+    """Test connection phases are reported on a session of the client."""
+    recorder = Recorder()
+    async with fake.client(hooks=[recorder]) as adguard:
+        await adguard.rewrite.add("nas.lan", "192.168.1.2")
+        await adguard.rewrite.list_rules()
+
+    first, second = (info for call, info in recorder.calls if call == "end")
+    assert set(first.phases) == {"connect", "ttfb", "body", "decode"}
+    assert first.request_bytes > 0
+    # The pooled connection is reused for the second request
+    assert "connect" not in second.phases
+    assert second.request_bytes == 0
+
+
+async def test_trace_config_shared_session(fake: FakeAdGuardHome) -> None:
+    """Test the trace config on a shared session."""
+    recorder = Recorder()
+    async with aiohttp.ClientSession(trace_configs=[trace_config()]) as session:
+        adguard = fake.client(session=session, hooks=[recorder])
+        await adguard.version()
+        # Requests that are not instrumented are ignored
+        async with session.get(f"{fake.url}/status") as response:
+            assert response.status == 200
+
+    assert "connect" in recorder.calls[-1][1].phases
+
+
+async def test_latency_histogram(fake: FakeAdGuardHome) -> None:
+    """Test collecting latency histograms per endpoint."""
+    histogram = LatencyHistogram(buckets=[0.5, 0.001])
+    assert histogram.quantile("GET stats", 0.5) is None
+
+    fake.fail("stats", 500)
+    async with fake.client(hooks=[histogram]) as adguard:
+        for _ in range(3):
+            await adguard.stats.period()
+        fake.latency = 0.002
+        with pytest.raises(AdGuardHomeError):
+            await adguard.stats.dns_queries()
+        await adguard.stats.dns_queries()
+        fake.latency = 0.6
+        await adguard.version()
+
+    exported = histogram.export()
+    assert set(exported) == {"GET stats_info", "GET stats", "GET status"}
+    stats = exported["GET stats"]
+    assert stats["count"] == 2
+    assert stats["errors"] == 1
+    assert stats["buckets"] == {"0.001": 0, "0.5": 2, "+Inf": 2}
+    assert stats["response_bytes"] > 0
+    assert stats["sum"] >= stats["phases"]["ttfb"]
+    assert exported["GET stats_info"]["count"] == 3
+
+    assert histogram.quantile("GET stats", 0.99) == 0.5
+    assert histogram.quantile("GET status", 0.5) == float("inf")
+
+    histogram.reset()
+    assert histogram.export() == {}
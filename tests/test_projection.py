@@ -0,0 +1,103 @@
+"""Tests for `adguardhome.projection`."""
+
+import json
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+from aioresponses import aioresponses
+
+from adguardhome import AdGuardHome, AdGuardHomeError, projection
+from adguardhome.projection import backend, project
+
+from .conftest import FixtureLoader
+
+URL_STATS = "http://example.com:3000/control/stats"
+
+DOCUMENT = json.dumps(
+    {
+        "num_dns_queries": 666,
+        "top_clients": [{"192.168.1.2": 1}],
+        "nested": {"a/b": {"c~d": [1, {"e": None}]}, "f": "g"},
+    }
+).encode()
+
+
+@pytest.fixture(params=["simdjson", "json"])
+def backend_name(request: pytest.FixtureRequest) -> Iterator[str]:
+    """Run a test with every backend that is available."""
+    if request.param == "simdjson":
+        pytest.importorskip("simdjson")
+        yield request.param
+        return
+    with patch("adguardhome.projection.backend", return_value="json"):
+        yield request.param
+
+
+def test_backend() -> None:
+    """Test the backend falls back to json without simdjson."""
+    with (
+        patch.object(projection, "_simdjson", None),
+        patch("importlib.import_module", side_effect=ImportError),
+    ):
+        assert backend() == "json"
+
+
+@pytest.mark.usefixtures("backend_name")
+def test_project() -> None:
+    """Test only the requested fields are decoded."""
+    assert project(DOCUMENT, {"num_dns_queries", "nested.f", "missing.x"}) == {
+        "num_dns_queries": 666,
+        "nested": {"f": "g"},
+    }
+    assert project(DOCUMENT, ["top_clients", "nested.a/b.c~d"]) == {
+        "top_clients": [{"192.168.1.2": 1}],
+        "nested": {"a/b": {"c~d": [1, {"e": None}]}},
+    }
+    assert project(DOCUMENT, ["num_dns_queries.x", "nested.a/b"]) == {
+        "nested": {"a/b": {"c~d": [1, {"e": None}]}},
+    }
+    assert not project(DOCUMENT, [])
+
+
+@pytest.mark.usefixtures("backend_name")
+def test_project_array_indices() -> None:
+    """Test fields are not looked up in arrays, with either backend."""
+    fields = ["top_clients.0", "nested.a/b.c~d.1.e", "nested.a/b.c~d.0"]
+    assert not project(DOCUMENT, fields)
+
+
+@pytest.mark.usefixtures("backend_name")
+@pytest.mark.parametrize(
+    ("document", "message"),
+    [(b"[1, 2]", "JSON objects"), (b'{"a": ', "Invalid JSON")],
+)
+def test_project_invalid(document: bytes, message: str) -> None:
+    """Test invalid documents raise an error."""
+    with pytest.raises(AdGuardHomeError, match=message):
+        project(document, ["a"])
+
+
+def test_project_parser_in_use() -> None:
+    """Test a new parser is used when the shared one is still in use."""
+    simdjson = pytest.importorskip("simdjson")
+    backend()
+    document = projection._parser.parse(b'{"a": {"b": 1}}')
+    assert project(b'{"a": 2}', ["a"]) == {"a": 2}
+    assert document["a"]["b"] == 1
+    assert isinstance(projection._parser, simdjson.Parser)
+
+
+@pytest.mark.usefixtures("backend_name")
+async def test_request_fields(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+    load_fixture: FixtureLoader,
+) -> None:
+    """Test requests only decode the requested fields."""
+    responses.get(URL_STATS, status=200, payload=load_fixture("stats"))
+    responses.get(URL_STATS, status=200, body="", content_type="application/json")
+    assert await adguard.request("stats", fields={"num_dns_queries"}) == {
+        "num_dns_queries": 666
+    }
+    assert await adguard.request("stats", fields={"num_dns_queries"}) is None
@@ -1,11 +1,18 @@
 """Tests for `adguardhome.querylog`."""
 
+import re
+from datetime import UTC, datetime
+from typing import Any
+
 import pytest
 from aioresponses import CallbackResult, aioresponses
 
-from adguardhome import AdGuardHome
+from adguardhome import AdGuardHome, QueryLogFilter
 from adguardhome.exceptions import AdGuardHomeError
 
+from .conftest import FixtureLoader
+
+URL_QUERYLOG = re.compile(r"^http://example\.com:3000/control/querylog\?.*$")
 URL_INFO = "http://example.com:3000/control/querylog_info"
 URL_CONFIG = "http://example.com:3000/control/querylog_config"
 
@@ -106,3 +113,187 @@ async def test_interval_set_error(
 
     with pytest.raises(AdGuardHomeError):
         await adguard.querylog.interval(interval=1)
+
+
+@pytest.mark.parametrize(
+    ("query_filter", "expected"),
+    [
+        (QueryLogFilter(), {}),
+        (QueryLogFilter(clients=["192.168.1.10"]), {"search": "192.168.1.10"}),
+        (QueryLogFilter(clients=["a", "b"]), {}),
+        (QueryLogFilter(domain_suffixes=[".example.com"]), {"search": "example.com"}),
+        (QueryLogFilter(domain_suffixes=["example.com"], clients=["a"]), {}),
+        (QueryLogFilter(domain_suffixes=["a.com", "b.com"]), {}),
+        (
+            QueryLogFilter(search="tracker", clients=["a"]),
+            {"search": "tracker"},
+        ),
+        (
+            QueryLogFilter(response_status="blocked"),
+            {"response_status": "blocked"},
+        ),
+        (
+            QueryLogFilter(until=datetime(2024, 1, 15, tzinfo=UTC)),
+            {"older_than": "2024-01-15T00:00:00+00:00"},
+        ),
+    ],
+)
+def test_filter_params(query_filter: QueryLogFilter, expected: dict[str, str]) -> None:
+    """Test which criteria are pushed down to the server."""
+    assert query_filter.params() == expected
+
+
+@pytest.mark.parametrize(
+    ("query_filter", "expected"),
+    [
+        (QueryLogFilter(), [0, 1, 2]),
+        (QueryLogFilter(clients=["192.168.1.10"]), [0, 2]),
+        (QueryLogFilter(domain_suffixes=["example.com"]), [0, 2]),
+        (QueryLogFilter(domain_suffixes=["ads.tracker.io."]), [1]),
+        (QueryLogFilter(domain_suffixes=["ample.com"]), []),
+        (QueryLogFilter(reasons=["FilteredBlackList"]), [1]),
+        (QueryLogFilter(statuses=["NXDOMAIN"]), [2]),
+        (QueryLogFilter(upstreams=[""]), [1]),
+        (
+            QueryLogFilter(since=datetime(2024, 1, 15, 10, 30, tzinfo=UTC)),
+            [0, 1],
+        ),
+        (
+            QueryLogFilter(until=datetime(2024, 1, 15, 10, 30, 45, tzinfo=UTC)),
+            [1, 2],
+        ),
+        (QueryLogFilter(min_elapsed_ms=10), [0, 2]),
+        (QueryLogFilter(max_elapsed_ms=12.5), [0, 1]),
+        (QueryLogFilter(clients=["192.168.1.10"], min_elapsed_ms=20), [2]),
+    ],
+)
+def test_filter_compile(
+    load_fixture: FixtureLoader,
+    query_filter: QueryLogFilter,
+    expected: list[int],
+) -> None:
+    """Test the compiled client-side predicate."""
+    entries = load_fixture("querylog")["data"]
+    predicate = query_filter.compile()
+    assert [i for i, entry in enumerate(entries) if predicate(entry)] == expected
+
+
+async def test_entries(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+    load_fixture: FixtureLoader,
+) -> None:
+    """Test reading query log entries with pushed down criteria."""
+
+    def callback(url: Any, **_kwargs: object) -> CallbackResult:
+        assert url.query["search"] == "192.168.1.10"
+        assert url.query["response_status"] == "all"
+        assert url.query["limit"] == "500"
+        if "older_than" in url.query:
+            return CallbackResult(status=200, payload={"data": [], "oldest": ""})
+        return CallbackResult(status=200, payload=load_fixture("querylog"))
+
+    responses.get(URL_QUERYLOG, callback=callback, repeat=True)
+
+    result = await adguard.querylog.entries(
+        QueryLogFilter(
+            clients=["192.168.1.10"],
+            response_status="all",
+        )
+    )
+
+    assert [entry["question"]["name"] for entry in result] == [
+        "www.example.com",
+        "missing.example.com.",
+    ]
+
+
+async def test_entries_paging(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+    load_fixture: FixtureLoader,
+) -> None:
+    """Test query log pages are followed until the limit is reached."""
+    payload = load_fixture("querylog")
+    older_than: list[str | None] = []
+
+    def callback(url: Any, **_kwargs: object) -> CallbackResult:
+        older_than.append(url.query.get("older_than"))
+        return CallbackResult(status=200, payload=payload)
+
+    responses.get(URL_QUERYLOG, callback=callback, repeat=True)
+
+    result = await adguard.querylog.entries(limit=5, page_size=3)
+
+    assert len(result) == 5
+    assert older_than == [None, "2024-01-15T10:29:00.000000000Z"]
+
+
+async def test_entries_stops_at_since(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+    load_fixture: FixtureLoader,
+) -> None:
+    """Test paging stops once entries are older than the requested range."""
+    responses.get(URL_QUERYLOG, status=200, payload=load_fixture("querylog"))
+
+    result = await adguard.querylog.entries(
+        QueryLogFilter(since=datetime(2024, 1, 15, 10, 30, tzinfo=UTC)),
+        page_size=3,
+    )
+
+    assert len(result) == 2
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"data": [], "oldest": ""},
+        {"data": None},
+    ],
+)
+async def test_entries_empty(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+    payload: dict[str, Any],
+) -> None:
+    """Test reading an empty query log."""
+    responses.get(URL_QUERYLOG, status=200, payload=payload)
+    assert await adguard.querylog.entries() == []
+
+
+async def test_entries_short_pages(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+    load_fixture: FixtureLoader,
+) -> None:
+    """Test short pages of a filtered log are followed while `oldest` is set."""
+    payload = load_fixture("querylog")
+    pages = [
+        {"data": payload["data"][:1], "oldest": "2024-01-15T10:31:00Z"},
+        {"data": [], "oldest": "2024-01-15T10:30:00Z"},
+        {"data": payload["data"][1:2], "oldest": ""},
+    ]
+    older_than: list[str | None] = []
+
+    def callback(url: Any, **_kwargs: object) -> CallbackResult:
+        older_than.append(url.query.get("older_than"))
+        return CallbackResult(status=200, payload=pages[len(older_than) - 1])
+
+    responses.get(URL_QUERYLOG, callback=callback, repeat=True)
+
+    result = await adguard.querylog.entries(page_size=3)
+
+    assert result == payload["data"][:2]
+    assert older_than == [None, "2024-01-15T10:31:00Z", "2024-01-15T10:30:00Z"]
+
+
+def test_filter_naive_datetimes() -> None:
+    """Test naive datetimes of a filter are taken to be in UTC."""
+    query_filter = QueryLogFilter(
+        since=datetime(2024, 1, 15, 10, 30),  # noqa: DTZ001
+        until=datetime(2024, 1, 15, 11, 0),  # noqa: DTZ001
+    )
+    assert query_filter.since == datetime(2024, 1, 15, 10, 30, tzinfo=UTC)
+    assert query_filter.params() == {"older_than": "2024-01-15T11:00:00+00:00"}
+    assert query_filter.compile()({"time": "2024-01-15T10:45:00Z"})
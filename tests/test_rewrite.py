@@ -1,10 +1,12 @@
 """Tests for `adguardhome.rewrite`."""
 
+from typing import Any
+
 import pytest
 from aioresponses import CallbackResult, aioresponses
 from syrupy.assertion import SnapshotAssertion
 
-from adguardhome import AdGuardHome, RewriteRule
+from adguardhome import AdGuardHome, RewriteResolver, RewriteRule
 from adguardhome.exceptions import AdGuardHomeError
 
 from .conftest import FixtureLoader
@@ -12,6 +14,7 @@ from .conftest import FixtureLoader
 URL_LIST = "http://example.com:3000/control/rewrite/list"
 URL_ADD = "http://example.com:3000/control/rewrite/add"
 URL_DELETE = "http://example.com:3000/control/rewrite/delete"
+URL_UPDATE = "http://example.com:3000/control/rewrite/update"
 
 
 async def test_list_rules(
@@ -107,3 +110,275 @@ async def test_delete_error(
     responses.post(URL_DELETE, status=status, body="Error", content_type="text/plain")
     with pytest.raises(AdGuardHomeError):
         await adguard.rewrite.delete("*.example.com", "192.168.1.2")
+
+
+async def test_add_disabled(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+) -> None:
+    """Test adding a disabled DNS rewrite rule."""
+
+    def callback(_url: str, **kwargs: object) -> CallbackResult:
+        assert kwargs["json"] == {
+            "domain": "*.example.com",
+            "answer": "192.168.1.2",
+            "enabled": False,
+        }
+        return CallbackResult(status=200, content_type="text/plain")
+
+    responses.post(URL_ADD, callback=callback)
+    await adguard.rewrite.add("*.example.com", "192.168.1.2", enabled=False)
+
+
+async def test_update(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+) -> None:
+    """Test updating a DNS rewrite rule in place."""
+
+    def callback(_url: str, **kwargs: object) -> CallbackResult:
+        assert kwargs["json"] == {
+            "target": {
+                "domain": "example.com",
+                "answer": "192.168.1.2",
+                "enabled": True,
+            },
+            "update": {
+                "domain": "example.com",
+                "answer": "192.168.1.3",
+                "enabled": True,
+            },
+        }
+        return CallbackResult(status=200, content_type="text/plain")
+
+    responses.post(URL_UPDATE, callback=callback)
+    await adguard.rewrite.update(
+        RewriteRule("example.com", "192.168.1.2"),
+        RewriteRule("example.com", "192.168.1.3"),
+    )
+
+
+@pytest.mark.parametrize("status", [400, 500])
+async def test_update_error(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+    status: int,
+) -> None:
+    """Test updating a DNS rewrite rule fails on HTTP error."""
+    responses.post(URL_UPDATE, status=status, body="Error", content_type="text/plain")
+    with pytest.raises(AdGuardHomeError):
+        await adguard.rewrite.update(
+            RewriteRule("example.com", "192.168.1.2"),
+            RewriteRule("example.com", "192.168.1.3"),
+        )
+
+
+async def test_sync(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+) -> None:
+    """Test syncing rules with minimal writes."""
+    responses.get(
+        URL_LIST,
+        status=200,
+        payload=[
+            {"domain": "same.lan", "answer": "10.0.0.1", "enabled": True},
+            {"domain": "moved.lan", "answer": "10.0.0.2", "enabled": True},
+            {"domain": "toggled.lan", "answer": "10.0.0.3", "enabled": True},
+            {"domain": "gone.lan", "answer": "10.0.0.4", "enabled": True},
+            {"domain": "dual.lan", "answer": "10.0.0.5", "enabled": True},
+        ],
+    )
+    writes: list[tuple[str, object]] = []
+
+    def callback(url: Any, **kwargs: object) -> CallbackResult:
+        writes.append((url.path.rsplit("/", 1)[-1], kwargs["json"]))
+        return CallbackResult(status=200, content_type="text/plain")
+
+    responses.post(URL_ADD, callback=callback, repeat=True)
+    responses.post(URL_UPDATE, callback=callback, repeat=True)
+    responses.post(URL_DELETE, callback=callback, repeat=True)
+
+    results = await adguard.rewrite.sync(
+        [
+            RewriteRule("same.lan", "10.0.0.1"),
+            RewriteRule("same.lan", "10.0.0.1"),
+            RewriteRule("moved.lan", "10.0.1.2"),
+            RewriteRule("toggled.lan", "10.0.0.3", enabled=False),
+            RewriteRule("dual.lan", "10.0.0.5"),
+            RewriteRule("dual.lan", "fd00::5"),
+            RewriteRule("new.lan", "10.0.0.6"),
+        ]
+    )
+
+    assert [(result.rule.domain, result.action) for result in results] == [
+        ("same.lan", "unchanged"),
+        ("dual.lan", "unchanged"),
+        ("moved.lan", "update"),
+        ("toggled.lan", "update"),
+        ("dual.lan", "add"),
+        ("new.lan", "add"),
+        ("gone.lan", "delete"),
+    ]
+    assert all(result.success for result in results)
+    assert sorted(writes, key=str) == sorted(
+        [
+            (
+                "update",
+                {
+                    "target": {
+                        "domain": "moved.lan",
+                        "answer": "10.0.0.2",
+                        "enabled": True,
+                    },
+                    "update": {
+                        "domain": "moved.lan",
+                        "answer": "10.0.1.2",
+                        "enabled": True,
+                    },
+                },
+            ),
+            (
+                "update",
+                {
+                    "target": {
+                        "domain": "toggled.lan",
+                        "answer": "10.0.0.3",
+                        "enabled": True,
+                    },
+                    "update": {
+                        "domain": "toggled.lan",
+                        "answer": "10.0.0.3",
+                        "enabled": False,
+                    },
+                },
+            ),
+            ("add", {"domain": "dual.lan", "answer": "fd00::5", "enabled": True}),
+            ("add", {"domain": "new.lan", "answer": "10.0.0.6", "enabled": True}),
+            ("delete", {"domain": "gone.lan", "answer": "10.0.0.4"}),
+        ],
+        key=str,
+    )
+
+
+async def test_sync_without_delete(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+    load_fixture: FixtureLoader,
+) -> None:
+    """Test syncing without deleting still updates changed answers."""
+    responses.get(URL_LIST, status=200, payload=load_fixture("rewrite_list"))
+    responses.post(URL_UPDATE, status=200, body="OK", content_type="text/plain")
+    responses.post(URL_ADD, status=500, body="Error", content_type="text/plain")
+
+    results = await adguard.rewrite.sync(
+        [
+            RewriteRule("ads.tracker.io", "0.0.0.0"),  # noqa: S104
+            RewriteRule("nas.lan", "192.168.1.10"),
+        ],
+        delete=False,
+    )
+
+    # The rule of *.example.com is kept, instead of being deleted
+    assert [(result.rule.domain, result.action) for result in results] == [
+        ("ads.tracker.io", "update"),
+        ("nas.lan", "add"),
+    ]
+    assert results[0].success
+    assert not results[1].success
+    assert isinstance(results[1].error, AdGuardHomeError)
+
+
+async def test_sync_unchanged(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+) -> None:
+    """Test a no-op sync of many rules costs a single request."""
+    payload = [
+        {"domain": f"host{i}.lan", "answer": f"10.0.{i // 256}.{i % 256}"}
+        for i in range(5000)
+    ]
+    responses.get(URL_LIST, status=200, payload=payload)
+
+    results = await adguard.rewrite.sync(RewriteRule(**rule) for rule in payload)
+
+    assert len(responses.requests) == 1
+    assert len(results) == 5000
+    assert {result.action for result in results} == {"unchanged"}
+
+
+def test_resolver() -> None:
+    """Test resolving hosts with AdGuard Home rewrite semantics."""
+    resolver = RewriteResolver(
+        [
+            RewriteRule("example.com", "10.0.0.1"),
+            RewriteRule("*.example.com", "10.0.0.2"),
+            RewriteRule("*.sub.example.com", "10.0.0.3"),
+            RewriteRule("*.sub.example.com", "fd00::3"),
+            RewriteRule("disabled.example.com", "10.0.0.4", enabled=False),
+            RewriteRule("Mixed.Case.LAN.", "10.0.0.5"),
+        ]
+    )
+
+    def answers(host: str) -> list[str]:
+        return [rule.answer for rule in resolver.resolve(host)]
+
+    assert answers("example.com") == ["10.0.0.1"]
+    assert answers("www.example.com") == ["10.0.0.2"]
+    assert answers("a.b.example.com") == ["10.0.0.2"]
+    assert answers("sub.example.com") == ["10.0.0.2"]
+    assert answers("x.sub.example.com") == ["10.0.0.3", "fd00::3"]
+    assert answers("WWW.Example.COM.") == ["10.0.0.2"]
+    assert answers("disabled.example.com") == ["10.0.0.2"]
+    assert answers("mixed.case.lan") == ["10.0.0.5"]
+    assert answers("example.org") == []
+    assert answers("com") == []
+
+
+def test_resolver_chain() -> None:
+    """Test CNAME-style answers are followed to their rewrites."""
+    resolver = RewriteResolver(
+        [
+            RewriteRule("www.lan", "web.lan"),
+            RewriteRule("web.lan", "*.hosts.lan"),
+            RewriteRule("*.hosts.lan", "10.0.0.10"),
+            RewriteRule("external.lan", "example.org"),
+            RewriteRule("loop-a.lan", "loop-b.lan"),
+            RewriteRule("loop-b.lan", "loop-a.lan"),
+            RewriteRule("typed.lan", "A"),
+        ]
+    )
+
+    assert [rule.answer for rule in resolver.resolve_chain("www.lan")] == [
+        "web.lan",
+        "*.hosts.lan",
+        "10.0.0.10",
+    ]
+    assert [rule.answer for rule in resolver.resolve_chain("www.lan", 1)] == [
+        "web.lan",
+        "*.hosts.lan",
+    ]
+    assert [rule.answer for rule in resolver.resolve_chain("external.lan")] == [
+        "example.org"
+    ]
+    assert [rule.answer for rule in resolver.resolve_chain("loop-a.lan")] == [
+        "loop-b.lan",
+        "loop-a.lan",
+    ]
+    assert [rule.answer for rule in resolver.resolve_chain("typed.lan")] == ["A"]
+    assert resolver.resolve_chain("unknown.lan") == []
+
+
+def test_resolver_large() -> None:
+    """Test resolving against a large set of rules."""
+    resolver = RewriteResolver(
+        [
+            RewriteRule(f"host{i}.lan", f"10.0.{i // 256}.{i % 256}")
+            for i in range(50000)
+        ]
+        + [RewriteRule(f"*.zone{i}.lan", "10.1.0.1") for i in range(50000)]
+    )
+
+    assert resolver.resolve("host12345.lan")[0].answer == "10.0.48.57"
+    assert resolver.resolve("a.b.zone49999.lan")[0].domain == "*.zone49999.lan"
+    assert resolver.resolve("zone1.lan") == []
@@ -1,12 +1,21 @@
 """Tests for `adguardhome.stats`."""
 
+import asyncio
+from array import array
+from collections.abc import Iterator
 from typing import Any
+from unittest.mock import patch
 
 import pytest
 from aioresponses import aioresponses
 
 from adguardhome import AdGuardHome
 from adguardhome.exceptions import AdGuardHomeError
+from adguardhome.stats import (
+    AdGuardHomeStatsDelta,
+    AdGuardHomeStatsPoller,
+    AdGuardHomeStatsSnapshot,
+)
 
 from .conftest import FixtureLoader
 
@@ -15,6 +24,17 @@ URL_STATS_INFO = "http://example.com:3000/control/stats_info"
 URL_STATS_RESET = "http://example.com:3000/control/stats_reset"
 
 
+@pytest.fixture(params=["numpy", "stdlib"])
+def vectorized(request: pytest.FixtureRequest) -> Iterator[None]:
+    """Run time-series computations with NumPy, and with the standard library."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        yield
+        return
+    with patch("adguardhome.stats._numpy", return_value=None):
+        yield
+
+
 async def test_dns_queries(
     responses: aioresponses,
     adguard: AdGuardHome,
@@ -118,3 +138,233 @@ async def test_reset_error(
     )
     with pytest.raises(AdGuardHomeError):
         await adguard.stats.reset()
+
+
+async def test_snapshot(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+    load_fixture: FixtureLoader,
+) -> None:
+    """Test requesting a full stats snapshot."""
+    responses.get(URL_STATS, status=200, payload=load_fixture("stats"))
+
+    snapshot = await adguard.stats.snapshot()
+
+    assert snapshot.time_units == "hours"
+    assert snapshot.bucket_seconds == 3600
+    assert snapshot.num_dns_queries == 666
+    assert snapshot.avg_processing_time == pytest.approx(31.41)
+    assert snapshot.dns_queries == array("q", [0, 3600, 7200, 3600])
+    assert snapshot.replaced_parental == array("q", [0, 0, 2, 0])
+    assert snapshot.top_queried_domains == (("example.com", 120), ("example.org", 42))
+    assert snapshot.top_blocked_domains == (("ads.tracker.io", 88),)
+    assert snapshot.top_clients[0] == ("192.168.1.10", 300)
+    assert snapshot.top_upstreams_avg_time == (
+        ("https://dns.quad9.net:443/dns-query", 0.0125),
+    )
+
+
+@pytest.mark.usefixtures("vectorized")
+def test_snapshot_minimal() -> None:
+    """Test a stats snapshot from a response without series and top lists."""
+    snapshot = AdGuardHomeStatsSnapshot.from_dict(
+        {
+            "num_dns_queries": 0,
+            "num_blocked_filtering": 0,
+            "num_replaced_safebrowsing": 0,
+            "num_replaced_safesearch": 0,
+            "num_replaced_parental": 0,
+            "avg_processing_time": 0,
+            "time_units": "days",
+            "dns_queries": None,
+        }
+    )
+
+    assert snapshot.bucket_seconds == 86400
+    assert snapshot.dns_queries == array("q")
+    assert snapshot.top_clients == ()
+    assert snapshot.blocked_percentage == 0.0
+    assert snapshot.rates() == array("d")
+    assert snapshot.blocked_ratio() == array("d")
+    assert snapshot.moving_average(3) == array("d")
+
+
+@pytest.mark.usefixtures("vectorized")
+def test_snapshot_derived_series(load_fixture: FixtureLoader) -> None:
+    """Test the derived per-bucket helpers of a stats snapshot."""
+    snapshot = AdGuardHomeStatsSnapshot.from_dict(load_fixture("stats"))
+
+    assert snapshot.blocked_percentage == pytest.approx(200.75, abs=0.01)
+    assert snapshot.rates() == array("d", [0.0, 1.0, 2.0, 1.0])
+    assert snapshot.rates(snapshot.blocked_filtering) == array(
+        "d", [0.0, 0.1, 1.0, 0.0]
+    )
+    assert snapshot.blocked_ratio() == array("d", [0.0, 0.1, 0.5, 0.0])
+    assert snapshot.moving_average(2) == array("d", [0.0, 1800.0, 5400.0, 5400.0])
+    assert snapshot.moving_average(1, snapshot.replaced_parental) == array(
+        "d", [0.0, 0.0, 2.0, 0.0]
+    )
+
+
+def test_snapshot_moving_average_invalid_window(load_fixture: FixtureLoader) -> None:
+    """Test the moving average rejects empty windows."""
+    snapshot = AdGuardHomeStatsSnapshot.from_dict(load_fixture("stats"))
+    with pytest.raises(AdGuardHomeError):
+        snapshot.moving_average(0)
+
+
+def _stats_payload(queries: list[int], blocked: list[int]) -> dict[str, Any]:
+    """Return a minimal stats payload with the given time-series."""
+    return {
+        "num_dns_queries": sum(queries),
+        "num_blocked_filtering": sum(blocked),
+        "num_replaced_safebrowsing": 0,
+        "num_replaced_safesearch": 0,
+        "num_replaced_parental": 0,
+        "avg_processing_time": 0.01,
+        "dns_queries": queries,
+        "blocked_filtering": blocked,
+    }
+
+
+@pytest.mark.parametrize(
+    ("previous", "current", "expected"),
+    [
+        ([10, 20, 5], [10, 20, 9], 4),
+        # Rolled over once; the rolling total went down from 35 to 31
+        ([10, 20, 5], [20, 10, 1], 6),
+        ([10, 20, 5], [5, 3, 2], 5),
+        ([10, 20, 5], [0, 0, 0], 0),
+        ([10, 20, 5], [0, 0, 7], 7),
+        ([10, 20, 5], [20, 5], 0),
+        ([], [], 0),
+    ],
+)
+def test_delta_from_series(
+    previous: list[int], current: list[int], expected: int
+) -> None:
+    """Test deltas are taken from the newest buckets of the time-series."""
+    delta = AdGuardHomeStatsDelta.between(
+        AdGuardHomeStatsSnapshot.from_dict(_stats_payload(previous, previous)),
+        AdGuardHomeStatsSnapshot.from_dict(_stats_payload(current, current)),
+        10.0,
+    )
+    assert delta.dns_queries == expected
+    assert delta.blocked_filtering == expected
+
+
+async def test_poller(responses: aioresponses, adguard: AdGuardHome) -> None:
+    """Test the poller emits deltas, rates and backs off when idle."""
+    for payload in (
+        _stats_payload([5, 100], [0, 10]),
+        _stats_payload([5, 150], [0, 30]),
+        _stats_payload([5, 150], [0, 30]),
+        _stats_payload([5, 150], [0, 30]),
+        _stats_payload([150, 0], [30, 10]),
+        _stats_payload([150, 80], [30, 10]),
+    ):
+        responses.get(URL_STATS, status=200, payload=payload)
+
+    poller = adguard.stats.poller(interval=10, max_interval=30, jitter=0)
+    deltas: list[AdGuardHomeStatsDelta] = []
+    unsubscribe = poller.subscribe(deltas.append)
+
+    with patch("adguardhome.stats.monotonic", side_effect=[0, 10, 20, 30, 40, 50]):
+        first = await poller.poll()
+        assert first is not None
+        assert first.previous is None
+        assert first.queries_per_second == 0.0
+        assert first.blocked_per_second == 0.0
+        assert poller.next_delay() == 10
+
+        second = await poller.poll()
+        assert second is not None
+        assert second.dns_queries == 50
+        assert second.blocked_filtering == 20
+        assert second.queries_per_second == 5.0
+        assert second.blocked_per_second == 2.0
+        assert poller.current_interval == 10
+
+        assert await poller.poll() is None
+        assert poller.current_interval == 20
+        assert await poller.poll() is None
+        assert poller.current_interval == 30
+
+        # Buckets that rolled over are not counted again
+        shrunk = await poller.poll()
+        assert shrunk is not None
+        assert shrunk.dns_queries == 0
+        assert shrunk.blocked_filtering == 10
+        assert poller.current_interval == 30
+
+        unsubscribe()
+        resumed = await poller.poll()
+        assert resumed is not None
+        assert resumed.dns_queries == 80
+        assert poller.current_interval == 10
+
+    assert deltas == [first, second, shrunk]
+    assert poller.snapshot is not None
+    assert poller.snapshot.num_dns_queries == 230
+
+
+def test_poller_jitter(adguard: AdGuardHome) -> None:
+    """Test the poll delay is jittered around the interval."""
+    poller = adguard.stats.poller(interval=10, jitter=0.5)
+    delays = {poller.next_delay() for _ in range(20)}
+    assert all(5 <= delay <= 15 for delay in delays)
+    assert len(delays) > 1
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"interval": 0},
+        {"interval": 10, "max_interval": 5},
+        {"backoff": 0.5},
+        {"jitter": 1},
+    ],
+)
+def test_poller_invalid(adguard: AdGuardHome, kwargs: dict[str, float]) -> None:
+    """Test invalid poller configurations are rejected."""
+    with pytest.raises(AdGuardHomeError):
+        AdGuardHomeStatsPoller(adguard, **kwargs)
+
+
+async def test_poller_run(responses: aioresponses, adguard: AdGuardHome) -> None:
+    """Test the poller keeps polling until cancelled."""
+    responses.get(URL_STATS, status=200, payload=_stats_payload([1], [0]), repeat=True)
+    poller = adguard.stats.poller(interval=0.01, jitter=0)
+    polled = asyncio.Event()
+    poller.subscribe(lambda _delta: polled.set())
+
+    task = asyncio.create_task(poller.run())
+    await asyncio.wait_for(polled.wait(), timeout=1)
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert poller.current_interval > 0.01
+
+
+async def test_poller_run_errors(
+    responses: aioresponses,
+    adguard: AdGuardHome,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test the poller backs off and keeps polling when polls fail."""
+    responses.get(URL_STATS, status=502, body="Bad gateway", content_type="text/plain")
+    responses.get(URL_STATS, status=200, payload=_stats_payload([1], [0]), repeat=True)
+    poller = adguard.stats.poller(interval=0.01, jitter=0)
+    polled = asyncio.Event()
+    poller.subscribe(lambda _delta: polled.set())
+
+    task = asyncio.create_task(poller.run())
+    await asyncio.wait_for(polled.wait(), timeout=1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert "Polling AdGuard Home stats failed" in caplog.text
+    assert poller.snapshot is not None
@@ -0,0 +1,191 @@
+"""Tests for `adguardhome.streaming`."""
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from adguardhome import AdGuardHome, AdGuardHomeConnectionError, AdGuardHomeError
+from adguardhome.fake import FakeAdGuardHome
+from adguardhome.streaming import JSONArrayParser
+
+DOCUMENT = {
+    "meta": {"data": [0], "note": 'a "quoted" [string], {x}'},
+    "data": [
+        {"name": "a\\b", "tags": ["x", "y"], "nested": {"data": []}},
+        1,
+        "two",
+        None,
+        [3, [4]],
+        {},
+    ],
+    "oldest": "",
+}
+
+
+@pytest.fixture
+def fake_options() -> dict[str, Any]:
+    """Return the options of the fake AdGuard Home."""
+    return {"payload_size": 500}
+
+
+def parse(document: bytes, path: tuple[str, ...], size: int) -> list[object]:
+    """Parse a document fed in chunks of a size."""
+    parser = JSONArrayParser(path)
+    elements = []
+    for index in range(0, len(document), size):
+        elements.extend(parser.feed(document[index : index + size]))
+    parser.close()
+    return elements
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 1024])
+def test_parser(size: int) -> None:
+    """Test elements are parsed regardless of where chunks are split."""
+    document = json.dumps(DOCUMENT).encode()
+    assert parse(document, ("data",), size) == DOCUMENT["data"]
+    assert parse(document, ("meta", "data"), size) == [0]
+    assert parse(b'[1, {"a": [2]}, "]"]', (), size) == [1, {"a": [2]}, "]"]
+    assert parse(b'{"data": []}', ("data",), size) == []
+    with pytest.raises(AdGuardHomeError, match="No JSON array at data"):
+        parse(b'{"other": [1]}', ("data",), size)
+    # The array is only matched inside the objects of the path
+    document = b'{"a": {"x": 1}, "c": {"b": [1, 2]}, "b": [3]}'
+    with pytest.raises(AdGuardHomeError, match=r"No JSON array at a\.b"):
+        parse(document, ("a", "b"), size)
+    document = b'{"a": {"x": {"b": [1]}}, "a2": 1, "a": {"b": [2]}}'
+    assert parse(document, ("a", "b"), size) == [2]
+    with pytest.raises(AdGuardHomeError, match="No JSON array at the top level"):
+        parse(b"42", (), size)
+
+
+def test_parser_done() -> None:
+    """Test the rest of the document is ignored after the array."""
+    parser = JSONArrayParser(["data"])
+    assert parser.feed(b'{"data": [1, 2], "x') == [1, 2]
+    assert parser.done
+    assert parser.feed(b'": 3}') == []
+
+
+@pytest.mark.parametrize(
+    ("document", "path"),
+    [
+        (b'{"data": {"a": 1}}', ("data",)),
+        (b'{"data": [1, tru]}', ("data",)),
+        (b"]", ("data",)),
+    ],
+)
+def test_parser_invalid(document: bytes, path: tuple[str, ...]) -> None:
+    """Test invalid documents raise an error."""
+    with pytest.raises(AdGuardHomeError):
+        JSONArrayParser(path).feed(document)
+
+
+def test_parser_truncated() -> None:
+    """Test a document that ends inside the array raises an error."""
+    parser = JSONArrayParser(["data"])
+    assert parser.feed(b'{"data": [1, 2') == [1]
+    with pytest.raises(AdGuardHomeError, match="ended inside the array"):
+        parser.close()
+
+
+async def test_stream(fake: FakeAdGuardHome) -> None:
+    """Test elements of huge responses are streamed."""
+    async with fake.client() as adguard:
+        entries = [
+            entry
+            async for entry in adguard.stream(
+                "querylog", "data", params={"limit": "500"}, chunk_size=512
+            )
+        ]
+        assert entries == fake.querylog
+
+        clients = [client async for client in adguard.stream("clients", "auto_clients")]
+        assert clients == fake.auto_clients
+        with pytest.raises(AdGuardHomeError, match="No JSON array at missing"):
+            _ = [item async for item in adguard.stream("clients", "missing")]
+
+        stream = adguard.stream("stats", ["top_queried_domains"])
+        assert await anext(stream) == {"host-0.example": 500}
+        await stream.aclose()
+
+        fake.fail("stats", 500)
+        with pytest.raises(AdGuardHomeError):
+            await anext(adguard.stream("stats", "top_queried_domains"))
+
+
+async def test_max_response_size(fake: FakeAdGuardHome) -> None:
+    """Test responses over the size cap raise an error."""
+    async with fake.client(max_response_size=4096) as adguard:
+        assert await adguard.version() == fake.version
+        with pytest.raises(AdGuardHomeError, match="maximum size of 4096 bytes"):
+            await adguard.request("querylog")
+        with pytest.raises(AdGuardHomeError, match="maximum size"):
+            async for _ in adguard.stream("querylog", "data", chunk_size=512):
+                pass
+        fake.fail("status", 500)
+        with pytest.raises(AdGuardHomeError) as error:
+            await adguard.version()
+        assert error.value.args[0] == 500
+
+
+async def test_max_response_size_chunked() -> None:
+    """Test the size cap applies to responses without a content length."""
+
+    async def handler(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(
+            headers={"Content-Type": "text/plain; charset=utf-8"}
+        )
+        await response.prepare(request)
+        for _ in range(8):
+            await response.write(b"x" * 512)
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get("/control/test", handler)
+    async with TestServer(app) as server:
+        adguard = AdGuardHome(server.host, port=server.port, max_response_size=4096)
+        async with adguard:
+            assert await adguard.request("test") == {"message": "x" * 4096}
+            adguard.max_response_size = 4095
+            with pytest.raises(AdGuardHomeError, match="maximum size"):
+                await adguard.request("test")
+
+
+async def test_stream_errors() -> None:
+    """Test streams that stall, break or end too soon raise an error."""
+
+    async def handler(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "application/json"})
+        await response.prepare(request)
+        await response.write(b'{"data": [1, 2, ')
+        if request.path.endswith("stall"):
+            await asyncio.sleep(1)
+        elif request.path.endswith("break"):
+            msg = "Broken stream"
+            raise RuntimeError(msg)
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get("/control/{name}", handler)
+    async with TestServer(app) as server:
+        adguard = AdGuardHome(server.host, port=server.port, request_timeout=0.1)
+        async with adguard:
+            stream = adguard.stream("stall", "data")
+            assert await anext(stream) == 1
+            assert await anext(stream) == 2
+            with pytest.raises(AdGuardHomeConnectionError, match="Timeout"):
+                await anext(stream)
+
+            with pytest.raises(AdGuardHomeConnectionError, match="communicating"):
+                async for _ in adguard.stream("break", "data"):
+                    pass
+
+            with pytest.raises(AdGuardHomeError, match="ended inside the array"):
+                async for _ in adguard.stream("end", "data"):
+                    pass
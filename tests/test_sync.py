@@ -0,0 +1,113 @@
+"""Tests for `adguardhome.sync`."""
+
+import asyncio
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+
+from adguardhome import AdGuardHomeError, SyncAdGuardHome
+from adguardhome.fake import FakeAdGuardHome
+
+
+@pytest.fixture
+def fake_options() -> dict[str, Any]:
+    """Return the options of the fake AdGuard Home."""
+    return {"payload_size": 50}
+
+
+@pytest.fixture
+def fake(fake_options: dict[str, Any]) -> Iterator[FakeAdGuardHome]:
+    """Yield a fake AdGuard Home running on an event loop in a thread.
+
+    The blocking calls of the synchronous client would block the event loop
+    of the test, so the fake AdGuard Home runs on its own loop instead.
+    """
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server = FakeAdGuardHome(**fake_options)
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result()
+    yield server
+    asyncio.run_coroutine_threadsafe(server.stop(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+@pytest.fixture
+def adguard(fake: FakeAdGuardHome) -> Iterator[SyncAdGuardHome]:
+    """Yield a synchronous client connected to the fake AdGuard Home."""
+    with SyncAdGuardHome(fake.host, port=fake.port) as client:
+        yield client
+
+
+def test_sync_calls(fake: FakeAdGuardHome, adguard: SyncAdGuardHome) -> None:
+    """Test methods of the client and its sub-APIs are blocking calls."""
+    assert adguard.version() == fake.version
+    assert adguard.host == fake.host
+    adguard.disable_protection()
+    assert not adguard.protection_enabled()
+
+    assert adguard.stats is adguard.stats
+    assert adguard.stats.period() == fake.stats_interval
+    assert adguard.stats.snapshot().num_dns_queries == fake.stats["num_dns_queries"]
+    assert adguard.stats.dns_queries.__name__ == "dns_queries"
+    assert "snapshot" in dir(adguard.stats)
+    assert "version" in dir(adguard)
+
+    fake.fail("status", 500)
+    with pytest.raises(AdGuardHomeError):
+        adguard.version()
+    with pytest.raises(AttributeError):
+        adguard._session  # noqa: B018
+
+
+def test_sync_stream(fake: FakeAdGuardHome, adguard: SyncAdGuardHome) -> None:
+    """Test streams are synchronous iterators."""
+    assert list(adguard.stream("clients", "auto_clients")) == fake.auto_clients
+    stream = adguard.stream("querylog", "data")
+    assert next(stream) == fake.querylog[0]
+    stream.close()
+
+
+def test_threads(fake: FakeAdGuardHome, adguard: SyncAdGuardHome) -> None:
+    """Test many threads can share the client and its session."""
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        versions = list(executor.map(lambda _: adguard.version(), range(80)))
+        snapshots = list(executor.map(lambda _: adguard.stats.snapshot(), range(8)))
+
+    assert versions == [fake.version] * 80
+    assert len(snapshots) == 8
+    assert fake.requests["status"] == 80
+    session = adguard.adguard._session
+    assert session is not None
+    assert adguard.version() == fake.version
+    assert adguard.adguard._session is session
+
+
+def test_run(adguard: SyncAdGuardHome) -> None:
+    """Test running coroutines on the loop, but not from the loop itself."""
+
+    async def nested() -> None:
+        adguard.version()
+
+    assert adguard.run(adguard.adguard.version())
+    with pytest.raises(RuntimeError, match="its own event loop"):
+        adguard.run(nested())
+
+
+def test_close(fake: FakeAdGuardHome) -> None:
+    """Test a closed client cannot be used anymore."""
+    adguard = SyncAdGuardHome(fake.host, port=fake.port)
+    stream = adguard.stream("querylog", "data")
+    next(stream)
+    adguard.close()
+    adguard.close()
+    stream.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        adguard.version()
+    with pytest.raises(TypeError, match="own session"):
+        SyncAdGuardHome(fake.host, session=object())
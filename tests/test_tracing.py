@@ -0,0 +1,118 @@
+"""Tests for `adguardhome.tracing`."""
+
+import sys
+from collections.abc import Generator
+from unittest.mock import patch
+
+import pytest
+
+from adguardhome import AdGuardHome, AdGuardHomeError
+from adguardhome.fake import FakeAdGuardHome
+from adguardhome.tracing import instrument, set_span_attributes, uninstrument
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.trace import SpanKind, StatusCode
+
+
+@pytest.fixture
+def exporter() -> Generator[InMemorySpanExporter, None, None]:
+    """Trace all API calls into an in-memory exporter."""
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    assert instrument(provider)
+    yield exporter
+    uninstrument()
+
+
+async def test_spans(exporter: InMemorySpanExporter, fake: FakeAdGuardHome) -> None:
+    """Test API methods and their HTTP requests get spans."""
+    async with fake.client() as adguard:
+        await adguard.filtering.add_url(
+            allowlist=False, name="List", url="https://example.com/list.txt"
+        )
+        await adguard.filtering.enable_url(
+            allowlist=False, url="https://example.com/list.txt"
+        )
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert list(spans) == [
+        "POST filtering/add_url",
+        "adguardhome.filtering.add_url",
+        "GET filtering/status",
+        "POST filtering/set_url",
+        "adguardhome.filtering.enable_url",
+    ]
+    api, http = spans["adguardhome.filtering.enable_url"], spans["GET filtering/status"]
+    assert api.attributes["server.port"] == fake.port
+    assert http.parent.span_id == api.context.span_id
+    assert http.kind is SpanKind.CLIENT
+    assert http.attributes["http.request.method"] == "GET"
+    assert http.attributes["http.response.status_code"] == 200
+    assert http.attributes["adguardhome.endpoint"] == "GET filtering/status"
+    assert http.attributes["http.response.body.size"] > 0
+    assert "adguardhome.phase.ttfb" in http.attributes
+
+
+async def test_span_error(
+    exporter: InMemorySpanExporter, fake: FakeAdGuardHome
+) -> None:
+    """Test failing API calls are recorded on their spans."""
+    fake.fail("status", 503)
+    async with fake.client() as adguard:
+        with pytest.raises(AdGuardHomeError):
+            await adguard.version()
+
+    http, api = exporter.get_finished_spans()
+    assert http.attributes["http.response.status_code"] == 503
+    assert http.status.status_code is StatusCode.ERROR
+    assert api.name == "adguardhome.version"
+    assert api.status.status_code is StatusCode.ERROR
+
+
+async def test_cache_attributes(
+    exporter: InMemorySpanExporter, fake: FakeAdGuardHome
+) -> None:
+    """Test client lookups report cache hits and misses."""
+    async with fake.client() as adguard:
+        await adguard.clients.find_many(["10.0.0.1"])
+        await adguard.clients.find_many(["10.0.0.1", "10.0.0.2"])
+
+    spans = [
+        span
+        for span in exporter.get_finished_spans()
+        if span.name == "adguardhome.clients.find_many"
+    ]
+    assert [span.attributes["adguardhome.cache.hits"] for span in spans] == [0, 1]
+    assert [span.attributes["adguardhome.cache.misses"] for span in spans] == [1, 1]
+
+
+async def test_uninstrument(fake: FakeAdGuardHome) -> None:
+    """Test the original methods are restored."""
+    request = AdGuardHome._request
+    version = AdGuardHome.version
+    assert instrument()
+    assert instrument()
+    assert AdGuardHome.version is not version
+    uninstrument()
+    assert AdGuardHome._request is request
+    assert AdGuardHome.version is version
+
+    # Without tracing, adding span attributes does nothing
+    set_span_attributes({"adguardhome.cache.hits": 1})
+    async with fake.client() as adguard:
+        assert await adguard.version() == fake.version
+
+
+def test_without_opentelemetry() -> None:
+    """Test nothing is traced when OpenTelemetry is not installed."""
+    version = AdGuardHome.version
+    with patch.dict(sys.modules, {"opentelemetry.trace": None}):
+        assert not instrument()
+    assert AdGuardHome.version is version
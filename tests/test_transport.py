@@ -0,0 +1,163 @@
+"""Tests for `adguardhome.transport`."""
+
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from yarl import URL
+
+from adguardhome import AdGuardHome, AdGuardHomeError, LatencyHistogram
+from adguardhome.fake import FakeAdGuardHome
+from adguardhome.transport import (
+    Cassette,
+    Interaction,
+    RecordingTransport,
+    ReplayTransport,
+    Transport,
+    TransportRequest,
+    TransportResponse,
+)
+
+
+@pytest.fixture
+def fake_options() -> dict[str, Any]:
+    """Return the options of a fake AdGuard Home that compresses responses."""
+    return {"compress": True}
+
+
+def test_request_key() -> None:
+    """Test equal requests have the same key."""
+    url = URL("http://example.com:3000/control/querylog?offset=10")
+    request = TransportRequest(method="GET", url=url, params={"limit": "5"})
+    assert request.key == "GET /control/querylog?limit=5&offset=10"
+
+    post = TransportRequest(method="POST", url=url.with_query(None))
+    assert post.key == "POST /control/querylog"
+    keys = {
+        TransportRequest(method="POST", url=post.url, json_data=json).key
+        for json in ({"a": 1, "b": 2}, {"b": 2, "a": 1})
+    }
+    assert len(keys) == 1
+    assert keys.pop().startswith("POST /control/querylog #")
+    assert (
+        TransportRequest(method="POST", url=post.url, data="rule").key
+        == TransportRequest(method="POST", url=post.url, data=b"rule").key
+        != post.key
+    )
+
+
+def test_response_charset() -> None:
+    """Test the charset of a response is taken from its content type."""
+    for content_type, charset in (
+        ("text/plain", "utf-8"),
+        ('text/plain; charset="latin-1"', "latin-1"),
+        ("text/plain; format=flowed; charset=", "utf-8"),
+    ):
+        response = TransportResponse(
+            status=200, headers={"Content-Type": content_type}, body=b""
+        )
+        assert response.charset == charset
+
+
+async def test_transport(fake: FakeAdGuardHome) -> None:
+    """Test the base transport sends requests over HTTP."""
+    async with fake.client(transport=Transport()) as adguard:
+        assert await adguard.version() == fake.version
+
+
+@pytest.mark.parametrize("name", ["traffic.jsonl", "traffic.jsonl.gz"])
+async def test_record_replay(fake: FakeAdGuardHome, tmp_path: Path, name: str) -> None:
+    """Test recorded traffic is replayed without a network."""
+    recorder = RecordingTransport()
+    async with fake.client(transport=recorder, compression=True) as adguard:
+        version = await adguard.version()
+        snapshot = await adguard.stats.snapshot()
+        await adguard.filtering.add_url(
+            allowlist=False, name="Example", url="https://example.com/1.txt"
+        )
+        fake.fail("status", 503)
+        with pytest.raises(AdGuardHomeError):
+            await adguard.version()
+
+    assert len(recorder.cassette.interactions) == 4
+    assert "content-encoding" not in {
+        name.lower() for name in recorder.cassette.interactions[0].headers
+    }
+    recorder.cassette.save(tmp_path / name)
+    cassette = Cassette.load(tmp_path / name)
+    assert cassette == recorder.cassette
+
+    histogram = LatencyHistogram()
+    replay = ReplayTransport(cassette)
+    async with AdGuardHome(
+        "adguard.invalid", transport=replay, hooks=[histogram]
+    ) as adguard:
+        assert await adguard.version() == version
+        assert await adguard.stats.snapshot() == snapshot
+        await adguard.filtering.add_url(
+            allowlist=False, name="Example", url="https://example.com/1.txt"
+        )
+        with pytest.raises(AdGuardHomeError) as error:
+            await adguard.version()
+        assert error.value.args[0] == 503
+        # Recordings start over after the last one
+        assert await adguard.version() == version
+        with pytest.raises(AdGuardHomeError, match="No recorded response for GET"):
+            await adguard.querylog.enabled()
+        assert adguard._session is None
+
+    assert histogram.export()["GET status"]["count"] == 3
+
+
+async def test_replay_timing() -> None:
+    """Test the original timing of responses can be simulated."""
+    cassette = Cassette(
+        [
+            Interaction(
+                key="GET /control/status",
+                status=200,
+                headers={"Content-Type": "text/plain; charset=utf-8"},
+                body=b"OK",
+                duration=0.5,
+            )
+        ]
+    )
+    with patch("adguardhome.transport.asyncio.sleep", new=AsyncMock()) as sleep:
+        async with AdGuardHome(
+            "adguard.invalid", transport=ReplayTransport(cassette)
+        ) as adguard:
+            assert await adguard.request("status") == {"message": "OK"}
+        sleep.assert_not_called()
+
+        async with AdGuardHome(
+            "adguard.invalid", transport=ReplayTransport(cassette, timing=2.0)
+        ) as adguard:
+            await adguard.request("status")
+        sleep.assert_awaited_once_with(1.0)
+
+
+def test_cassette_binary(tmp_path: Path) -> None:
+    """Test bodies that are not text are stored as base64."""
+    interaction = Interaction(
+        key="GET /control/x", status=200, headers={}, body=b"\xff\x00", duration=0
+    )
+    assert interaction.as_dict()["encoding"] == "base64"
+    Cassette([interaction]).save(tmp_path / "binary.jsonl")
+    assert Cassette.load(tmp_path / "binary.jsonl").interactions == [interaction]
+
+
+@pytest.mark.parametrize(
+    ("content", "message"),
+    [
+        ('{"version": 99}\n', "Unsupported cassette version"),
+        ('{"version": 1}\n{"key": "GET /"}\n', "Invalid cassette file"),
+        ("", "Invalid cassette file"),
+    ],
+)
+def test_cassette_invalid(tmp_path: Path, content: str, message: str) -> None:
+    """Test invalid cassette files raise an error."""
+    path = tmp_path / "invalid.jsonl"
+    path.write_text(content)
+    with pytest.raises(AdGuardHomeError, match=message):
+        Cassette.load(path)